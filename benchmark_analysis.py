@@ -0,0 +1,253 @@
+import core_logic.valency_analysis as VA
+from core_logic.complement import Complement
+from core_logic.node import Node
+from example_analysis import load_data
+import argparse
+import gc
+import importlib
+import importlib.abc
+import importlib.machinery
+import re
+import sys
+import time
+import tracemalloc
+
+import logging
+
+logger = logging.getLogger('VRRCL')
+handler = logging.StreamHandler()
+formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%d.%m.%Y %H:%M:%S')
+handler.setFormatter(formatter)
+logger.addHandler(handler)
+logger.setLevel(logging.WARNING)
+
+SLOTS_PATTERN = re.compile(rb'^[ \t]*__slots__ = \([^)]*\)[ \t]*\n', re.MULTILINE)
+
+
+class UnslottedSourceLoader(importlib.machinery.SourceFileLoader):
+    """
+    Loads a module of the package core_logic without the __slots__ of its classes, i.e. every instance has a __dict__
+    (as before the classes were slotted), the compiled module is not written to the bytecode cache
+    """
+
+    def get_code(self, fullname):
+        """
+        :param fullname: name of the module
+        :type fullname: string
+        :return: code object of the source of the module without any __slots__
+        """
+        source_path = self.get_filename(fullname)
+        source = SLOTS_PATTERN.sub(b'', self.get_data(source_path))
+        return compile(source, source_path, 'exec', dont_inherit=True)
+
+
+class UnslottedFinder(importlib.abc.MetaPathFinder):
+    """
+    Finds the modules of the package core_logic and loads them via UnslottedSourceLoader
+    """
+
+    def find_spec(self, fullname, path, target=None):
+        """
+        :param fullname: name of the module
+        :type fullname: string
+        :param path: search path of the package of the module
+        :type path: list or None
+        :param target: not used
+        :return: module spec with an object of class UnslottedSourceLoader as loader for modules of core_logic, None
+        for all other modules
+        """
+        if not fullname.startswith('core_logic.'):
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if (spec is None) or (not isinstance(spec.loader, importlib.machinery.SourceFileLoader)):
+            return None
+        spec.loader = UnslottedSourceLoader(fullname, spec.origin)
+        return spec
+
+
+def import_unslotted_valency_analysis():
+    """
+    imports the module valency_analysis and all modules of core_logic it uses again without __slots__ (see class
+    UnslottedFinder), the modules of core_logic imported before are restored afterwards
+    :return: the module valency_analysis without __slots__
+    """
+    imported_modules = dict((name, module) for name, module in sys.modules.items()
+                            if (name == 'core_logic') or name.startswith('core_logic.'))
+    for name in imported_modules:
+        del sys.modules[name]
+    finder = UnslottedFinder()
+    sys.meta_path.insert(0, finder)
+    try:
+        unslotted_module = importlib.import_module('core_logic.valency_analysis')
+    finally:
+        sys.meta_path.remove(finder)
+        for name in list(sys.modules.keys()):
+            if (name == 'core_logic') or name.startswith('core_logic.'):
+                del sys.modules[name]
+        sys.modules.update(imported_modules)
+    return unslotted_module
+
+
+def create_synthetic_corpus(raw_data, copies, sentence_count=None):
+    """
+    creates a large corpus by repeating the given sentences, each repetition gets new sentence ids
+    :param raw_data: raw data in specific format needed by class ValencyAnalysis
+    :type raw_data: list
+    :param copies: number of repetitions of the given sentences
+    :type copies: integer
+    :param sentence_count: if given, the sentences are repeated until the corpus has exactly this number of sentences
+    (copies is ignored)
+    :type sentence_count: integer or None
+    :return: raw data in specific format needed by class ValencyAnalysis
+    """
+    if sentence_count is not None:
+        copies = -(-sentence_count // len(raw_data))
+    max_sentence_id = max(raw_data_set[0] for raw_data_set in raw_data)
+    corpus = list()
+    for copy_number in range(copies):
+        for sentence_id, word_ids, words, tree, sentence, lemmata in raw_data:
+            corpus.append([sentence_id + copy_number * max_sentence_id, word_ids, words, tree, sentence, lemmata])
+    if sentence_count is not None:
+        del corpus[sentence_count:]
+    return corpus
+
+
+def benchmark_preposition_specification(corpus, verb):
+    """
+    times the specification of Kprp and Kadv by their preposition on a valency frame with all primary analyses of the
+    given corpus and the decoding of all resulting complement class signatures
+    :param corpus: raw data in specific format needed by class ValencyAnalysis
+    :type corpus: list
+    :param verb: verb used for the valency analysis
+    :type verb: string
+    :return: no return value
+    """
+    analysis = VA.ValencyAnalysis(corpus, verb)
+    analysis.initialize_valency_frame(main_prime=False)
+    start = time.perf_counter()
+    analysis.specify_complements_by_preposition([4, 5])
+    specification_time = time.perf_counter() - start
+    start = time.perf_counter()
+    signature_count = 0
+    for signature in analysis.get_current_valency_frame_as_dict().keys():
+        for comp_class in signature:
+            Complement.comp_class_def(comp_class)
+        signature_count += 1
+    decoding_time = time.perf_counter() - start
+    print("specification of {cnt} sentences: {tme:.4f} s".format(
+        cnt=len(analysis.valency_frame.get_sen_id_to_analyses_mapping()), tme=specification_time))
+    print("decoding of {cnt} signatures: {tme:.4f} s".format(cnt=signature_count, tme=decoding_time))
+
+
+def benchmark_children_copies(corpus, verb):
+    """
+    counts the copies of lists of children of nodes (see Node.set_copy_counting) during the analysis of all dependency
+    trees of the given corpus
+    :param corpus: raw data in specific format needed by class ValencyAnalysis
+    :type corpus: list
+    :param verb: verb used for the valency analysis
+    :type verb: string
+    :return: no return value
+    """
+    Node.set_copy_counting(True)
+    start = time.perf_counter()
+    VA.ValencyAnalysis(corpus, verb)
+    analysis_time = time.perf_counter() - start
+    copy_count = Node.get_children_copy_count()
+    Node.set_copy_counting(False)
+    print("analysis of {cnt} sentences: {tme:.4f} s - {cps} copies of children ({avg:.2f} per sentence)".format(
+        cnt=len(corpus), tme=analysis_time, cps=copy_count, avg=copy_count / max(len(corpus), 1)))
+
+
+def measure_memory(analysis_module, corpus, verb, lean=False):
+    """
+    measures the memory (via tracemalloc) held by a valency analysis of the given corpus, i.e. by all sentences,
+    analyses, complements and nodes, after the initialization of its valency frame
+    :param analysis_module: module valency_analysis (with or without __slots__, see import_unslotted_valency_analysis)
+    :type analysis_module: module
+    :param corpus: raw data in specific format needed by class ValencyAnalysis
+    :type corpus: list
+    :param verb: verb used for the valency analysis
+    :type verb: string
+    :param lean: if True, a lean valency analysis is measured (see class ValencyAnalysis)
+    :type lean: bool
+    :return: list with the memory (in bytes) held after the initialization at position [0] and the peak memory during
+    the analysis at position [1]
+    """
+    gc.collect()
+    tracemalloc.start()
+    analysis = analysis_module.ValencyAnalysis(corpus, verb, lean=lean)
+    analysis.initialize_valency_frame(main_prime=False)
+    current_size, peak_size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del analysis
+    return [current_size, peak_size]
+
+
+def benchmark_memory(corpus, verb, lean=False):
+    """
+    measures the memory held by a valency analysis of the given corpus (see measure_memory) with the slotted classes
+    of core_logic and with the same classes without __slots__ (i.e. with a __dict__ for every instance, see
+    import_unslotted_valency_analysis) and compares both
+    :param corpus: raw data in specific format needed by class ValencyAnalysis
+    :type corpus: list
+    :param verb: verb used for the valency analysis
+    :type verb: string
+    :param lean: if True, a lean valency analysis is measured (see class ValencyAnalysis)
+    :type lean: bool
+    :return: no return value
+    """
+    sentence_count = max(len(corpus), 1)
+    sizes = list()
+    for slots, analysis_module in [(False, import_unslotted_valency_analysis()), (True, VA)]:
+        current_size, peak_size = measure_memory(analysis_module, corpus, verb, lean)
+        sizes.append(current_size)
+        print("memory{ln} of {cnt} sentences {slt} __slots__: {cur} bytes ({avg:.0f} per sentence) - peak: {pk} bytes "
+              "({pavg:.0f} per sentence)".format(ln=" (lean)" if lean else "", cnt=len(corpus),
+                                                  slt="with" if slots else "without", cur=current_size,
+                                                  avg=current_size / sentence_count, pk=peak_size,
+                                                  pavg=peak_size / sentence_count))
+    print("memory{ln} per sentence: {bfr:.0f} bytes without __slots__ - {aft:.0f} bytes with __slots__ ({red:.1f} % "
+          "less)".format(ln=" (lean)" if lean else "", bfr=sizes[0] / sentence_count, aft=sizes[1] / sentence_count,
+                         red=100 * (sizes[0] - sizes[1]) / max(sizes[0], 1)))
+
+
+def initialize_argparser():
+    """
+    initializes argument parser for user input
+    :return: args
+    """
+    argparser = argparse.ArgumentParser(description="Valancy Relationship Recognizer - Benchmarks")
+    argparser.add_argument("--verb", help="specify verb for valency analysis", default="kämpfen", action="store",
+                           dest="verb", type=str)
+    argparser.add_argument("--copies", help="number of repetitions of the example sentences for the synthetic corpus, "
+                           "default = 1000", action="store", dest="copies", default="1000", type=int)
+    argparser.add_argument("--sentences", help="number of sentences of the synthetic corpus (the example sentences are "
+                           "repeated until the corpus has this size, --copies is ignored), e.g. 1000000 for the memory "
+                           "benchmark", action="store", dest="sentences", default=None, type=int)
+    argparser.add_argument("--benchmark", help="benchmark to run, default = all", action="store", dest="benchmark",
+                           default="all", choices=["all", "prepositions", "copies", "memory", "lean_memory"])
+    args = argparser.parse_args()
+    return args
+
+
+def main():
+    """
+    main function, creates a synthetic corpus from the sentences in the directory example_sentences and runs the
+    chosen benchmarks on it
+    :return: no return value
+    """
+    args = initialize_argparser()
+    corpus = create_synthetic_corpus(load_data(), args.copies, args.sentences)
+    if args.benchmark in ("all", "prepositions"):
+        benchmark_preposition_specification(corpus, args.verb)
+    if args.benchmark in ("all", "copies"):
+        benchmark_children_copies(corpus, args.verb)
+    if args.benchmark in ("all", "memory"):
+        benchmark_memory(corpus, args.verb)
+    if args.benchmark in ("all", "memory", "lean_memory"):
+        benchmark_memory(corpus, args.verb, lean=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,406 @@
+from core_logic.dependency_analysis import DependencyAnalysis as DepAn
+from core_logic.dependency_analysis import DependencyAnalysisSubTypeI as DasSubOne
+from core_logic.dependency_analysis import DependencyAnalysisSubTypeII as DasSbTwo
+from core_logic.dependency_tree import DependencyTree as DepTr
+from core_logic.label_schema import LabelSchema
+from core_logic.node import Node
+from core_logic.sentence_object import SentenceObject
+from core_logic.sentence_to_analysis_connector import SentenceAnalysisConnector as SenAnCon
+from example_analysis import load_data
+import argparse
+import random
+import sys
+
+import logging
+
+logger = logging.getLogger('VRRCL')
+handler = logging.StreamHandler()
+formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%d.%m.%Y %H:%M:%S')
+handler.setFormatter(formatter)
+logger.addHandler(handler)
+logger.setLevel(logging.WARNING)
+
+SYNTHETIC_LABELS = ['subj', 'aux', 'avz', 'kon', 'cj', 'rel', 'neb', 'obja', 'objd', 'objg', 'pp', 'pn', 'det',
+                    'adv', 'objc', 's', 'konj', 'subjc', 'attr', 'pred', 'objp', 'obji']
+SYNTHETIC_LEMMATA = ['a', 'b', 'an', 'kämpfen']
+TARGET_LEMMAS = {'kämpfen', 'ankämpfen'}
+
+
+class RecursiveSegmentation:
+    """
+    Former recursive segmentation of SentenceAnalysisConnector (cutting and mending copies of the dependency tree),
+    kept unchanged as reference for SentenceAnalysisConnector.single_pass_dependency_analysis
+    """
+
+    @staticmethod
+    def recursive_dependency_analysis(current_working_tree, analysis_type, word_id_to_lemmata=None,
+                                      target_lemmas=None, main_only=False):
+        """
+        main method to analyze a dependency tree via recursion, creates object of class DependencyAnalysis (or subclass)
+        and appends list of sub analyses of this new analysis with recursively created dependency analyses for these
+        sub sentences,
+        checks for nodes labeled with "aux" and "avz" before using subroutines for creation of analysis of sub sentence,
+        nodes with labels "aux" and "avz" are saved separately und used for analysis creation, working tree is cut and
+        mended when sliced for labels "aux" and "avz"
+        :param current_working_tree: tree that is currently cut/altered/analyzed
+        :type current_working_tree: DependencyTree
+        :param analysis_type: used to distinguish between main sentence DependencyAnalysis (type 0),
+        DependencyAnalysisSubTypeI (type 1) and DependencyAnalysisSubTypeII (type 2)
+        :type analysis_type: Integer
+        :param word_id_to_lemmata: see SentenceAnalysisConnector.initial_dependency_analysis
+        :type word_id_to_lemmata: List or Dictionary or None
+        :param target_lemmas: see SentenceAnalysisConnector.initial_dependency_analysis
+        :type target_lemmas: Set or None
+        :param main_only: if True, sub sentences are cut off without being analyzed
+        :type main_only: Bool
+        :return: newly created dependency analysis with all analyses of subtrees emanating from root of current working
+        tree created recursively
+        """
+        label_schema = LabelSchema.get_active_schema()
+        current_working_tree.change_root_class_to_workingtreerootnode()
+        labels = label_schema.get_label_group('aux')
+        aux_nodes = RecursiveSegmentation.cut_and_mend_tree_on_root_lvl(current_working_tree, labels)
+        if len(aux_nodes) > 0:
+            verb = aux_nodes[-1]
+            aux_nodes.pop(-1)
+            aux_nodes.insert(0, current_working_tree.get_tree_root())
+        else:
+            verb = current_working_tree.get_tree_root()
+        labels = label_schema.get_label_group('avz')
+        avz_nodes = RecursiveSegmentation.cut_and_mend_tree_on_root_lvl(current_working_tree, labels)
+        if main_only:
+            RecursiveSegmentation.cut_off_sub_sentences(current_working_tree)
+            class_i_analysis = list()
+            class_ii_analysis = list()
+        else:
+            labels = label_schema.get_label_group('sub_sentence_type_i')
+            class_i_analysis = RecursiveSegmentation.recursive_sub_sentence_type_i_analysis(
+                current_working_tree, labels, word_id_to_lemmata, target_lemmas)
+            labels = label_schema.get_label_group('sub_sentence_type_ii')
+            class_ii_analysis = RecursiveSegmentation.recursive_sub_sentence_type_ii_analysis(
+                current_working_tree, labels, word_id_to_lemmata, target_lemmas)
+        build_complements = True
+        if target_lemmas is not None:
+            valence_holder_lemma = SenAnCon.get_valence_holder_lemma(
+                verb.get_node(), list(avz_node.get_node() for avz_node in avz_nodes), word_id_to_lemmata)
+            build_complements = valence_holder_lemma in target_lemmas
+        new_dependency_analysis = None
+        if analysis_type == 0:
+            new_dependency_analysis = DepAn(current_working_tree.get_tree_root(), verb, avz_nodes, aux_nodes,
+                                            class_i_analysis, class_ii_analysis, build_complements)
+        elif analysis_type == 1:
+            new_dependency_analysis = DasSubOne(current_working_tree.get_tree_root(), verb, avz_nodes, aux_nodes,
+                                                class_i_analysis, class_ii_analysis, build_complements)
+        elif analysis_type == 2:
+            new_dependency_analysis = DasSbTwo(current_working_tree.get_tree_root(), verb, avz_nodes, aux_nodes,
+                                               class_i_analysis, class_ii_analysis, build_complements)
+        return new_dependency_analysis
+
+    @staticmethod
+    def recursive_sub_sentence_type_i_analysis(current_working_tree, labels, word_id_to_lemmata=None,
+                                               target_lemmas=None):
+        """
+        subroutine, used during recursive analysis of dependency tree in order to create object of class
+        DependencyAnalysisSubTypeI and append this analysis with all analyses further down the dependency tree, checks
+        if root of current_working_tree is node with label "kon" and has only one child with label "cj", if so, alters
+        current working tree to new tree with root at node with label "cj", sets connecting nodes in
+        DependencyAnalysisSubTypeI accordingly,
+        alters working_tree by cutting without doing any mending
+        :param current_working_tree: tree that is currently cut/altered/analyzed
+        :type current_working_tree: DependencyTree
+        :param labels: strings, intended for use with label group "sub_sentence_type_i" of class LabelSchema (i.e. [kon])
+        :type labels: List
+        :param word_id_to_lemmata: see recursive_dependency_analysis
+        :type word_id_to_lemmata: List or Dictionary or None
+        :param target_lemmas: see recursive_dependency_analysis
+        :type target_lemmas: Set or None
+        :return: list() of objects of class DependencyAnalysisSubTypeI
+        """
+        new_kon_trees = RecursiveSegmentation.cut_tree_on_root_lvl(current_working_tree, labels)
+        new_class_i_sub_trees = list()
+        connecting_kon_nodes = list()
+        labels = LabelSchema.get_active_schema().get_label_group('conjunct')
+        label_mask = LabelSchema.get_label_mask(labels)
+        for tree in new_kon_trees:
+            new_dependency_tree = DepTr(tree)
+            connecting_kon_nodes.append(new_dependency_tree.get_tree_root().get_node())
+            if new_dependency_tree.get_tree_root().get_child_count() == 1:
+                if (1 << new_dependency_tree.get_tree_root().get_first_child().get_label_code()) & label_mask:
+                    new_root = RecursiveSegmentation.cut_tree_on_root_lvl(new_dependency_tree, labels)
+                    new_dependency_tree = DepTr(new_root[0])
+            new_class_i_sub_trees.append(new_dependency_tree)
+        class_i_analysis_list = list()
+        for class_i_sub_tree, connecting_kon_node in zip(new_class_i_sub_trees, connecting_kon_nodes):
+            new_analysis = RecursiveSegmentation.recursive_dependency_analysis(class_i_sub_tree, 1,
+                                                                               word_id_to_lemmata, target_lemmas)
+            new_analysis.set_connecting_node(connecting_kon_node)
+            class_i_analysis_list.append(new_analysis)
+        return class_i_analysis_list
+
+    @staticmethod
+    def recursive_sub_sentence_type_ii_analysis(current_working_tree, labels, word_id_to_lemmata=None,
+                                                target_lemmas=None):
+        """
+        subroutine, used during recursive analysis of dependency tree in order to create object of class
+        DependencyAnalysisSubTypeII and append this analysis with all analyses further down the dependency tree
+        alters working_tree by cutting without doing any mending
+        :param current_working_tree: tree that is currently cut/altered/analyzed
+        :type current_working_tree: DependencyTree
+        :param labels: strings, intended for use with label group "sub_sentence_type_ii" of class LabelSchema (i.e.
+        ['konj', 'neb', 'objc', 'rel', 's', 'subjc'])
+        :type labels: List
+        :param word_id_to_lemmata: see recursive_dependency_analysis
+        :type word_id_to_lemmata: List or Dictionary or None
+        :param target_lemmas: see recursive_dependency_analysis
+        :type target_lemmas: Set or None
+        :return: list() of objects of class DependencyAnalysisSubTypeII
+        """
+        new_class_ii_sub_trees = list()
+        new_sub_sentence_trees = RecursiveSegmentation.cut_tree_by_labels(current_working_tree, labels)
+        for tree in new_sub_sentence_trees:
+            new_dependency_tree = DepTr(tree)
+            new_class_ii_sub_trees.append(new_dependency_tree)
+        class_ii_analysis = list()
+        for class_ii_sub_tree in new_class_ii_sub_trees:
+            new_analysis = RecursiveSegmentation.recursive_dependency_analysis(class_ii_sub_tree, 2,
+                                                                               word_id_to_lemmata, target_lemmas)
+            class_ii_analysis.append(new_analysis)
+        return class_ii_analysis
+
+    @staticmethod
+    def cut_off_sub_sentences(working_tree):
+        """
+        cuts off all sub sentences of the working tree at the same nodes as recursive_sub_sentence_type_i_analysis and
+        recursive_sub_sentence_type_ii_analysis (nodes of label group "sub_sentence_type_i" on root level first, then
+        first occurrences of label group "sub_sentence_type_ii"), the cut off sub trees are neither copied nor analyzed;
+        alters working tree
+        :param working_tree: tree that is currently cut/altered/analyzed
+        :type working_tree: DependencyTree
+        :return: no return value
+        """
+        label_schema = LabelSchema.get_active_schema()
+        tree_root = working_tree.get_tree_root()
+        label_mask = label_schema.get_group_mask('sub_sentence_type_i')
+        for child in tree_root.iterate_children():
+            if (1 << child.get_label_code()) & label_mask:
+                child.delete_all_children()
+        label_mask = label_schema.get_group_mask('sub_sentence_type_ii')
+        for node in tree_root.iterative_child_look_up_by_label_mask(label_mask):
+            node.delete_all_children()
+
+    @staticmethod
+    def cut_tree_by_labels(working_tree, labels):
+        """
+        makes cuts (at first occurrence of any label given by labels) in the complete tree, intended use: with labels
+        "neb", "rel", ... (possibly simultaneously) as these are indicators of certain kinds of sub sentences,
+        alters working tree
+        :param working_tree: tree that is currently cut/altered/analyzed
+        :type working_tree: DependencyTree
+        :param labels: strings to search for
+        :type labels: List
+        :return: list of objects of class Node cut out of the tree (with all their children attached)
+        """
+        sub_trees = working_tree.slice_tree_by_label(labels)
+        return sub_trees
+
+    @staticmethod
+    def cut_tree_on_root_lvl(working_tree, labels):
+        """
+        make cut (with no mending or further altering of initial working tee) at any children of root of
+        tree with label given by labels, intended use: with labels "kon" and "cj" (not simultaneously) as these are
+        indicators of certain kinds of sub sentences,
+        alters working tree
+        :param working_tree: tree that is currently cut/altered/analyzed
+        :type working_tree: DependencyTree
+        :param labels: strings to search for
+        :type labels: List
+        :return: list() of objects of class Node cut out of the tree (with all their children attached)
+        """
+        sub_trees = working_tree.slice_tree_on_first_lvl(labels)
+        return sub_trees
+
+    @staticmethod
+    def cut_and_mend_tree_on_root_lvl(working_tree, labels):
+        """
+        intended use: recursively slice tree on first lvl at 'avz' and 'aux' nodes, delete node with given label from
+        working tree and add all its children to root of working tree, continue until no 'avz' and 'aux' nodes found on
+        first lvl and return all nodes that were cut off this way as list() of objects of class nodes, each with no
+        children;
+        alters working_tree
+        :param working_tree: tree that is currently cut/altered/analyzed
+        :type working_tree: DependencyTree
+        :param labels: strings to search for
+        :type labels: List
+        :return: list() of nodes cut out of the tree by given labels, each node has no children
+        """
+        sub_trees_with_label = working_tree.slice_tree_on_first_lvl(labels)
+        nodes_with_label = list()
+        while len(sub_trees_with_label) > 0:
+            for sub_tree_root in sub_trees_with_label:
+                working_tree.delete_node_from_root_by_value(sub_tree_root.get_node())
+                new_children = list(sub_tree_root.iterate_children())
+                working_tree.append_tree_root_by_children_list(new_children)
+                sub_tree_root.delete_all_children()
+            new_nodes_with_label = sub_trees_with_label.copy()
+            nodes_with_label.extend(new_nodes_with_label)
+            sub_trees_with_label = working_tree.slice_tree_on_first_lvl(labels)
+        return nodes_with_label
+
+
+def describe_analysis(dependency_analysis):
+    """
+    :param dependency_analysis: analysis of a main sentence with the analyses of all its sub sentences
+    :type dependency_analysis: DependencyAnalysis
+    :return: list() with a tuple for the given analysis and every analysis of its sub sentences (see
+    DependencyAnalysis.analysis_traversal) with class, valence holder, avz and aux words, connecting node, pruning, number
+    of analyses of sub sentences and the complete tree of each complement (word id, label and parent of each node)
+    """
+    description = list()
+    for analysis in DepAn.analysis_traversal(dependency_analysis):
+        connecting_node = None
+        if analysis.__class__ in (DasSubOne, DasSbTwo):
+            connecting_node = analysis.get_connecting_node()
+        complements = list()
+        for complement in analysis.get_complements():
+            complement_nodes = tuple((node.get_node(), node.get_label(), None if parent is None else parent.get_node())
+                                     for parent, node in Node.depth_first_traversal(complement.get_complement_tree()))
+            complements.append((complement.get_complement_class(), complement_nodes))
+        description.append((analysis.__class__.__name__, analysis.get_valence_holder(), tuple(analysis.get_avz_words()),
+                            tuple(analysis.get_aux_words()), connecting_node, analysis.is_pruned_analysis(),
+                            len(analysis.get_class_one_sub_analysis()), len(analysis.get_class_two_sub_analysis()),
+                            tuple(complements)))
+    return description
+
+
+def compare_segmentations(words, edges, word_id_to_lemmata):
+    """
+    analyzes the given tree via SentenceAnalysisConnector.single_pass_dependency_analysis and via the recursive
+    reference (see class RecursiveSegmentation) for complete analyses, pruned analyses (see TARGET_LEMMAS) and analyses
+    of the main sentence only
+    :param words: words (as strings) of a sentence
+    :type words: List
+    :param edges: edges of the dependency tree of the sentence with positions of words as vertices
+    :type edges: List
+    :param word_id_to_lemmata: lemma of each word at its position
+    :type word_id_to_lemmata: List or Dictionary
+    :return: list with number of compared analyses at position [0] and list() of the settings (target lemmas, main
+    only) with different analyses at position [1], no analyses are compared for invalid trees
+    """
+    complete_tree = DepTr.initialize_dependency_tree(words, edges)
+    compared_count = 0
+    differences = list()
+    for target_lemmas, main_only in [(None, False), (TARGET_LEMMAS, False), (None, True)]:
+        single_pass_analysis = SenAnCon.single_pass_dependency_analysis(complete_tree.get_tree_root(),
+                                                                         word_id_to_lemmata, target_lemmas, main_only)
+        working_tree = DepTr(DepTr.deep_copy_complete_tree(complete_tree.get_tree_root()))
+        recursive_analysis = RecursiveSegmentation.recursive_dependency_analysis(working_tree, 0, word_id_to_lemmata,
+                                                                                 target_lemmas, main_only)
+        compared_count += 1
+        if describe_analysis(single_pass_analysis) != describe_analysis(recursive_analysis):
+            differences.append((target_lemmas, main_only))
+    return [compared_count, differences]
+
+
+def create_synthetic_tree(rng, node_count):
+    """
+    :param rng: random number generator
+    :type rng: random.Random
+    :param node_count: number of nodes (at least 2)
+    :type node_count: Integer
+    :return: list with words at position [0], edges (random labels of SYNTHETIC_LABELS, root with a subject) at
+    position [1] and random lemma of each word at its position at position [2]
+    """
+    positions = list(range(node_count))
+    rng.shuffle(positions)
+    root = positions[0]
+    edges = [[root, positions[1], 'subj']]
+    placed = positions[:2]
+    for position in positions[2:]:
+        edges.append([rng.choice(placed), position, rng.choice(SYNTHETIC_LABELS)])
+        placed.append(position)
+    rng.shuffle(edges)
+    words = list("w{pos}".format(pos=position) for position in range(node_count))
+    lemmata = list(rng.choice(SYNTHETIC_LEMMATA) for _ in range(node_count))
+    return [words, edges, lemmata]
+
+
+def check_example_sentences():
+    """
+    compares both segmentations (see compare_segmentations) for all sentences in the directory example_sentences
+    :return: list with number of compared analyses at position [0] and number of differences at position [1]
+    """
+    compared_count = 0
+    difference_count = 0
+    for sentence_id, word_ids, words, tree, sentence, lemmata in load_data():
+        edges = SentenceObject.remap_edges_to_positions(word_ids, tree)
+        if DepTr.get_tree_error_code(words, edges) is not None:
+            continue
+        analysis_count, differences = compare_segmentations(words, edges, lemmata)
+        compared_count += analysis_count
+        difference_count += len(differences)
+        for target_lemmas, main_only in differences:
+            logger.warning("different analyses of sentence {sid} (target lemmas: {tl} - main only: {mo})".format(
+                sid=sentence_id, tl=target_lemmas, mo=main_only))
+    return [compared_count, difference_count]
+
+
+def check_synthetic_trees(tree_count, max_nodes, seed):
+    """
+    compares both segmentations (see compare_segmentations) for random trees (see create_synthetic_tree)
+    :param tree_count: number of random trees
+    :type tree_count: Integer
+    :param max_nodes: maximum number of nodes of a tree
+    :type max_nodes: Integer
+    :param seed: seed of the random number generator, the same seed always creates the same trees
+    :type seed: Integer
+    :return: list with number of compared analyses at position [0] and number of differences at position [1]
+    """
+    rng = random.Random(seed)
+    compared_count = 0
+    difference_count = 0
+    for tree_number in range(tree_count):
+        words, edges, lemmata = create_synthetic_tree(rng, rng.randint(2, max_nodes))
+        analysis_count, differences = compare_segmentations(words, edges, lemmata)
+        compared_count += analysis_count
+        difference_count += len(differences)
+        for target_lemmas, main_only in differences:
+            logger.warning("different analyses of tree {nr} {edg} (target lemmas: {tl} - main only: {mo})".format(
+                nr=tree_number, edg=edges, tl=target_lemmas, mo=main_only))
+    return [compared_count, difference_count]
+
+
+def initialize_argparser():
+    """
+    initializes argument parser for user input
+    :return: args
+    """
+    argparser = argparse.ArgumentParser(description="Valancy Relationship Recognizer - Check of the clause segmentation")
+    argparser.add_argument("--trees", help="number of random trees, default = 3000", action="store", dest="trees",
+                           default="3000", type=int)
+    argparser.add_argument("--max_nodes", help="maximum number of nodes of a random tree, default = 25", action="store",
+                           dest="max_nodes", default="25", type=int)
+    argparser.add_argument("--seed", help="seed for the random trees, default = 5", action="store", dest="seed",
+                           default="5", type=int)
+    args = argparser.parse_args()
+    return args
+
+
+def main():
+    """
+    main function, compares the analyses of the single pass segmentation with the recursive reference for the
+    sentences in the directory example_sentences and for random trees, exits with status 1 if any analyses differ
+    :return: no return value
+    """
+    args = initialize_argparser()
+    example_count, example_differences = check_example_sentences()
+    print("example sentences: {cnt} analyses compared - {dff} differences".format(cnt=example_count,
+                                                                                   dff=example_differences))
+    synthetic_count, synthetic_differences = check_synthetic_trees(args.trees, max(args.max_nodes, 2), args.seed)
+    print("random trees: {cnt} analyses compared - {dff} differences".format(cnt=synthetic_count,
+                                                                              dff=synthetic_differences))
+    if (example_differences > 0) or (synthetic_differences > 0):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,510 @@
+from core_logic.complement import Complement as Cmp
+from core_logic.dependency_analysis import DependencyAnalysisSubTypeI as DasSubOne
+from core_logic.dependency_analysis import DependencyAnalysisSubTypeII as DasSbTwo
+from core_logic.label_schema import LabelSchema
+from core_logic.node import Node
+from core_logic.various_errors import ConnectorError, IncorrectTreeError
+
+import hashlib
+import json
+import os
+import tempfile
+
+import logging
+
+logger = logging.getLogger('VRRCL')
+
+# increase whenever the creation of dependency analyses is changed, invalidates all cached analyses
+ANALYSIS_CODE_VERSION = 2
+# after eviction the cache is reduced to this ratio of its maximum size
+EVICTION_RATIO = 0.9
+
+
+class CachedAnalysis:
+    """
+    Analysis of a single (sub) sentence restored from an AnalysisCache, provides the interface of class
+    DependencyAnalysis used after the creation of an analysis (complements are restored with their complete sub trees,
+    the tree of the sub sentence itself is not restored)
+    """
+
+    __slots__ = ('analysis_type', 'valence_holder', 'valence_holder_lemma', 'avz_words', 'aux_words',
+                 'connecting_node_value', 'complements', 'class_i_sub_analysis', 'class_ii_sub_analysis',
+                 'primary_analysis')
+
+    def __init__(self, analysis_type, valence_holder, valence_holder_lemma, avz_words, aux_words, connecting_node_value,
+                 complements):
+        """
+        :param analysis_type: 0 for analysis of main sentence, 1 for DependencyAnalysisSubTypeI and 2 for
+        DependencyAnalysisSubTypeII
+        :type analysis_type: Integer
+        :param valence_holder: word id of valence holder
+        :type valence_holder: Integer
+        :param valence_holder_lemma: lemma of valence holder (including cut off verb prefixes)
+        :type valence_holder_lemma: String
+        :param avz_words: cut off verb prefixes (word ids before, lemmas after the lemmas of the sentence were set)
+        :type avz_words: List
+        :param aux_words: word ids of auxiliary verbs
+        :type aux_words: List
+        :param connecting_node_value: node the sub tree of this analysis was cut off at (None for main sentence)
+        :type connecting_node_value: Integer or None
+        :param complements: objects of class Complement (sorted by complement class)
+        :type complements: List
+        """
+        self.analysis_type = analysis_type
+        self.valence_holder = valence_holder
+        self.valence_holder_lemma = valence_holder_lemma
+        self.avz_words = avz_words
+        self.aux_words = aux_words
+        self.connecting_node_value = connecting_node_value
+        self.complements = complements
+        self.class_i_sub_analysis = list()
+        self.class_ii_sub_analysis = list()
+        self.primary_analysis = False
+
+    def __str__(self):
+        string = "Valenzträger: {vh}    avz-Nodes: {avz}    aux-Nodes: {aux}\nKomplemente:\n".\
+            format(vh=self.valence_holder, avz=" ".join(str(word) for word in self.avz_words),
+                   aux=" ".join(str(word) for word in self.aux_words))
+        for complement in self.complements:
+            string += str(complement)
+        return string
+
+    def get_analysis_type(self):
+        """
+        :return: 0 for analysis of main sentence, 1 for sub sentence type I and 2 for sub sentence type II
+        """
+        return self.analysis_type
+
+    def get_class_one_sub_analysis(self):
+        """
+        :return: copy of the list containing all analyses of sub sentences type I emanating from self
+        """
+        return self.class_i_sub_analysis.copy()
+
+    def get_class_two_sub_analysis(self):
+        """
+        :return: copy of the list containing all analyses of sub sentences type II emanating from self
+        """
+        return self.class_ii_sub_analysis.copy()
+
+    def get_connecting_node(self):
+        """
+        :return: node value (as int) indicating the node the sub tree of this analysis was cut off at, None for the
+        analysis of the main sentence
+        """
+        return self.connecting_node_value
+
+    def get_valence_holder(self):
+        """
+        :return: word id of valence holder of this analysis
+        """
+        return self.valence_holder
+
+    def get_complements(self):
+        """
+        :return: list of complements of this analysis
+        """
+        return self.complements
+
+    def get_complement_root_w_id(self, position):
+        """
+        :param position: position of a complement in the list of complements of this analysis
+        :type position: Integer
+        :return: word id (as int) of root of this complement
+        """
+        return self.complements[position].get_root_w_id()
+
+    def get_complement_root_label(self, position):
+        """
+        :param position: position of a complement in the list of complements of this analysis
+        :type position: Integer
+        :return: string that is label for root of this complement
+        """
+        return self.complements[position].get_root_label()
+
+    def get_valence_holder_lemma(self):
+        """
+        :return: lemma (string) of valence holder of this analysis
+        """
+        return self.valence_holder_lemma
+
+    def get_avz_words(self):
+        """
+        :return: list of cut off verb prefixes (word ids before, lemmas after the lemmas of the sentence were set)
+        """
+        return self.avz_words
+
+    def set_avz_words(self, new_words):
+        """
+        :param new_words: cut off verb prefixes for the verb of this sub sentence
+        :type new_words list
+        :return: none, alters self.avz_words
+        """
+        self.avz_words = new_words
+
+    def get_aux_words(self):
+        """
+        :return: list of word ids (as integers) of auxiliary verbs
+        """
+        return self.aux_words
+
+    def get_complement_by_class(self, cmp_class):
+        """
+        :param cmp_class: coding of complement classes
+        :type cmp_class: list
+        :return: list of complements of this analysis with the given coding of complement class or an empty list
+        """
+        complement_list = list()
+        for complement in self.complements:
+            if complement.get_complement_class() in cmp_class:
+                complement_list.append(complement)
+        return complement_list
+
+    def set_primary_analysis(self, boolean_value):
+        """
+        :param boolean_value: True if this is an analysis of the verb used for the valency analysis, False otherwise
+        :type boolean_value: Bool
+        :return: no return value, alters self.primary_analysis
+        """
+        self.primary_analysis = boolean_value
+
+    def is_primary_analysis(self):
+        """
+        :return: True if this is an analysis of the verb used for the valency analysis, False otherwise
+        """
+        return self.primary_analysis
+
+    def set_valence_holder_lemma(self, new_lemma):
+        """
+        :param new_lemma: word lemma of valence holder (possibly appended by cut off prefixes)
+        :type new_lemma: String
+        :return: none, alters self.valence_holder_lemma
+        """
+        self.valence_holder_lemma = str(new_lemma)
+
+    def get_complement_class_pattern(self):
+        """
+        :return: tuple() of complement class codings of this analysis
+        """
+        return tuple(complement.get_complement_class() for complement in self.complements)
+
+
+class CachedAnalysisConnector:
+    """
+    Replaces an object of class SentenceAnalysisConnector for a sentence whose analyses were restored from an
+    AnalysisCache, provides access to the restored analyses (the dependency tree is not restored)
+    """
+
+    def __init__(self, valid_analysis, analysis_list):
+        """
+        :param valid_analysis: True if the dependency analysis of the sentence was valid, False otherwise
+        :type valid_analysis: Bool
+        :param analysis_list: objects of class CachedAnalysis, analysis of main sentence first (in order of
+        SentenceAnalysisConnector.get_full_analysis_list)
+        :type analysis_list: List
+        """
+        self.valid_analysis = valid_analysis
+        self.analysis_list = analysis_list
+        self.primary_analysis_list = None
+
+    def __str__(self):
+        return self.get_output_string()
+
+    def get_output_string(self, position_to_w_id=None):
+        """
+        see SentenceAnalysisConnector.get_output_string
+        """
+        if not self.valid_analysis:
+            return "Keine gültige Analyse"
+        if position_to_w_id is None:
+            position_to_w_id = lambda position: position
+        new_string = ""
+        for analysis in self.analysis_list:
+            new_string += "analysis type: {analysetype}\nValenzträger: {vh} - lemma: {lm}\n{cmpl}\n".\
+                format(analysetype=analysis.get_analysis_type(), vh=position_to_w_id(analysis.get_valence_holder()),
+                       lm=analysis.get_valence_holder_lemma(),
+                       cmpl="".join(complement.get_output_string(position_to_w_id)
+                                    for complement in analysis.get_complements()))
+        return new_string
+
+    def is_valid_analysis(self):
+        """
+        :return: True if dependency analysis was created correctly, False otherwise
+        """
+        return self.valid_analysis
+
+    def get_complete_dependency_tree(self):
+        """
+        :raises IncorrectTreeError as the dependency tree is not restored from the cache
+        """
+        raise IncorrectTreeError(10)
+
+    def get_main_dependency_analysis(self):
+        """
+        :raises ConnectorError if dependency analysis is not valid
+        :return: object of class CachedAnalysis, the analysis of the main sentence
+        """
+        if self.valid_analysis:
+            return self.analysis_list[0]
+        else:
+            raise ConnectorError(2)
+
+    def get_primary_analysis_list(self):
+        """
+        :raises ConnectorError if dependency analysis is not valid
+        :return: list of objects of class CachedAnalysis that are primary analyses (kept by this connector, must not be
+        altered)
+        """
+        if self.valid_analysis:
+            if self.primary_analysis_list is None:
+                self.primary_analysis_list = list(analysis for analysis in self.analysis_list
+                                                  if analysis.is_primary_analysis())
+            return self.primary_analysis_list
+        else:
+            raise ConnectorError(2)
+
+    def mark_primary_analyses(self, verb):
+        """
+        see SentenceAnalysisConnector.mark_primary_analyses
+        """
+        if self.valid_analysis:
+            for analysis in self.analysis_list:
+                analysis.set_primary_analysis(analysis.get_valence_holder_lemma() == verb)
+        self.primary_analysis_list = None
+
+    def get_full_analysis_list(self):
+        """
+        :raises ConnectorError if dependency analysis is not valid
+        :return: list of objects of class CachedAnalysis containing all analyses of this sentence (kept by this
+        connector, must not be altered)
+        """
+        if self.valid_analysis:
+            return self.analysis_list
+        else:
+            raise ConnectorError(2)
+
+
+class AnalysisCache:
+    """
+    Content-addressed on-disk cache of the analyses of single sentences, used to skip the creation of the dependency
+    tree and the dependency analysis of sentences that were already analyzed in an earlier run;
+    the key of a sentence is a hash of its word ids, words, lemmata and tree edges, of the active label schema and of
+    ANALYSIS_CODE_VERSION, each entry is a compact json file (in a sub directory given by the first two characters of
+    its key) that is written atomically, so that the cache can be shared by several runs and processes;
+    if the size of all entries exceeds the maximum size, the least recently used entries are deleted
+    """
+
+    def __init__(self, directory, max_size):
+        """
+        :param directory: directory of the cache, created if it does not exist
+        :type directory: String
+        :param max_size: maximum size of all entries in bytes
+        :type max_size: Integer
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+        self.current_size = 0
+        for file_path, file_size, access_time in self.get_entries():
+            self.current_size += file_size
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def get_sentence_key(self, sentence):
+        """
+        :param sentence: object of class SentenceObject
+        :type sentence: SentenceObject
+        :return: hex string that is key of the given sentence in this cache
+        """
+        key_data = [ANALYSIS_CODE_VERSION, LabelSchema.get_active_schema().get_fingerprint(), sentence.get_w_ids(),
+                    sentence.get_words(), sentence.get_lemma_list(), sentence.get_raw_dep_tree()]
+        return hashlib.sha256(json.dumps(key_data, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+    def get_entry_path(self, key):
+        """
+        :param key: key of a sentence (see get_sentence_key)
+        :type key: String
+        :return: path of the entry file of the given key
+        """
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get_entries(self):
+        """
+        :return: list() with a list [path, size in bytes, time of last access] for each entry in this cache
+        """
+        entries = list()
+        for sub_directory in os.scandir(self.directory):
+            if not sub_directory.is_dir():
+                continue
+            for entry in os.scandir(sub_directory.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        entry_stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append([entry.path, entry_stat.st_size, entry_stat.st_mtime])
+        return entries
+
+    def load_connector(self, sentence):
+        """
+        :param sentence: object of class SentenceObject
+        :type sentence: SentenceObject
+        :return: object of class CachedAnalysisConnector with the restored analyses of the given sentence or None if
+        the sentence is not in this cache
+        """
+        entry_path = self.get_entry_path(self.get_sentence_key(sentence))
+        try:
+            with open(entry_path, "r", encoding="utf-8") as file_object:
+                entry_data = json.load(file_object)
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return AnalysisCache.restore_connector(entry_data)
+
+    def store_connector(self, sentence, connector):
+        """
+        :param sentence: object of class SentenceObject
+        :type sentence: SentenceObject
+        :param connector: the analysed connector of the given sentence
+        :type connector: SentenceAnalysisConnector
+        :return: no return value, writes an entry for the sentence and evicts entries if the cache is too large
+        """
+        entry_path = self.get_entry_path(self.get_sentence_key(sentence))
+        entry_data = json.dumps(AnalysisCache.serialize_connector(connector), ensure_ascii=False,
+                                separators=(",", ":")).encode("utf-8")
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(entry_path), suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file_object:
+                file_object.write(entry_data)
+            os.replace(temporary_path, entry_path)
+        except OSError as error:
+            logger.debug("Fehler beim Schreiben in den Analyse-Cache: {err}".format(err=error))
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            return
+        self.stores += 1
+        self.current_size += len(entry_data)
+        if self.current_size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """
+        deletes least recently used entries until the size of this cache is at most EVICTION_RATIO of its maximum size
+        :return: no return value
+        """
+        entries = self.get_entries()
+        entries.sort(key=lambda x: x[2])
+        self.current_size = sum(entry[1] for entry in entries)
+        target_size = self.max_size * EVICTION_RATIO
+        for entry_path, entry_size, access_time in entries:
+            if self.current_size <= target_size:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            self.current_size -= entry_size
+            self.evictions += 1
+
+    def get_statistics(self):
+        """
+        :return: dict() with the number of hits, misses, stored entries and evicted entries of this run
+        """
+        return {"hits": self.hits, "misses": self.misses, "stores": self.stores, "evictions": self.evictions}
+
+    def log_statistics(self):
+        """
+        logs the counters of this run (see get_statistics)
+        :return: no return value
+        """
+        logger.info("Analysis cache: {hts} hits - {mss} misses - {strd} entries stored - {evc} entries evicted".format(
+            hts=self.hits, mss=self.misses, strd=self.stores, evc=self.evictions))
+
+    @staticmethod
+    def serialize_connector(connector):
+        """
+        :param connector: an analysed connector (after the valence holder lemmas were set)
+        :type connector: SentenceAnalysisConnector
+        :return: list with the validity of the analysis at position [0], the length of the list of analyses returned
+        by get_full_analysis_list of the connector at position [1] and a list() with a list [analysis type, valence
+        holder, valence holder lemma, avz words, aux words, connecting node, positions of sub analyses type I, positions
+        of sub analyses type II, complements] for each analysis at position [2] (the analyses returned by
+        get_full_analysis_list first, followed by all other sub analyses); each complement is a list
+        [complement class, nodes] with a list [word id, label, position of parent node] for each node of the complement
+        (root first, position of parent of root is -1)
+        """
+        if not connector.is_valid_analysis():
+            return [False, 0, list()]
+        analysis_list = list(connector.get_full_analysis_list())
+        full_list_length = len(analysis_list)
+        analysis_positions = dict((id(analysis), position) for position, analysis in enumerate(analysis_list))
+        for analysis in analysis_list:
+            for sub_analysis in analysis.get_class_one_sub_analysis() + analysis.get_class_two_sub_analysis():
+                if id(sub_analysis) not in analysis_positions:
+                    analysis_positions[id(sub_analysis)] = len(analysis_list)
+                    analysis_list.append(sub_analysis)
+        analysis_data = list()
+        for analysis in analysis_list:
+            analysis_type = 0
+            connecting_node_value = None
+            if isinstance(analysis, DasSubOne):
+                analysis_type = 1
+                connecting_node_value = analysis.get_connecting_node()
+            elif isinstance(analysis, DasSbTwo):
+                analysis_type = 2
+                connecting_node_value = analysis.get_connecting_node()
+            complement_data = list()
+            for complement in analysis.get_complements():
+                node_data = list()
+                node_positions = dict()
+                for parent, node in Node.depth_first_traversal(complement.get_complement_tree()):
+                    parent_position = -1
+                    if parent is not None:
+                        parent_position = node_positions[id(parent)]
+                    node_positions[id(node)] = len(node_data)
+                    node_data.append([node.get_node(), node.get_label(), parent_position])
+                complement_data.append([complement.get_complement_class(), node_data])
+            analysis_data.append([analysis_type, analysis.get_valence_holder(), analysis.get_valence_holder_lemma(),
+                                  list(analysis.get_avz_words()), list(analysis.get_aux_words()), connecting_node_value,
+                                  list(analysis_positions[id(sub_analysis)]
+                                       for sub_analysis in analysis.get_class_one_sub_analysis()),
+                                  list(analysis_positions[id(sub_analysis)]
+                                       for sub_analysis in analysis.get_class_two_sub_analysis()),
+                                  complement_data])
+        return [True, full_list_length, analysis_data]
+
+    @staticmethod
+    def restore_connector(entry_data):
+        """
+        :param entry_data: serialized connector (see serialize_connector)
+        :type entry_data: List
+        :return: object of class CachedAnalysisConnector
+        """
+        valid_analysis, full_list_length, analysis_data = entry_data
+        analysis_list = list()
+        for analysis_type, valence_holder, valence_holder_lemma, avz_words, aux_words, connecting_node_value, \
+                class_i_positions, class_ii_positions, complement_data in analysis_data:
+            complements = list()
+            for comp_class, node_data in complement_data:
+                nodes = list()
+                node_children = list()
+                for w_id, label, parent_position in node_data:
+                    node = Node(w_id, label)
+                    if parent_position >= 0:
+                        node_children[parent_position].append(node)
+                    nodes.append(node)
+                    node_children.append(list())
+                for node, children in zip(nodes, node_children):
+                    node.set_new_children_list(children)
+                complements.append(Cmp(nodes[0], comp_class))
+            analysis_list.append(CachedAnalysis(analysis_type, valence_holder, valence_holder_lemma, avz_words,
+                                                aux_words, connecting_node_value, complements))
+        for analysis, analysis_entry in zip(analysis_list, analysis_data):
+            analysis.class_i_sub_analysis = list(analysis_list[position] for position in analysis_entry[6])
+            analysis.class_ii_sub_analysis = list(analysis_list[position] for position in analysis_entry[7])
+        return CachedAnalysisConnector(valid_analysis, analysis_list[:full_list_length])
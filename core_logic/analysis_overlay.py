@@ -0,0 +1,110 @@
+from core_logic.complement import Complement as Cmp
+
+
+class AnalysisOverlay:
+    """
+    Lightweight view of an object of class DependencyAnalysis (or subclass or IndexedAnalysis) used by class
+    ValencyFrame, holds its own (alterable) complement classes for each complement of the analysis while the analysis
+    itself (including its complements) is shared and never altered, thus several valency frames can be created from the
+    same analyses
+    """
+
+    __slots__ = ('analysis', 'complement_classes')
+
+    def __init__(self, analysis):
+        """
+        :param analysis: the analysis to create an overlay for, complement classes are copied from its complements
+        (in order of its complements, i.e. its complement class pattern)
+        :type analysis: DependencyAnalysis or IndexedAnalysis
+        """
+        self.analysis = analysis
+        self.complement_classes = list(analysis.get_complement_class_pattern())
+
+    def __str__(self):
+        string = "Valenzträger: {vh} - lemma: {lm}\nKomplementklassen: ".\
+            format(vh=self.analysis.get_valence_holder(), lm=self.analysis.get_valence_holder_lemma())
+        for comp_class in self.get_complement_class_pattern():
+            string += "{cmpcls} ".format(cmpcls=Cmp.comp_class_def(comp_class))
+        return string + "\n"
+
+    def get_analysis(self):
+        """
+        :return: the (shared) analysis of this overlay
+        """
+        return self.analysis
+
+    def get_valence_holder(self):
+        """
+        :return: word id of valence holder of the analysis
+        """
+        return self.analysis.get_valence_holder()
+
+    def get_valence_holder_lemma(self):
+        """
+        :return: lemma (string) of valence holder of the analysis
+        """
+        return self.analysis.get_valence_holder_lemma()
+
+    def is_primary_analysis(self):
+        """
+        :return: True if the analysis is a primary analysis, False otherwise
+        """
+        return self.analysis.is_primary_analysis()
+
+    def get_complement_positions_by_class(self, cmp_class):
+        """
+        :param cmp_class: coding of complement classes
+        :type cmp_class: list
+        :return: list of positions (in the list of complements of the analysis) of all complements whose current
+        complement class in this overlay is given by cmp_class or an empty list
+        """
+        position_list = list()
+        for position, comp_class in enumerate(self.complement_classes):
+            if comp_class in cmp_class:
+                position_list.append(position)
+        return position_list
+
+    def get_complement_class(self, position):
+        """
+        :param position: position of complement in the list of complements of the analysis
+        :type position: Integer
+        :return: current complement class (as int) of this complement in this overlay
+        """
+        return self.complement_classes[position]
+
+    def set_complement_class(self, position, new_class):
+        """
+        :raises ValueError if given complement class is not a valid complement class
+        :param position: position of complement in the list of complements of the analysis
+        :type position: Integer
+        :param new_class: new complement class
+        :type new_class: Integer
+        :return: none, alters complement class of this overlay (the complement of the analysis is not altered)
+        """
+        if not Cmp.is_valid_comp_class(new_class):
+            raise ValueError
+        else:
+            self.complement_classes[position] = new_class
+
+    def get_root_w_id(self, position):
+        """
+        :param position: position of complement in the list of complements of the analysis
+        :type position: Integer
+        :return: word id (as int) of root of this complement
+        """
+        return self.analysis.get_complement_root_w_id(position)
+
+    def get_root_label(self, position):
+        """
+        :param position: position of complement in the list of complements of the analysis
+        :type position: Integer
+        :return: string that is label for root of this complement
+        """
+        return self.analysis.get_complement_root_label(position)
+
+    def get_complement_class_pattern(self):
+        """
+        :return: tuple() of codes (i.e. integers) indicating the current pattern of complement classes in this overlay,
+        sorted by value of complement class coding (includes multiple complements of the same class)
+        """
+        return tuple(sorted(self.complement_classes))
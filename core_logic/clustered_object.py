@@ -6,6 +6,8 @@ class ClusteredObject:
     Abstract object used for clustering by K-Means-Algorithm
     """
 
+    __slots__ = ('object_key', 'normalized_object_value', 'centroid', 'original_object_value')
+
     def __init__(self, object_key, normalized_object_value, original_object_value):
         """
         single object for analysis with k-means,
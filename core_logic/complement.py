@@ -1,9 +1,140 @@
+from core_logic.label_schema import LabelSchema
 from core_logic.node import Node
 
 import logging
 
 logger = logging.getLogger('VRRCL')
 
+PREPOSITION_CODING_FACTOR = 1000
+
+_COMP_CLASS_CODING = {
+    0: 'Ksubj',
+    1: 'Kgen',
+    2: 'Kdat',
+    3: 'Kakk',
+    4: 'Kprp',
+    5: 'Kadv',
+    6: 'Kprd',
+    7: 'Kvrb',
+    10: 'SKkon/cj',
+    11: 'SKkonj',
+    12: 'SKneb',
+    13: 'SKobjc',
+    14: 'SKrel',
+    15: 'SKs',
+    16: 'SKsubjc',
+    100: 'NA',
+    110000: 'à',
+    111000: 'ab',
+    112000: 'abseits',
+    113000: 'abzüglich',
+    114000: 'an',
+    115000: 'angesichts',
+    116000: 'anhand',
+    117000: 'anlässlich',
+    118000: 'anstatt',
+    119000: 'anstelle',
+    120000: 'auf',
+    121000: 'aufgrund',
+    122000: 'aus',
+    123000: 'ausgenommen',
+    124000: 'ausschließlich',
+    125000: 'außer',
+    126000: 'außerhalb',
+    127000: 'bar',
+    128000: 'bei',
+    129000: 'betreffend',
+    130000: 'betreffs',
+    131000: 'bezüglich',
+    132000: 'binnen',
+    133000: 'bis',
+    134000: 'dank',
+    135000: 'diesseits',
+    136000: 'durch',
+    137000: 'einbegriffen',
+    138000: 'eingedenk',
+    139000: 'einschließlich',
+    140000: 'entgegen',
+    141000: 'entlang',
+    142000: 'entsprechend',
+    143000: 'exklusive',
+    144000: 'fern',
+    145000: 'fernab',
+    146000: 'für',
+    147000: 'gegen',
+    148000: 'gegenüber',
+    149000: 'gemäß',
+    150000: 'gleich',
+    151000: 'halber',
+    152000: 'hinsichtlich',
+    153000: 'hinsichts',
+    154000: 'hinter',
+    155000: 'in',
+    156000: 'inbegriffen',
+    157000: 'infolge',
+    158000: 'inklusive',
+    159000: 'inmitten',
+    160000: 'innerhalb',
+    161000: 'je',
+    162000: 'jenseits',
+    163000: 'kontra',
+    164000: 'kraft',
+    165000: 'längs',
+    166000: 'längsseits',
+    167000: 'laut',
+    168000: 'links',
+    169000: 'mangels',
+    170000: 'mit',
+    171000: 'mitsamt',
+    172000: 'mittels',
+    173000: 'nach',
+    174000: 'nächst',
+    175000: 'nahe',
+    176000: 'neben',
+    177000: 'nebst',
+    178000: 'ob',
+    179000: 'oberhalb',
+    180000: 'ohne',
+    181000: 'per',
+    182000: 'pro',
+    183000: 'qua',
+    184000: 'rechts',
+    185000: 'samt',
+    186000: 'seit',
+    187000: 'seitens',
+    188000: 'seitwärts',
+    189000: 'statt',
+    190000: 'trotz',
+    191000: 'über',
+    192000: 'um',
+    193000: 'unbeschadet',
+    194000: 'unfern',
+    195000: 'ungeachtet',
+    196000: 'unter',
+    197000: 'unterhalb',
+    198000: 'unweit',
+    199000: 'vermittels',
+    200000: 'vermöge',
+    201000: 'via',
+    202000: 'von',
+    203000: 'vor',
+    204000: 'vorbehaltlich',
+    205000: 'während',
+    206000: 'wegen',
+    207000: 'wider',
+    208000: 'zeit',
+    209000: 'zu',
+    210000: 'zufolge',
+    211000: 'zugunsten',
+    212000: 'zuliebe',
+    213000: 'zuwider',
+    214000: 'zuzüglich',
+    215000: 'zwecks',
+    216000: 'zwischen'}
+
+_PREPOSITION_TO_CODING = dict((name, coding) for coding, name in _COMP_CLASS_CODING.items()
+                              if coding >= PREPOSITION_CODING_FACTOR)
+
 
 class Complement:
     """
@@ -11,6 +142,9 @@ class Complement:
     note that results obtained with complement specification via preposition (see split_complement_coding) is not
     evaluated due to lack of available signature equivalents from EValbu
     """
+
+    __slots__ = ('complement_as_tree', 'root_word_id', 'root_label', 'complement_class')
+
     def __init__(self, complement_root, comp_class):
         """
         note that complement_class should always be an integer either
@@ -30,8 +164,20 @@ class Complement:
         self.complement_class = comp_class
 
     def __str__(self):
+        return self.get_output_string()
+
+    def get_output_string(self, position_to_w_id=None):
+        """
+        :param position_to_w_id: function that returns the original word id for the position of a word in the sentence
+        of this complement (see SentenceObject.position_to_w_id), if None, the positions are used as word ids
+        :type position_to_w_id: function or None
+        :return: string with complement class, word ids and labels of this complement (sorted by word ids)
+        """
         string = "complement class: {cmpcls}    ".format(cmpcls=Complement.comp_class_def(self.complement_class))
         id_and_label_list = self.get_word_ids_and_labels_in_order()
+        if position_to_w_id is not None:
+            id_and_label_list = sorted(([position_to_w_id(pair[0]), pair[1]] for pair in id_and_label_list),
+                                       key=lambda x: x[0])
         for pair in id_and_label_list:
             string += "word-id: {wid} - label: {lbl} | ".format(wid=str(pair[0]), lbl=str(pair[1]))
         if len(id_and_label_list) > 0:
@@ -58,11 +204,17 @@ class Complement:
         """
         return self.root_word_id
 
+    def get_complement_tree(self):
+        """
+        :return: object of class Node that is root of the tree of this complement
+        """
+        return self.complement_as_tree
+
     def get_word_ids_in_order(self):
         """
         :return: list of all word ids in this complement, sorted in ascending order
         """
-        node_list = Node.recursive_tree_to_list_conversion(self.complement_as_tree)
+        node_list = Node.iterative_tree_to_list_conversion(self.complement_as_tree)
         new_node_list = list()
         for node in node_list:
             new_node_list.append([node.get_node()])
@@ -74,7 +226,7 @@ class Complement:
         :return: list() of lists(), each element in outer list contains word ids at position [0] and labels at position [1]
         for each word in this complement, list is sorted in ascending order by word ids
         """
-        node_list = Node.recursive_tree_to_list_conversion(self.complement_as_tree)
+        node_list = Node.iterative_tree_to_list_conversion(self.complement_as_tree)
         new_node_list = list()
         for node in node_list:
             new_node_list.append([node.get_node(), node.get_label()])
@@ -96,43 +248,24 @@ class Complement:
     @staticmethod
     def specify_initial_complement_classes(label):
         """
-        used during initialisation of dependency analysis
+        used during initialisation of dependency analysis, complement classes of labels are given by the active label
+        schema (see class LabelSchema)
         :param label: a label to convert to a complement-class-coding
         :type label: String
         :return: integer in range 0-7 for complement classes intended for output, 10-16 intended for internal with sub
         sentences and 100 intended for indicating a complement that cannot be further specified
         """
-        if label in ('subj', 'subjc'):
-            return 0
-        elif label == 'objg':
-            return 1
-        elif label == 'objd':
-            return 2
-        elif label in ('obja', 'obja2'):
-            return 3
-        elif label == 'objp':
-            return 4
-        elif label == 'pp':
-            return 5
-        elif label == 'pred':
-            return 6
-        elif label == 'obji':
-            return 7
-        elif label in ('kon', 'cj'):
-            return 10
-        elif label == 'konj':
-            return 11
-        elif label == 'neb':
-            return 12
-        elif label == 'objc':
-            return 13
-        elif label == 'rel':
-            return 14
-        elif label == 's':
-            return 15
-        elif label == 'subjc':
-            return 16
-        return 100
+        return Complement.specify_initial_complement_classes_by_label_code(LabelSchema.intern_label(label))
+
+    @staticmethod
+    def specify_initial_complement_classes_by_label_code(label_code):
+        """
+        see specify_initial_complement_classes
+        :param label_code: an interned label (see class LabelSchema) to convert to a complement-class-coding
+        :type label_code: Integer
+        :return: integer that is coding for a complement class
+        """
+        return LabelSchema.get_active_schema().get_complement_class(label_code)
 
     @staticmethod
     def sort_complement_list(complement_list):
@@ -156,7 +289,6 @@ class Complement:
         :type comp_class: integer
         :return: a string, possibly an empty string if no valid complement class was given
         """
-        comp_class_def = Complement.comp_class_coding()
         if comp_class.__class__ is not int:
             logger.debug("Error in class Complement: param comp_class is not int")
             return ""
@@ -167,28 +299,25 @@ class Complement:
         comp_class = split_complement[0]
         preposition = split_complement[1]
         if preposition == -1:
-            return comp_class_def[comp_class]
+            return _COMP_CLASS_CODING[comp_class]
         else:
-            new_string = comp_class_def[comp_class] + "|" + comp_class_def[preposition]
+            new_string = _COMP_CLASS_CODING[comp_class] + "|" + _COMP_CLASS_CODING[preposition]
             return new_string
 
     @staticmethod
     def split_complement_coding(comp_class):
         """
-        used to test a complement class coding for its lengths and split it in separate codings for preposition and
-        actual complement class;
+        used to split a complement class coding in separate codings for preposition and actual complement class (any
+        coding >= PREPOSITION_CODING_FACTOR contains a coding for a preposition);
         :param comp_class: complement class to be splitted
         :type comp_class: integer
         :return: a list with an integer as coding for actual complement class at position [0] and a coding for the
         specified preposition (or -1 if no preposition was given) at position [1]
         """
-        comp_class_as_str = str(comp_class)
-        if len(comp_class_as_str) > 3:
-            preposition = int(comp_class_as_str[:3]) * 1000
-            comp_class = int(comp_class_as_str[3:])
-        else:
-            preposition = -1
-        return [comp_class, preposition]
+        if comp_class >= PREPOSITION_CODING_FACTOR:
+            preposition, comp_class = divmod(comp_class, PREPOSITION_CODING_FACTOR)
+            return [comp_class, preposition * PREPOSITION_CODING_FACTOR]
+        return [comp_class, -1]
 
     @staticmethod
     def is_valid_comp_class(comp_class):
@@ -199,148 +328,34 @@ class Complement:
         :return: True if this integer is a valid coding for a complement class used for output or during analysis of
         valency frame, False otherwise
         """
-        comp_class_def = Complement.comp_class_coding()
         split_complement = Complement.split_complement_coding(comp_class)
         comp_class = split_complement[0]
         preposition = split_complement[1]
-        if comp_class not in comp_class_def.keys():
+        if comp_class not in _COMP_CLASS_CODING:
             return False
-        elif (preposition != -1) & (preposition not in comp_class_def.keys()):
+        elif (preposition != -1) & (preposition not in _COMP_CLASS_CODING):
             return False
         else:
             return True
 
+    @staticmethod
+    def get_preposition_coding(preposition):
+        """
+        used to specify a complement class by a preposition (the coding of the preposition is added to the coding of
+        the complement class, see split_complement_coding)
+        :param preposition: a preposition (lower case)
+        :type preposition: String
+        :return: coding (as int) of given preposition or None if given string is no preposition with a known coding
+        """
+        return _PREPOSITION_TO_CODING.get(preposition)
+
     @staticmethod
     def comp_class_coding():
         """
         used to decode an integer to a string either indicating a complement class, an internal representation of
         a specific type of phrase or a more complex coding of a complement class combined with a coding of a preposition
         (combination only intended for use with complements of class 4 or 5)
-        :return: returns a dictionary with integers (in range 0-7, 10-16, 100, and specific six digit values) as keys
-        and strings as values for each key
-        """
-        comp_class_def = {
-            0: 'Ksubj',
-            1: 'Kgen',
-            2: 'Kdat',
-            3: 'Kakk',
-            4: 'Kprp',
-            5: 'Kadv',
-            6: 'Kprd',
-            7: 'Kvrb',
-            10: 'SKkon/cj',
-            11: 'SKkonj',
-            12: 'SKneb',
-            13: 'SKobjc',
-            14: 'SKrel',
-            15: 'SKs',
-            16: 'SKsubjc',
-            100: 'NA',
-            110000: 'à',
-            111000: 'ab',
-            112000: 'abseits',
-            113000: 'abzüglich',
-            114000: 'an',
-            115000: 'angesichts',
-            116000: 'anhand',
-            117000: 'anlässlich',
-            118000: 'anstatt',
-            119000: 'anstelle',
-            120000: 'auf',
-            121000: 'aufgrund',
-            122000: 'aus',
-            123000: 'ausgenommen',
-            124000: 'ausschließlich',
-            125000: 'außer',
-            126000: 'außerhalb',
-            127000: 'bar',
-            128000: 'bei',
-            129000: 'betreffend',
-            130000: 'betreffs',
-            131000: 'bezüglich',
-            132000: 'binnen',
-            133000: 'bis',
-            134000: 'dank',
-            135000: 'diesseits',
-            136000: 'durch',
-            137000: 'einbegriffen',
-            138000: 'eingedenk',
-            139000: 'einschließlich',
-            140000: 'entgegen',
-            141000: 'entlang',
-            142000: 'entsprechend',
-            143000: 'exklusive',
-            144000: 'fern',
-            145000: 'fernab',
-            146000: 'für',
-            147000: 'gegen',
-            148000: 'gegenüber',
-            149000: 'gemäß',
-            150000: 'gleich',
-            151000: 'halber',
-            152000: 'hinsichtlich',
-            153000: 'hinsichts',
-            154000: 'hinter',
-            155000: 'in',
-            156000: 'inbegriffen',
-            157000: 'infolge',
-            158000: 'inklusive',
-            159000: 'inmitten',
-            160000: 'innerhalb',
-            161000: 'je',
-            162000: 'jenseits',
-            163000: 'kontra',
-            164000: 'kraft',
-            165000: 'längs',
-            166000: 'längsseits',
-            167000: 'laut',
-            168000: 'links',
-            169000: 'mangels',
-            170000: 'mit',
-            171000: 'mitsamt',
-            172000: 'mittels',
-            173000: 'nach',
-            174000: 'nächst',
-            175000: 'nahe',
-            176000: 'neben',
-            177000: 'nebst',
-            178000: 'ob',
-            179000: 'oberhalb',
-            180000: 'ohne',
-            181000: 'per',
-            182000: 'pro',
-            183000: 'qua',
-            184000: 'rechts',
-            185000: 'samt',
-            186000: 'seit',
-            187000: 'seitens',
-            188000: 'seitwärts',
-            189000: 'statt',
-            190000: 'trotz',
-            191000: 'über',
-            192000: 'um',
-            193000: 'unbeschadet',
-            194000: 'unfern',
-            195000: 'ungeachtet',
-            196000: 'unter',
-            197000: 'unterhalb',
-            198000: 'unweit',
-            199000: 'vermittels',
-            200000: 'vermöge',
-            201000: 'via',
-            202000: 'von',
-            203000: 'vor',
-            204000: 'vorbehaltlich',
-            205000: 'während',
-            206000: 'wegen',
-            207000: 'wider',
-            208000: 'zeit',
-            209000: 'zu',
-            210000: 'zufolge',
-            211000: 'zugunsten',
-            212000: 'zuliebe',
-            213000: 'zuwider',
-            214000: 'zuzüglich',
-            215000: 'zwecks',
-            216000: 'zwischen'}
-        return comp_class_def
+        :return: returns a (new) dictionary with integers (in range 0-7, 10-16, 100, and specific six digit values) as
+        keys and strings as values for each key
+        """
+        return dict(_COMP_CLASS_CODING)
@@ -8,7 +8,12 @@ class DependencyAnalysis:
     nature of dependency tree, analyses are structured recursively as well
     """
 
-    def __init__(self, tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis):
+    __slots__ = ('valence_holder', 'valence_holder_lemma', 'avz_words', 'aux_words', 'class_i_sub_analysis',
+                 'class_ii_sub_analysis', 'complements', 'pruned_analysis', 'primary_analysis', 'raw_tree', 'raw_verb',
+                 'raw_avz_nodes', 'raw_aux_nodes')
+
+    def __init__(self, tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis,
+                 build_complements=True):
         """
         note that only tree_rote is saves as an object of class Node, verb, avz_nodes and aux_nodes are only saves by
         their node_value, thus access to the entire tree is only possible via self.raw_tree
@@ -27,6 +32,9 @@ class DependencyAnalysis:
         :param class_ii_analysis: list of analyses of sub sentences of this sub sentence (sub tree) initiated with the
         labels "rel", "s", "neb", "objc", "konj", "subjc" (i.e. a sub sentence starting with an "indicating phrase")
         :type class_ii_analysis: List
+        :param build_complements: if False, no complements are created for this sub sentence (pruned analysis, used
+        for sub sentences whose valence holder is not of interest, see SentenceAnalysisConnector)
+        :type build_complements: Bool
         """
         self.valence_holder = verb.get_node()
         self.valence_holder_lemma = ""
@@ -39,12 +47,14 @@ class DependencyAnalysis:
         self.class_i_sub_analysis = class_i_analysis.copy()
         self.class_ii_sub_analysis = class_ii_analysis.copy()
         self.complements = list()
-        for child in tree_root.get_children():
-            complement_class = Cmp.specify_initial_complement_classes(child.get_label())
-            complement_tree = child.cut_tree()
-            new_complement = Cmp(complement_tree, complement_class)
-            self.complements.append(new_complement)
-        self.complements = Cmp.sort_complement_list(self.complements)
+        self.pruned_analysis = not build_complements
+        if build_complements:
+            for child in tree_root.iterate_children():
+                complement_class = Cmp.specify_initial_complement_classes_by_label_code(child.get_label_code())
+                complement_tree = child.cut_tree()
+                new_complement = Cmp(complement_tree, complement_class)
+                self.complements.append(new_complement)
+            self.complements = Cmp.sort_complement_list(self.complements)
         self.primary_analysis = False
         self.raw_tree = tree_root
         self.raw_verb = verb
@@ -96,6 +106,22 @@ class DependencyAnalysis:
         """
         return self.complements
 
+    def get_complement_root_w_id(self, position):
+        """
+        :param position: position of a complement in the list of complements of this analysis
+        :type position: Integer
+        :return: word id (as int) of root of this complement
+        """
+        return self.complements[position].get_root_w_id()
+
+    def get_complement_root_label(self, position):
+        """
+        :param position: position of a complement in the list of complements of this analysis
+        :type position: Integer
+        :return: string that is label for root of this complement
+        """
+        return self.complements[position].get_root_label()
+
     def get_valence_holder_lemma(self):
         """
         :return: lemma (string) of valence holder of this analysis
@@ -108,6 +134,12 @@ class DependencyAnalysis:
         """
         return self.avz_words
 
+    def get_aux_words(self):
+        """
+        :return: list of nodes (as integers) in tree with label aux indicating auxiliary verbs
+        """
+        return self.aux_words
+
     def set_avz_words(self, new_words):
         """
         sets attribute self.avz_words with new_words
@@ -136,6 +168,12 @@ class DependencyAnalysis:
         new_complement_list = Cmp.sort_complement_list(self.complements)
         self.complements = new_complement_list
 
+    def is_pruned_analysis(self):
+        """
+        :return: True if no complements were created for this sub sentence (see __init__), False otherwise
+        """
+        return self.pruned_analysis
+
     def set_primary_analysis(self, boolean_value):
         """
         primary analysis is used to determine if analysis of this sub sentence is analysis for the verb looked up in
@@ -178,26 +216,43 @@ class DependencyAnalysis:
         sets valence holder lemma and primary analysis for new analysis, does NOT include any analyses of subsentences
         (i.e. analysis in lists of own DependencyAanalysisSubTypeI or DependencyAanalysisSubTypeII)
         """
-        new_tree_root = Node.recursive_deep_copy_tree(self.raw_tree)
+        new_tree_root = Node.iterative_deep_copy_tree(self.raw_tree)
         new_avz_nodes = self.raw_avz_nodes.copy()
         new_aux_nodes = self.raw_aux_nodes.copy()
         new_analysis = None
         if self.__class__ == DependencyAnalysis:
             new_analysis = DependencyAnalysis(new_tree_root, self.raw_verb, new_avz_nodes, new_aux_nodes, list(),
-                                              list())
+                                              list(), not self.pruned_analysis)
         elif self.__class__ == DependencyAnalysisSubTypeI:
             new_analysis = DependencyAnalysisSubTypeI(new_tree_root, self.raw_verb, new_avz_nodes, new_aux_nodes,
-                                                      list(), list())
+                                                      list(), list(), not self.pruned_analysis)
         elif self.__class__ == DependencyAnalysisSubTypeII:
             new_analysis = DependencyAnalysisSubTypeII(new_tree_root, self.raw_verb, new_avz_nodes, new_aux_nodes,
-                                                       list(), list())
+                                                       list(), list(), not self.pruned_analysis)
         new_analysis.set_valence_holder_lemma(self.valence_holder_lemma)
         new_analysis.set_primary_analysis(self.primary_analysis)
         return new_analysis
 
+    @staticmethod
+    def analysis_traversal(given_analysis):
+        """
+        traverses an analysis and all analyses of its sub sentences via an explicit stack (no recursion)
+        :param given_analysis: an analysis
+        :type given_analysis: DependencyAnalysis
+        :return: generator of given_analysis and all analyses of sub sentences (and their sub sentences), ordered by
+        depth-first-search (analyses of sub sentences type I before type II), i.e. every analysis is yielded before the
+        analyses of its sub sentences
+        """
+        stack = [given_analysis]
+        while len(stack) > 0:
+            analysis = stack.pop()
+            yield analysis
+            stack.extend(reversed(analysis.class_ii_sub_analysis))
+            stack.extend(reversed(analysis.class_i_sub_analysis))
+
     def updated_complement_class_coding(self, given_analysis):
         """
-        intended for use during recursive deep copy of self so that complement classes that were changed during analysis
+        intended for use during deep copy of self so that complement classes that were changed during analysis
         of valency frame (e.g. from Kadv to Kprp) are copied correctly
         :param given_analysis: analysis whose complement classes should be copied to the complements of self
         :return: no return value, possibly alters complement classes of own complements
@@ -208,33 +263,57 @@ class DependencyAnalysis:
                     my_complement.set_complement_class(given_complement.get_complement_class())
                     break
 
-    def recursive_deep_copy_analysis(self):
+    def iterative_deep_copy_analysis(self):
         """
+        copies all analyses of sub sentences before the analyses they are sub analyses of (see analysis_traversal), no
+        recursion is used
         :return: deep copy (of current state, i.e. sets all complement codings to current codings of complements in
         self) of analysis
         """
-        new_tree_root = Node.recursive_deep_copy_tree(self.raw_tree)
-        new_verb = Node.recursive_deep_copy_tree(self.raw_verb)
+        analysis_copies = dict()
+        for analysis in reversed(list(DependencyAnalysis.analysis_traversal(self))):
+            class_i_sub_analyses = list(analysis_copies[id(sub_analysis)]
+                                        for sub_analysis in analysis.class_i_sub_analysis)
+            class_ii_sub_analysis = list(analysis_copies[id(sub_analysis)]
+                                         for sub_analysis in analysis.class_ii_sub_analysis)
+            analysis_copies[id(analysis)] = analysis.deep_copy_analysis_with_sub_analyses(class_i_sub_analyses,
+                                                                                          class_ii_sub_analysis)
+        return analysis_copies[id(self)]
+
+    def recursive_deep_copy_analysis(self):
+        """
+        former name of iterative_deep_copy_analysis, kept for compatibility
+        """
+        return self.iterative_deep_copy_analysis()
+
+    def deep_copy_analysis_with_sub_analyses(self, class_i_sub_analyses, class_ii_sub_analysis):
+        """
+        :param class_i_sub_analyses: copies of the analyses of sub sentences (sub type I) of this analysis
+        :type class_i_sub_analyses: List
+        :param class_ii_sub_analysis: copies of the analyses of sub sentences (sub type II) of this analysis
+        :type class_ii_sub_analysis: List
+        :return: deep copy (of current state, i.e. sets all complement codings to current codings of complements in
+        self) of this analysis with the given analyses of sub sentences
+        """
+        new_tree_root = Node.iterative_deep_copy_tree(self.raw_tree)
+        new_verb = Node.iterative_deep_copy_tree(self.raw_verb)
         new_avz_nodes = self.raw_avz_nodes.copy()
         new_aux_nodes = self.raw_aux_nodes.copy()
-        class_i_sub_analyses = list()
-        for analysis in self.class_i_sub_analysis:
-            class_i_sub_analyses.append(analysis.recursive_deep_copy_analysis())
-        class_ii_sub_analysis = list()
-        for analysis in self.class_ii_sub_analysis:
-            class_ii_sub_analysis.append(analysis.recursive_deep_copy_analysis())
         new_analysis = None
         if self.__class__ == DependencyAnalysis:
             new_analysis = DependencyAnalysis(new_tree_root, new_verb, new_avz_nodes, new_aux_nodes,
-                                              class_i_sub_analyses, class_ii_sub_analysis)
+                                              class_i_sub_analyses, class_ii_sub_analysis,
+                                              not self.pruned_analysis)
             new_analysis.updated_complement_class_coding(self)
         elif self.__class__ == DependencyAnalysisSubTypeI:
             new_analysis = DependencyAnalysisSubTypeI(new_tree_root, new_verb, new_avz_nodes, new_aux_nodes,
-                                                      class_i_sub_analyses, class_ii_sub_analysis)
+                                                      class_i_sub_analyses, class_ii_sub_analysis,
+                                                      not self.pruned_analysis)
             new_analysis.updated_complement_class_coding(self)
         elif self.__class__ == DependencyAnalysisSubTypeII:
             new_analysis = DependencyAnalysisSubTypeII(new_tree_root, new_verb, new_avz_nodes, new_aux_nodes,
-                                                       class_i_sub_analyses, class_ii_sub_analysis)
+                                                       class_i_sub_analyses, class_ii_sub_analysis,
+                                                       not self.pruned_analysis)
             new_analysis.updated_complement_class_coding(self)
         new_analysis.set_valence_holder_lemma(self.valence_holder_lemma)
         new_analysis.set_primary_analysis(self.primary_analysis)
@@ -247,12 +326,16 @@ class DependencyAnalysisSubTypeI(DependencyAnalysis):
     indicated by connecting "kon"- (and possibly "cj"-) Nodes
     """
 
-    def __init__(self, tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis):
+    __slots__ = ('connecting_node_value', 'direct_upper_analysis', 'main_analysis')
+
+    def __init__(self, tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis,
+                 build_complements=True):
         """
         see super for all parameters; has new parameter connecting_node_value which indicates which node the subtree
         for this analysis was cut off at (is set to value of kon-node if kon-node is followed by cj-node)
         """
-        super().__init__(tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis)
+        super().__init__(tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis,
+                         build_complements)
         self.connecting_node_value = tree_root.get_node()
         self.direct_upper_analysis = None
         self.main_analysis = None
@@ -286,12 +369,12 @@ class DependencyAnalysisSubTypeI(DependencyAnalysis):
         new_analysis.set_connecting_node(self.get_connecting_node())
         return new_analysis
 
-    def recursive_deep_copy_analysis(self):
+    def deep_copy_analysis_with_sub_analyses(self, class_i_sub_analyses, class_ii_sub_analysis):
         """
         uses super for copy of analysis and sets connecting node of new analysis to own connecting node
         :return: the copy of the new analysis
         """
-        new_analysis = super().recursive_deep_copy_analysis()
+        new_analysis = super().deep_copy_analysis_with_sub_analyses(class_i_sub_analyses, class_ii_sub_analysis)
         new_analysis.set_connecting_node(self.get_connecting_node())
         return new_analysis
 
@@ -299,16 +382,21 @@ class DependencyAnalysisSubTypeI(DependencyAnalysis):
 class DependencyAnalysisSubTypeII(DependencyAnalysis):
     """
     Dependency Analysis for sub sentences of a sentence indicated via different phrases, e.g. "dass, es...", TypeII is
-    indicated by connecting 'konj', 'neb', 'objc', 'rel', 's' and 'subjc' Nodes (currently hard coded in
-    SentenceAnalysisConnector during recursive creation of dependency analysis
+    indicated by connecting 'konj', 'neb', 'objc', 'rel', 's' and 'subjc' Nodes (given by label group
+    "sub_sentence_type_ii" of the active LabelSchema used by SentenceAnalysisConnector during recursive creation of
+    dependency analysis)
     """
 
-    def __init__(self, tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis):
+    __slots__ = ('connecting_node_value', 'direct_upper_analysis', 'main_analysis')
+
+    def __init__(self, tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis,
+                 build_complements=True):
         """
         see super for all parameters; has new parameter connecting_node_value which indicates which node the subtree
         for this analysis was cut off at
         """
-        super().__init__(tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis)
+        super().__init__(tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis,
+                         build_complements)
         self.connecting_node_value = tree_root.get_node()
         self.direct_upper_analysis = None
         self.main_analysis = None
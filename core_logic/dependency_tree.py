@@ -1,3 +1,4 @@
+from core_logic.label_schema import LabelSchema
 from core_logic.various_errors import IncorrectTreeError
 from core_logic.node import Node
 from core_logic.node import WorkingTreeRootNode
@@ -40,7 +41,7 @@ class DependencyTree:
 
     def append_any_node_by_children_list(self, new_children, given_node):
         """
-        uses recursive_tree_look_up_by_node_value() to look for value of given node, appends children of this node via
+        uses iterative_tree_look_up_by_node_value() to look for value of given node, appends children of this node via
         append_children_by_list()
         :param new_children: list() of objects of class Node used as new children of given_node
         :type new_children: List
@@ -49,7 +50,7 @@ class DependencyTree:
         :type given_node: Node
         :return: none, alters children of a node in own dependency tree (indicated by node value)
         """
-        node_to_alter = Node.recursive_tree_look_up_by_node_value(self.tree_root, given_node.get_node())
+        node_to_alter = Node.iterative_tree_look_up_by_node_value(self.tree_root, given_node.get_node())
         if node_to_alter is not None:
             node_to_alter.append_children_by_list(new_children)
 
@@ -65,9 +66,10 @@ class DependencyTree:
         :return: list() of copies of all direct children of node that was cut off, i.e. list() of deep copied objects
         of class Node with all their children
         """
+        label_mask = LabelSchema.get_label_mask(labels)
         new_sub_trees = list()
-        for child in self.tree_root.get_children():
-            if child.get_label() in labels:
+        for child in self.tree_root.iterate_children():
+            if (1 << child.get_label_code()) & label_mask:
                 new_child = child.cut_tree()
                 new_sub_trees.append(new_child)
         return new_sub_trees
@@ -79,7 +81,7 @@ class DependencyTree:
         :type labels: List
         :return: list() of all children of all nodes (with label given by labels) that were cut off
         """
-        new_raw_trees_with_label = Node.recursive_search_and_cut(self.tree_root, labels)
+        new_raw_trees_with_label = Node.iterative_search_and_cut(self.tree_root, labels)
         return new_raw_trees_with_label
 
     def change_root_class_to_workingtreerootnode(self):
@@ -87,9 +89,7 @@ class DependencyTree:
         :return: none, changes class of root of tree given by self.tree_root to WorkingTreeRootNode, sets list() of
         old children as new children
         """
-        children = list()
-        for child in self.tree_root.get_children():
-            children.append(child)
+        children = self.tree_root.iterate_children()
         new_tree_root = WorkingTreeRootNode(self.tree_root.get_node(), self.tree_root.get_label())
         new_tree_root.set_new_children_list(children)
         self.tree_root = new_tree_root
@@ -101,7 +101,7 @@ class DependencyTree:
         children of new root, does absolutely no checks for tree consistency!
         :param root: single object of class Node
         :type root: Node
-        :param children: list() of objects of class Node
+        :param children: list() of (or iterator over) objects of class Node
         :type children: List
         :return: root (as object of class Node) of the new tree
         """
@@ -112,7 +112,7 @@ class DependencyTree:
             new_root = Node(root.get_node(), root.get_label())
         new_children = list()
         for child in children:
-            new_child = Node.recursive_deep_copy_tree(child)
+            new_child = Node.iterative_deep_copy_tree(child)
             new_children.append(new_child)
         new_root.set_new_children_list(new_children)
         return new_root
@@ -125,7 +125,7 @@ class DependencyTree:
         :type given_tree_root: Node
         :return: new object of class Node with new objects of class Node as children (and children of children)
         """
-        new_root = DependencyTree.deep_copy_tree(given_tree_root, given_tree_root.get_children())
+        new_root = DependencyTree.deep_copy_tree(given_tree_root, given_tree_root.iterate_children())
         return new_root
 
     @staticmethod
@@ -136,45 +136,42 @@ class DependencyTree:
         :return: list() of all nodes (as objects of class Node) that are children (or children of children) of node,
                  ordered by depth-first-search
         """
-        sub_tree_as_list = Node.recursive_tree_to_list_conversion(root)
+        sub_tree_as_list = Node.iterative_tree_to_list_conversion(root)
         return sub_tree_as_list
 
     @staticmethod
-    def initialize_dependency_tree(words, raw_dep_tree):
+    def initialize_dependency_tree(words, raw_dep_tree, validated=False):
         """
         tries to create dependency tree from raw tree data from database
         :raises various IncorrectTreeErrors
         :param words: words (as strings) for given sentence
         :type words: List
         :param raw_dep_tree: edges for dependency tree
-        :type raw_dep_tree: List with format [vertex1, vertex2, label], where vertex1 and vertex2 are integers and label
-        is string
+        :type raw_dep_tree: List with format [vertex1, vertex2, label], where vertex1 and vertex2 are integers (positions
+        of words, see class SentenceObject) and label is string
+        :param validated: if True, the tree data was already validated (see get_tree_error_code) and is not checked again
+        :type validated: Bool
         :return: new object of class DependencyTree (with Object of class Node set as tree_root) or exception
         """
         try:
-            DependencyTree.check_tree_validity(words, raw_dep_tree)
+            if not validated:
+                DependencyTree.check_tree_validity(words, raw_dep_tree)
         except IncorrectTreeError as err:
             raise err
         else:
             new_node_value = DependencyTree.determine_root(raw_dep_tree)
             new_node_value = new_node_value[0]
             new_tree_root = Node(new_node_value, 'root')
-            queue = list()
-            queue += [new_tree_root]
-            while len(queue) > 0:
-                current_node = queue[0]
-                current_node_value = current_node.get_node()
-                new_raw_nodes = DependencyTree.get_outbound_edges(raw_dep_tree, current_node_value)
+            vertex_to_outbound_edges = DependencyTree.get_outbound_edges_by_vertex(raw_dep_tree)
+            stack = [new_tree_root]
+            while len(stack) > 0:
+                current_node = stack.pop()
+                new_raw_nodes = vertex_to_outbound_edges[current_node.get_node()]
                 new_children = list()
                 for node in new_raw_nodes:
                     new_children.append(Node(node[1], node[2]))
                 current_node.set_new_children_list(new_children)
-                new_queue = current_node.get_children()
-                queue.pop(0)
-                for old_object in queue:
-                    new_queue.append(old_object)
-                if len(new_queue) > 0:
-                    queue = new_queue
+                stack.extend(current_node.iterate_children())
             new_dependency_tree = DependencyTree(new_tree_root)
             return new_dependency_tree
 
@@ -190,19 +187,46 @@ class DependencyTree:
         :type raw_dep_tree: List
         :return:
         """
+        error_code = DependencyTree.get_tree_error_code(words, raw_dep_tree)
+        if error_code is not None:
+            raise IncorrectTreeError(error_code)
+
+    @staticmethod
+    def get_tree_error_code(words, raw_dep_tree):
+        """
+        same checks as check_tree_validity without raising an exception, intended for validation of many sentences
+        :param words: list() of tokens (i.e. words and punctuation) in the sentence
+        :type words: List
+        :param raw_dep_tree: list of edges for dependency tree
+        :type raw_dep_tree: List
+        :return: error code (as int, see IncorrectTreeError) of the first failed check or None if the tree is valid
+        """
+        diff = DependencyTree.get_token_edge_difference(words)
+        if len(words) - len(raw_dep_tree) != diff:
+            return 1
+        roots = DependencyTree.determine_root(raw_dep_tree)
+        if len(roots) != 1:
+            return 2
+        elif not DependencyTree.circle_free(raw_dep_tree):
+            return 3
+        elif not DependencyTree.valid_root(raw_dep_tree, roots):
+            return 4
+        return None
+
+    @staticmethod
+    def get_token_edge_difference(words):
+        """
+        :param words: list() of tokens (i.e. words and punctuation) in the sentence
+        :type words: List
+        :return: expected difference (as int) between number of tokens and number of edges of a valid tree, i.e. one
+        for the root plus one for each punctuation token (without edge)
+        """
         diff = 1
         for token in words:
             if len(token) == 1:
                 if (not token.isupper()) & (not token.islower()) & (not token.isdigit()):
                     diff = diff + 1
-        if len(words) - len(raw_dep_tree) != diff:
-            raise IncorrectTreeError(1)
-        elif len(DependencyTree.determine_root(raw_dep_tree)) != 1:
-            raise IncorrectTreeError(2)
-        elif not DependencyTree.circle_free(raw_dep_tree):
-            raise IncorrectTreeError(3)
-        elif not DependencyTree.valid_root(raw_dep_tree, DependencyTree.determine_root(raw_dep_tree)):
-            raise IncorrectTreeError(4)
+        return diff
 
     @staticmethod
     def determine_root(tree):
@@ -212,16 +236,14 @@ class DependencyTree:
         :type tree: List
         :return:  a list of vertices that have no incoming edges
         """
-        heads = []
-        tails = []
+        tails = set(edge[1] for edge in tree)
         diff = []
+        found_heads = set()
         for edge in tree:
-            heads.append(edge[0])
-            tails.append(edge[1])
-        for head in heads:
-            if head not in tails:
-                if head not in diff:
-                    diff.append(head)
+            head = edge[0]
+            if (head not in tails) and (head not in found_heads):
+                found_heads.add(head)
+                diff.append(head)
         return diff
 
     @staticmethod
@@ -231,12 +253,14 @@ class DependencyTree:
         :type tree: List
         :param root: root for which to check in tree
         :type root: List
-        returns False if no edge from root in tree has label "subj" or "subjc", True otherwise
+        returns False if no edge from root in tree has a subject label (i.e. "subj" or "subjc", see label group "subject"
+        of class LabelSchema), True otherwise
         """
+        subject_labels = LabelSchema.get_active_schema().get_label_group("subject")
         valid = False
         for edge in tree:
             if edge[0] == root[0]:
-                if (edge[2] == 'subj') | (edge[2] == 'subjc'):
+                if edge[2] in subject_labels:
                     valid = True
                     break
         return valid
@@ -263,15 +287,21 @@ class DependencyTree:
         :type tree: List
         :return: True, if forest/tree does not contain circles, loops or edges with two parents, False otherwise
         """
+        vertex_to_children = dict()
+        for edge in tree:
+            if edge[0] not in vertex_to_children:
+                vertex_to_children[edge[0]] = list()
+            vertex_to_children[edge[0]].append(edge[1])
         reachable = DependencyTree.determine_root(tree)
+        reached = set(reachable)
         i = 0
         while i < len(reachable):
-            new_vertices = DependencyTree.get_children_in_raw_tree(tree, reachable[i])
-            for vertex in reachable:
-                for new_vertex in new_vertices:
-                        if vertex == new_vertex:
-                            return False
-            reachable = reachable + new_vertices
+            new_vertices = vertex_to_children.get(reachable[i], list())
+            for new_vertex in new_vertices:
+                if new_vertex in reached:
+                    return False
+            reached.update(new_vertices)
+            reachable.extend(new_vertices)
             i = i + 1
         return True
 
@@ -289,3 +319,21 @@ class DependencyTree:
             if vertex == edge[0]:
                 outbound_edges.append(edge)
         return outbound_edges
+
+    @staticmethod
+    def get_outbound_edges_by_vertex(tree):
+        """
+        intended for vertices that are positions of words (i.e. small non-negative integers), replaces a search via
+        get_outbound_edges for every vertex of the tree
+        :param tree: edges and labels as [[vertex_11, vertex_12, label_1], ..., [vertex_n1, vertex_n2, label_n]]
+        :type tree: List
+        :return: list() with the list of all edges going out of each vertex (in order of given tree) at the index given
+        by the vertex
+        """
+        vertex_count = 0
+        for edge in tree:
+            vertex_count = max(vertex_count, edge[0] + 1, edge[1] + 1)
+        vertex_to_outbound_edges = list(list() for _ in range(vertex_count))
+        for edge in tree:
+            vertex_to_outbound_edges[edge[0]].append(edge)
+        return vertex_to_outbound_edges
@@ -0,0 +1,161 @@
+import json
+
+DEFAULT_LABEL_SCHEMA = {
+    "complement_classes": {
+        "subj": 0,
+        "subjc": 0,
+        "objg": 1,
+        "objd": 2,
+        "obja": 3,
+        "obja2": 3,
+        "objp": 4,
+        "pp": 5,
+        "pred": 6,
+        "obji": 7,
+        "kon": 10,
+        "cj": 10,
+        "konj": 11,
+        "neb": 12,
+        "objc": 13,
+        "rel": 14,
+        "s": 15},
+    "default_complement_class": 100,
+    "label_groups": {
+        "subject": ["subj", "subjc"],
+        "aux": ["aux"],
+        "avz": ["avz"],
+        "sub_sentence_type_i": ["kon"],
+        "conjunct": ["cj"],
+        "sub_sentence_type_ii": ["konj", "neb", "objc", "rel", "s", "subjc"]}}
+
+
+class LabelSchema:
+    """
+    Schema of the (ParZu) labels of a dependency tree: complement class for each label and groups of labels used to cut
+    a dependency tree into sub sentences;
+    every label is interned to a small integer (label code) when a node of a tree is created, label codes are shared by
+    all schemas so that the active schema can be replaced without recreating any tree, sets of labels are represented
+    as bitmasks of label codes
+    """
+
+    label_to_code = dict()
+    code_to_label = list()
+    active_schema = None
+
+    def __init__(self, schema_data):
+        """
+        :param schema_data: dictionary with a dictionary of labels to complement classes under the key
+        "complement_classes", the complement class for all other labels under the key "default_complement_class" and a
+        dictionary of group names to lists of labels under the key "label_groups" (see DEFAULT_LABEL_SCHEMA)
+        :type schema_data: Dictionary
+        """
+        self.complement_classes = dict(schema_data["complement_classes"])
+        self.default_complement_class = schema_data["default_complement_class"]
+        self.label_groups = dict()
+        self.group_masks = dict()
+        for group_name, labels in schema_data["label_groups"].items():
+            self.label_groups[group_name] = list(labels)
+            self.group_masks[group_name] = LabelSchema.get_label_mask(labels)
+        self.fingerprint = json.dumps([self.complement_classes, self.default_complement_class, self.label_groups],
+                                      sort_keys=True)
+        self.complement_class_by_code = list()
+        self.compile_complement_classes()
+
+    def compile_complement_classes(self):
+        """
+        creates lookup table with the complement class of every label code interned so far at the position of the
+        label code
+        :return: no return value
+        """
+        self.complement_class_by_code = list()
+        for label in LabelSchema.code_to_label:
+            self.complement_class_by_code.append(self.complement_classes.get(label, self.default_complement_class))
+
+    def get_complement_class(self, label_code):
+        """
+        :param label_code: interned label
+        :type label_code: Integer
+        :return: integer that is coding of complement class (see class Complement) for the label
+        """
+        if label_code >= len(self.complement_class_by_code):
+            self.compile_complement_classes()
+        return self.complement_class_by_code[label_code]
+
+    def get_fingerprint(self):
+        """
+        :return: string that identifies the complement classes and label groups of this schema (e.g. used as part of
+        the key of cached analyses, see class AnalysisCache)
+        """
+        return self.fingerprint
+
+    def get_label_group(self, group_name):
+        """
+        :param group_name: name of a group of labels, e.g. "aux" or "sub_sentence_type_ii"
+        :type group_name: String
+        :return: copy of the list of labels of this group
+        """
+        return self.label_groups[group_name].copy()
+
+    def get_group_mask(self, group_name):
+        """
+        :param group_name: name of a group of labels, e.g. "aux" or "sub_sentence_type_ii"
+        :type group_name: String
+        :return: bitmask (as int) of the label codes of this group
+        """
+        return self.group_masks[group_name]
+
+    @staticmethod
+    def intern_label(label):
+        """
+        :param label: a label of a dependency tree
+        :type label: String
+        :return: label code (as int) of given label, a new label code is assigned to labels not seen before
+        """
+        label_code = LabelSchema.label_to_code.get(label)
+        if label_code is None:
+            label_code = len(LabelSchema.code_to_label)
+            LabelSchema.label_to_code[label] = label_code
+            LabelSchema.code_to_label.append(label)
+        return label_code
+
+    @staticmethod
+    def get_label_mask(labels):
+        """
+        :param labels: labels of a dependency tree
+        :type labels: List
+        :return: bitmask (as int) with the bit of the label code of each given label set, membership of a node with
+        label code c is tested via (1 << c) & mask
+        """
+        label_mask = 0
+        for label in labels:
+            label_mask |= 1 << LabelSchema.intern_label(label)
+        return label_mask
+
+    @staticmethod
+    def get_active_schema():
+        """
+        :return: object of class LabelSchema currently used for analysis of dependency trees
+        """
+        if LabelSchema.active_schema is None:
+            LabelSchema.active_schema = LabelSchema(DEFAULT_LABEL_SCHEMA)
+        return LabelSchema.active_schema
+
+    @staticmethod
+    def set_active_schema(schema):
+        """
+        :param schema: object of class LabelSchema to be used for all following analyses of dependency trees
+        :type schema: LabelSchema
+        :return: no return value
+        """
+        LabelSchema.active_schema = schema
+
+    @staticmethod
+    def load_schema_from_file(file_name):
+        """
+        :param file_name: name of a json file with the format of DEFAULT_LABEL_SCHEMA
+        :type file_name: String
+        :return: new object of class LabelSchema
+        """
+        with open(file_name, "r", encoding="utf-8") as file_object:
+            schema_data = json.load(file_object)
+        return LabelSchema(schema_data)
@@ -0,0 +1,74 @@
+from core_logic.label_schema import LabelSchema
+
+
+class LemmaIndex:
+    """
+    Inverted index of the lemmata of raw sentence data, created before any dependency tree is analyzed, used to find
+    all sentences that can contain a given verb so that only these sentences need to be analyzed;
+    the valence holder lemma of an analysis is the lemma of a word of the sentence, possibly prefixed by the lemmata of
+    cut off verb prefixes (avz), therefore a sentence is a candidate for a verb if it contains the verb as lemma or if
+    it has at least one avz-edge and contains a lemma that is a proper suffix of the verb (e.g. "an" + "kämpfen")
+    """
+
+    def __init__(self, raw_data):
+        """
+        :param raw_data: data from database, see class ValencyAnalysis
+        :type raw_data: List
+        """
+        self.raw_data = raw_data
+        self.lemma_to_positions = dict()
+        self.avz_lemma_to_positions = dict()
+        avz_labels = set(LabelSchema.get_active_schema().get_label_group("avz"))
+        for position, raw_sentence_data in enumerate(raw_data):
+            has_avz = False
+            for edge in raw_sentence_data[3]:
+                if (len(edge) > 2) and (edge[2] in avz_labels):
+                    has_avz = True
+                    break
+            sentence_lemmas = set(lemma for lemma in raw_sentence_data[5] if lemma.__class__ is str)
+            for lemma in sentence_lemmas:
+                LemmaIndex.add_position(self.lemma_to_positions, lemma, position)
+                if has_avz:
+                    LemmaIndex.add_position(self.avz_lemma_to_positions, lemma, position)
+
+    def get_candidate_positions(self, verb):
+        """
+        :param verb: a verb (possibly including cut off verb prefixes)
+        :type verb: String
+        :return: sorted list() of positions in raw data of all sentences that can contain given verb as valence holder
+        lemma
+        """
+        candidate_positions = set(self.lemma_to_positions.get(verb, list()))
+        for prefix_length in range(1, len(verb)):
+            candidate_positions.update(self.avz_lemma_to_positions.get(verb[prefix_length:], list()))
+        return sorted(candidate_positions)
+
+    def get_candidate_raw_data(self, verb):
+        """
+        :param verb: a verb (possibly including cut off verb prefixes)
+        :type verb: String
+        :return: list() of raw data of all sentences that can contain given verb as valence holder lemma (in order of
+        the raw data)
+        """
+        return list(self.raw_data[position] for position in self.get_candidate_positions(verb))
+
+    def get_sentence_count(self):
+        """
+        :return: number of sentences (as int) in raw data of this index
+        """
+        return len(self.raw_data)
+
+    @staticmethod
+    def add_position(lemma_to_positions, lemma, position):
+        """
+        :param lemma_to_positions: dict() with lemmata as keys and lists of positions as values
+        :type lemma_to_positions: Dictionary
+        :param lemma: a lemma
+        :type lemma: String
+        :param position: position of a sentence in raw data
+        :type position: Integer
+        :return: no return value, alters lemma_to_positions
+        """
+        if lemma not in lemma_to_positions:
+            lemma_to_positions[lemma] = list()
+        lemma_to_positions[lemma].append(position)
@@ -0,0 +1,76 @@
+from core_logic.sentence_object import SentenceObject as SenObj
+from core_logic.valency_analysis import ValencyAnalysis
+
+import logging
+
+logger = logging.getLogger('VRRCL')
+
+
+class MultiVerbValencyAnalysis:
+    """
+    Used to create valency analyses for several verbs with a single analysis of each sentence: each dependency tree is
+    analyzed once (independent of any verb), all analyses are grouped by the lemma of their valence holder (including
+    cut off verb prefixes, e.g. "an" + "kämpfen"), objects of class ValencyAnalysis are then created for each requested
+    verb from the sentences of its group
+    """
+
+    def __init__(self, raw_data, analysis_cache=None):
+        """
+        creates sentence for each data-set in raw_data, creates dependency analysis for each sentence and groups all
+        sentences by the valence holder lemmas of their analyses
+        :param raw_data: data from database, see class ValencyAnalysis
+        :type raw_data: List
+        :param analysis_cache: cache of analyses of sentences (see class AnalysisCache)
+        :type analysis_cache: AnalysisCache or None
+        """
+        self.error_counts = dict()
+        self.sentences = ValencyAnalysis.create_analyzed_sentences(raw_data, None, analysis_cache,
+                                                                   error_counts=self.error_counts)
+        self.lemma_to_sentences = dict()
+        for sentence in SenObj.get_sentences_with_valid_analysis(self.sentences):
+            sentence_lemmas = dict()
+            for analysis in sentence.get_full_sentence_analysis_list():
+                sentence_lemmas[analysis.get_valence_holder_lemma()] = None
+            for lemma in sentence_lemmas.keys():
+                if lemma not in self.lemma_to_sentences:
+                    self.lemma_to_sentences[lemma] = list()
+                self.lemma_to_sentences[lemma].append(sentence)
+        logger.info("\nData extraction complete: {qty} Sentences created - {lmqty} valence holder lemmas found".
+                    format(qty=len(self.sentences), lmqty=len(self.lemma_to_sentences)))
+        ValencyAnalysis.log_error_report(self.error_counts)
+
+    def get_verbs(self):
+        """
+        :return: list() of all valence holder lemmas (as strings) found in the analyses of all sentences
+        """
+        return list(self.lemma_to_sentences.keys())
+
+    def get_sentence_count(self, verb):
+        """
+        :param verb: a valence holder lemma
+        :type verb: String
+        :return: number of sentences (as int) with at least one analysis for the given verb
+        """
+        return len(self.lemma_to_sentences.get(verb, list()))
+
+    def get_valency_analysis(self, verb):
+        """
+        :param verb: verb used for the valency analysis
+        :type verb: String
+        :return: new object of class ValencyAnalysis for the given verb, using only the (already analyzed) sentences
+        with at least one analysis for this verb
+        """
+        return ValencyAnalysis(None, verb, sentences=self.lemma_to_sentences.get(verb, list()))
+
+    def get_valency_analyses(self, verbs=None):
+        """
+        :param verbs: verbs used for the valency analyses, if None all valence holder lemmas are used
+        :type verbs: List or None
+        :return: dict() with each verb as key and an object of class ValencyAnalysis for this verb as value
+        """
+        if verbs is None:
+            verbs = self.get_verbs()
+        verb_to_analysis = dict()
+        for verb in verbs:
+            verb_to_analysis[verb] = self.get_valency_analysis(verb)
+        return verb_to_analysis
@@ -1,11 +1,22 @@
+from core_logic.label_schema import LabelSchema
 from core_logic.various_errors import IncorrectTreeError
 
 
 class Node:
     """
-    Class for recursive creation, traversing and altering of a tree (assumed: dependency tree)
+    Class for recursive creation, traversing and altering of a tree (assumed: dependency tree);
+    the children of a node are kept as tuple, read via iterate_children (read-only, no copy) and altered only via the
+    methods of this class, a node is finalized (i.e. its children are sorted once and set as tuple) when its children
+    are set (see set_new_children_list), thus all children of a node are collected before it is finalized;
+    if copy counting is enabled (see set_copy_counting), every copy of the children as list (see get_children) is
+    counted
     """
 
+    __slots__ = ('node', 'label', 'label_code', 'children')
+
+    count_copies = False
+    children_copies = 0
+
     def __str__(self):
         new_string = "Node: {node} - Label: {lbl}".format(node=str(self.node), lbl=str(self.label))
         return new_string
@@ -14,26 +25,57 @@ class Node:
         """
         :param node: used as (unique) key identifying this specific node in the tree
         :type node: Integer
-        :param label: string with non unique label of this specific node
+        :param label: string with non unique label of this specific node, interned to a label code (see class
+        LabelSchema)
         :type label: String
         """
         self.node = node
         self.label = label
-        self.children = list()
+        self.label_code = LabelSchema.intern_label(label)
+        self.children = tuple()
 
     def get_children(self):
         """
-        :return: copy of the list() of objects of type Node given by self.children
+        only intended for callers that alter the list of children, use iterate_children otherwise
+        :return: new list() of the objects of type Node given by self.children
         """
-        new_children = self.children.copy()
+        if Node.count_copies:
+            Node.children_copies += 1
+        new_children = list(self.children)
         return new_children
 
+    def iterate_children(self):
+        """
+        :return: tuple of the objects of type Node given by self.children, sorted by node value (read-only, no copy)
+        """
+        return self.children
+
+    def get_child_count(self):
+        """
+        :return: number of children of this node
+        """
+        return len(self.children)
+
+    def get_first_child(self):
+        """
+        :return: first object of class Node in self.children (i.e. child with lowest node value) or None
+        """
+        if len(self.children) == 0:
+            return None
+        return self.children[0]
+
     def get_label(self):
         """
         :return: string that is label for this node (i.e. label of edge ending in this node or root)
         """
         return self.label
 
+    def get_label_code(self):
+        """
+        :return: integer that is interned label of this node (see class LabelSchema)
+        """
+        return self.label_code
+
     def get_node(self):
         """
         :return: integer that is word_id of this node
@@ -51,48 +93,53 @@ class Node:
             raise IncorrectTreeError(101)
         else:
             self.label = new_label
+            self.label_code = LabelSchema.intern_label(new_label)
 
     def set_new_single_child(self, new_child):
         """
         expects single object as input
         :param new_child: object of class Node
         :type new_child: Node
-        :return: sets self.children to a list containing only new_child
+        :return: sets self.children to a tuple containing only new_child
         """
-        self.children = [new_child]
+        self.children = (new_child,)
 
     def set_new_children_list(self, children_list):
         """
-        uses append_children_by_list to set all children in children_list as the only children in self.children
+        finalizes this node: sorts all children in children_list once by their node values and sets them as the only
+        children in self.children
         :param children_list: new children
         :type children_list: List
         :return: none, alters self.children
         """
-        self.children = list()
-        self.append_children_by_list(children_list)
+        if len(children_list) > 1:
+            self.children = tuple(sorted(children_list, key=lambda x: x.get_node()))
+        else:
+            self.children = tuple(children_list)
 
     def append_children_by_list(self, children_list):
         """
+        adds all children in children_list to the children of this (already finalized) node, the node is finalized
+        again with all its children (see set_new_children_list)
         :param children_list: a list() of objects of class Node
         :type children_list: List
         :return: none, alters self.children
         """
-        self.children.extend(children_list)
-        self.sort_children()
+        self.set_new_children_list(self.children + tuple(children_list))
 
     def sort_children(self):
         """
-        sort self.children by values of "node"
+        sort self.children by values of "node" (children are already sorted once the node is finalized, see
+        set_new_children_list)
         :return: None, alters self.children
         """
-        if len(self.children) > 1:
-            self.children.sort(key=lambda x: x.get_node())
+        self.set_new_children_list(self.children)
 
     def delete_all_children(self):
         """
-        :return: none, sets empty list as self.children
+        :return: none, sets empty tuple as self.children
         """
-        self.set_new_children_list(list())
+        self.children = tuple()
 
     def delete_child_from_children(self, given_child):
         """
@@ -100,9 +147,7 @@ class Node:
         :param given_child: object of class Node
         :return: none, alters self.children by deleting given_child
         """
-        for child in self.children:
-            if child is given_child:
-                self.children.remove(child)
+        self.children = tuple(child for child in self.children if child is not given_child)
 
     def delete_child_from_children_by_value(self, child_value):
         """
@@ -110,72 +155,126 @@ class Node:
         :type child_value: Integer
         :return: none, alters self.children by deleting node with child_value as node
         """
-        for child in self.children:
-            if child.get_node() == child_value:
-                self.children.remove(child)
+        self.children = tuple(child for child in self.children if child.get_node() != child_value)
 
     def cut_tree(self):
         """
-        alters self.children to empty list()
+        alters self.children to empty tuple
         :return: deep copy (i.e. new object of class Node) of self including deep copy of all children and children of
         children
         """
-        new_root = Node(self.get_node(), self.get_label())
-        old_children = self.get_children()
-        new_children = list()
-        for child in old_children:
-            new_child = Node.recursive_deep_copy_tree(child)
-            new_children.append(new_child)
-        new_root.set_new_children_list(new_children)
-        self.children = list()
+        new_root = Node.iterative_deep_copy_tree(self)
+        self.children = tuple()
         return new_root
 
-    def recursive_child_look_up_by_label(self, labels):
+    def iterative_child_look_up_by_label(self, labels):
         """
-        searches children and all children of children via recursion until first occurrence of label given by labels
+        searches children and all children of children until first occurrence of label given by labels
         :param labels: a list() of strings
         :type labels: List
         :return: complete list of all children (and children of children) that have a label given by labels
         """
-        children_with_label = list()
-        children_without_label = list()
-        for child in self.children:
-            if child.get_label() in labels:
-                children_with_label.append(child)
-            else:
-                children_without_label.append(child)
-        for child in children_without_label:
-            new_children = child.recursive_child_look_up_by_label(labels)
-            if len(new_children) > 0:
-                children_with_label.extend(new_children)
-        return children_with_label
+        return self.iterative_child_look_up_by_label_mask(LabelSchema.get_label_mask(labels))
+
+    def recursive_child_look_up_by_label(self, labels):
+        """
+        former name of iterative_child_look_up_by_label, kept for compatibility
+        """
+        return self.iterative_child_look_up_by_label(labels)
+
+    def iterative_child_look_up_by_label_mask(self, label_mask):
+        """
+        searches children and all children of children until first occurrence of label given by label_mask (see
+        first_occurrence_traversal)
+        :param label_mask: bitmask of label codes (see LabelSchema.get_label_mask)
+        :type label_mask: Integer
+        :return: complete list of all children (and children of children) that have a label given by label_mask
+        """
+        return list(Node.first_occurrence_traversal(self, label_mask))
+
+    def recursive_child_look_up_by_label_mask(self, label_mask):
+        """
+        former name of iterative_child_look_up_by_label_mask, kept for compatibility
+        """
+        return self.iterative_child_look_up_by_label_mask(label_mask)
 
     @staticmethod
-    def recursive_deep_copy_tree(given_node):
+    def depth_first_traversal(given_node):
+        """
+        traverses a tree via an explicit stack (no recursion, thus no limit for the depth of the tree), the tree must
+        not be altered during traversal
+        :param given_node: object of class Node functioning as root of the tree
+        :type given_node: Node
+        :return: generator of tuples (parent, node) for given_node (with None as parent) and all its children (and
+        children of children), ordered by depth-first-search
+        """
+        stack = [(None, given_node)]
+        while len(stack) > 0:
+            parent, node = stack.pop()
+            yield parent, node
+            for child in reversed(node.children):
+                stack.append((node, child))
+
+    @staticmethod
+    def first_occurrence_traversal(given_node, label_mask):
         """
-        creates new object of class Node with new objects of class Node for all its children via recursion
+        traverses a tree via an explicit stack (no recursion, thus no limit for the depth of the tree) and yields the
+        first occurrence of a label given by label_mask on every path from given_node, i.e. the children of a yielded
+        node are not searched; for each node, all its children with such a label are yielded before the children of
+        its other children are searched
+        :param given_node: object of class Node functioning as root of the tree
+        :type given_node: Node
+        :param label_mask: bitmask of label codes (see LabelSchema.get_label_mask)
+        :type label_mask: Integer
+        :return: generator of all children (and children of children) of given_node that have a label given by
+        label_mask and no ancestor (below given_node) with such a label
+        """
+        stack = [given_node]
+        while len(stack) > 0:
+            node = stack.pop()
+            children_without_label = list()
+            for child in node.children:
+                if (1 << child.label_code) & label_mask:
+                    yield child
+                else:
+                    children_without_label.append(child)
+            children_without_label.reverse()
+            stack.extend(children_without_label)
+
+    @staticmethod
+    def iterative_deep_copy_tree(given_node):
+        """
+        creates new object of class Node with new objects of class Node for all its children (see depth_first_traversal),
+        each copy is finalized once all its children are copied
         :param given_node: a tree to copy
         :type given_node: Node
         :return: a new object of class Node
         """
-        new_node = Node(given_node.get_node(), given_node.get_label())
-        old_children = given_node.get_children()
-        if len(old_children) == 0:
-            return new_node
-        else:
-            new_children = list()
-            for old_child in old_children:
-                new_child = Node.recursive_deep_copy_tree(old_child)
-                new_children.append(new_child)
-            new_node.append_children_by_list(new_children)
-            return new_node
+        new_root = None
+        node_copies = dict()
+        for parent, node in Node.depth_first_traversal(given_node):
+            new_node = Node(node.get_node(), node.get_label())
+            node_copies[id(node)] = [new_node, list()]
+            if parent is None:
+                new_root = new_node
+            else:
+                node_copies[id(parent)][1].append(new_node)
+        for new_node, new_children in node_copies.values():
+            new_node.set_new_children_list(new_children)
+        return new_root
 
     @staticmethod
-    def recursive_search_and_cut(given_node, labels):
+    def recursive_deep_copy_tree(given_node):
+        """
+        former name of iterative_deep_copy_tree, kept for compatibility
         """
-        searches tree via recursion for all first occurrences of any label given by labels, cuts of all found nodes and
-        returns list of all of their children, intended for cutting a tree into sub sentences given by labels like
-        "rel", "neb", ...,
+        return Node.iterative_deep_copy_tree(given_node)
+
+    @staticmethod
+    def iterative_search_and_cut(given_node, labels):
+        """
+        searches tree for all first occurrences of any label given by labels, cuts of all found nodes and returns list
+        of all of their children, intended for cutting a tree into sub sentences given by labels like "rel", "neb", ...,
         possibly alters given_node and children of given_node
         :param given_node: node functioning as root of a tree which is to be analyzed
         :type given_node: Node
@@ -184,7 +283,7 @@ class Node:
         :return: list(), of deep copied objects of class Node with all their children or empty list() if no cuts were
         made
         """
-        children_to_cut = given_node.recursive_child_look_up_by_label(labels)
+        children_to_cut = given_node.iterative_child_look_up_by_label(labels)
         new_children = list()
         for child in children_to_cut:
             new_child = child.cut_tree()
@@ -192,7 +291,14 @@ class Node:
         return new_children
 
     @staticmethod
-    def recursive_tree_look_up_by_node_value(given_node, node_value):
+    def recursive_search_and_cut(given_node, labels):
+        """
+        former name of iterative_search_and_cut, kept for compatibility
+        """
+        return Node.iterative_search_and_cut(given_node, labels)
+
+    @staticmethod
+    def iterative_tree_look_up_by_node_value(given_node, node_value):
         """
         :param given_node: object of class Node (including root of a tree) whose children are to be searched for a node
                with given value
@@ -202,33 +308,52 @@ class Node:
         :return: the first object of class Node whose object.value equals the given node_value, searched via depth first
         search
         """
-        if given_node.get_node() == node_value:
-            return given_node
-        if len(given_node.get_children()) == 0:
-            return None
-        else:
-            for child in given_node.get_children():
-                recursive_look_up_result = Node.recursive_tree_look_up_by_node_value(child, node_value)
-                if recursive_look_up_result is not None:
-                    return recursive_look_up_result
-            return None
+        for parent, node in Node.depth_first_traversal(given_node):
+            if node.get_node() == node_value:
+                return node
+        return None
 
     @staticmethod
-    def recursive_tree_to_list_conversion(given_node):
+    def recursive_tree_look_up_by_node_value(given_node, node_value):
+        """
+        former name of iterative_tree_look_up_by_node_value, kept for compatibility
+        """
+        return Node.iterative_tree_look_up_by_node_value(given_node, node_value)
+
+    @staticmethod
+    def iterative_tree_to_list_conversion(given_node):
         """
-        searches given_node via recursion
         :param given_node: object of class Node
         :type given_node: Node
         :return: list() of objects of class Node with given_node and all its children (and children of children)
         """
-        list_addition = list()
-        list_addition.append(given_node)
-        if len(given_node.get_children()) == 0:
-            return list_addition
-        else:
-            for child in given_node.get_children():
-                list_addition.extend(Node.recursive_tree_to_list_conversion(child))
-            return list_addition
+        return list(node for parent, node in Node.depth_first_traversal(given_node))
+
+    @staticmethod
+    def recursive_tree_to_list_conversion(given_node):
+        """
+        former name of iterative_tree_to_list_conversion, kept for compatibility
+        """
+        return Node.iterative_tree_to_list_conversion(given_node)
+
+
+    @staticmethod
+    def set_copy_counting(enabled):
+        """
+        :param enabled: if True, every copy of a list of children (see get_children) is counted from now on, the
+        counter is reset
+        :type enabled: Bool
+        :return: no return value
+        """
+        Node.count_copies = enabled
+        Node.children_copies = 0
+
+    @staticmethod
+    def get_children_copy_count():
+        """
+        :return: number of copies of lists of children since copy counting was enabled (see set_copy_counting)
+        """
+        return Node.children_copies
 
 
 class WorkingTreeRootNode(Node):
@@ -236,6 +361,8 @@ class WorkingTreeRootNode(Node):
     Used by SentenceAnalysisConnector during analysis of dependency tree
     """
 
+    __slots__ = ('original_label', 'sub_tree_roots')
+
     def __str__(self):
         return super().__str__() + " original label: {lbl}".format(lbl=self.get_original_label())
 
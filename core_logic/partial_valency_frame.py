@@ -0,0 +1,252 @@
+from core_logic.valency_index import HEAD_LEMMA_CLASSES
+from core_logic.various_errors import ValencyFrameError
+
+import json
+
+import logging
+
+logger = logging.getLogger('VRRCL')
+
+PARTIAL_FRAME_FORMAT = "VRRCL partial valency frame"
+PARTIAL_FRAME_VERSION = 1
+
+
+class PartialValencyFrame:
+    """
+    Mergeable statistics of the (not yet postprocessed) valency frame of a verb for a part (shard) of a corpus, used to
+    create a valency frame of the complete corpus without any part holding all analyses: instead of the analyses, only
+    each annotated signature (the complement classes of an analysis, the complements of class Kprp and Kadv with the
+    lemma of their root) with the sentence ids of all analyses with this signature, the sentence ids of the roots of the
+    Kadv of each sentence (input of the correction of Kadv to Kprp via k-means) and the weights of the sentences are
+    kept;
+    partial frames of disjoint parts are merged via merge (associative and commutative), the valency frame of the merged
+    statistics (see class ValencyFrame) is postprocessed exactly as the valency frame of all analyses
+    """
+
+    def __init__(self, verb, main_prime, total_sentence_count=0, signature_to_sen_ids=None,
+                 preposition_to_sen_ids=None, sentence_weights=None):
+        """
+        :param verb: verb of the valency frame
+        :type verb: String
+        :param main_prime: True if only the analyses of main sentences were used (see
+        ValencyAnalysis.initialize_valency_frame), False otherwise
+        :type main_prime: Bool
+        :param total_sentence_count: number of all sentences of the part (including the sentences without analysis)
+        :type total_sentence_count: Integer
+        :param signature_to_sen_ids: dict() with annotated signatures (tuple of (complement class, lemma of root or
+        None) for each complement, sorted) as keys and sentence id of each analysis with this signature as values
+        :type signature_to_sen_ids: Dictionary or None
+        :param preposition_to_sen_ids: dict() with lemmata of the roots of Kadv (first character in lower case) as keys
+        and sentence id for each such root (of the last analysis of each sentence) as values
+        :type preposition_to_sen_ids: Dictionary or None
+        :param sentence_weights: dict() with sentence ids as keys and weight of each sentence as value (only weights
+        other than 1)
+        :type sentence_weights: Dictionary or None
+        """
+        self.verb = verb
+        self.main_prime = main_prime
+        self.total_sentence_count = total_sentence_count
+        if signature_to_sen_ids is None:
+            signature_to_sen_ids = dict()
+        if preposition_to_sen_ids is None:
+            preposition_to_sen_ids = dict()
+        if sentence_weights is None:
+            sentence_weights = dict()
+        self.signature_to_sen_ids = signature_to_sen_ids
+        self.preposition_to_sen_ids = preposition_to_sen_ids
+        self.sentence_weights = sentence_weights
+
+    def __str__(self):
+        return "Partial valency frame for {vrb}: {ttlqty} sentences - {usdqty} used sentences - {sgnqty} signatures" \
+            .format(vrb=self.verb, ttlqty=self.total_sentence_count, usdqty=self.get_used_sentence_count(),
+                    sgnqty=len(self.signature_to_sen_ids))
+
+    def get_verb(self):
+        """
+        :return: verb (as string) of this partial frame
+        """
+        return self.verb
+
+    def is_main_prime(self):
+        """
+        :return: True if only the analyses of main sentences were used, False otherwise
+        """
+        return self.main_prime
+
+    def get_total_sentence_count(self):
+        """
+        :return: number (as int) of all sentences of the part(s) of this partial frame
+        """
+        return self.total_sentence_count
+
+    def get_sentence_ids(self):
+        """
+        :return: set() of the sentence ids of all used sentences (i.e. sentences with at least one analysis)
+        """
+        sentence_ids = set()
+        for sen_ids in self.signature_to_sen_ids.values():
+            sentence_ids.update(sen_ids)
+        return sentence_ids
+
+    def get_used_sentence_count(self):
+        """
+        :return: number (as int) of used sentences (i.e. sentences with at least one analysis)
+        """
+        return len(self.get_sentence_ids())
+
+    def get_signature_to_sen_ids(self):
+        """
+        :return: dict() with annotated signatures as keys and sentence id of each analysis with this signature as values
+        (see __init__)
+        """
+        return self.signature_to_sen_ids
+
+    def get_preposition_to_sen_ids(self):
+        """
+        :return: dict() with lemmata of the roots of Kadv as keys and sentence id for each such root as values (see
+        __init__)
+        """
+        return self.preposition_to_sen_ids
+
+    def get_sentence_weights(self):
+        """
+        :return: dict() with sentence ids as keys and weight of each sentence as value (sentences that are not in this
+        dict have weight 1)
+        """
+        return self.sentence_weights
+
+    def merge(self, other):
+        """
+        :raises ValencyFrameError if the partial frames have different verbs or were created with a different selection
+        of analyses (main_prime) or if they have common sentence ids
+        :param other: partial frame of another part of the corpus
+        :type other: PartialValencyFrame
+        :return: new object of class PartialValencyFrame with the statistics of both partial frames (sentence ids of
+        each signature and preposition are sorted, thus merging is associative and commutative)
+        """
+        if (self.verb != other.get_verb()) or (self.main_prime != other.is_main_prime()):
+            raise ValencyFrameError(9)
+        if not self.get_sentence_ids().isdisjoint(other.get_sentence_ids()):
+            raise ValencyFrameError(10)
+        sentence_weights = dict(self.sentence_weights)
+        sentence_weights.update(other.get_sentence_weights())
+        return PartialValencyFrame(self.verb, self.main_prime,
+                                   self.total_sentence_count + other.get_total_sentence_count(),
+                                   PartialValencyFrame.merge_sen_id_mappings(self.signature_to_sen_ids,
+                                                                             other.get_signature_to_sen_ids()),
+                                   PartialValencyFrame.merge_sen_id_mappings(self.preposition_to_sen_ids,
+                                                                             other.get_preposition_to_sen_ids()),
+                                   sentence_weights)
+
+    def save(self, file_name):
+        """
+        saves this partial frame as json file
+        :param file_name: name of the file
+        :type file_name: String
+        :return: no return value
+        """
+        frame_data = {"format": PARTIAL_FRAME_FORMAT, "version": PARTIAL_FRAME_VERSION, "verb": self.verb,
+                      "main_prime": self.main_prime, "total_sentence_count": self.total_sentence_count,
+                      "signatures": list([list(list(complement) for complement in signature), sen_ids]
+                                         for signature, sen_ids in self.signature_to_sen_ids.items()),
+                      "prepositions": list([preposition, sen_ids]
+                                           for preposition, sen_ids in self.preposition_to_sen_ids.items()),
+                      "sentence_weights": list([sen_id, weight] for sen_id, weight in self.sentence_weights.items())}
+        with open(file_name, "w", encoding="utf-8") as file_object:
+            json.dump(frame_data, file_object, ensure_ascii=False)
+
+    @staticmethod
+    def load(file_name):
+        """
+        :raises ValencyFrameError if the file is no valid file of a partial frame
+        :param file_name: name of a file saved via save
+        :type file_name: String
+        :return: new object of class PartialValencyFrame with the statistics of the given file
+        """
+        try:
+            with open(file_name, "r", encoding="utf-8") as file_object:
+                frame_data = json.load(file_object)
+            if (frame_data["format"] != PARTIAL_FRAME_FORMAT) or (frame_data["version"] != PARTIAL_FRAME_VERSION):
+                raise ValencyFrameError(11)
+            signature_to_sen_ids = dict()
+            for signature, sen_ids in frame_data["signatures"]:
+                signature_to_sen_ids[tuple((comp_class, head) for comp_class, head in signature)] = sen_ids
+            return PartialValencyFrame(frame_data["verb"], frame_data["main_prime"],
+                                       frame_data["total_sentence_count"], signature_to_sen_ids,
+                                       dict((preposition, sen_ids)
+                                            for preposition, sen_ids in frame_data["prepositions"]),
+                                       dict((sen_id, weight) for sen_id, weight in frame_data["sentence_weights"]))
+        except (IOError, ValueError, KeyError, TypeError) as err:
+            logger.warning(err)
+            raise ValencyFrameError(11)
+
+    @staticmethod
+    def create_from_valency_frame(valency_frame, verb, main_prime, total_sentence_count):
+        """
+        :raises ValencyFrameError if the lemma of the root of a Kprp or Kadv is not found
+        :param valency_frame: a valency frame created from analyses (see ValencyAnalysis.initialize_valency_frame), the
+        complement classes of its analyses are used as initialized (i.e. any postprocessing of the frame is ignored)
+        :type valency_frame: ValencyFrame
+        :param verb: verb of the valency frame
+        :type verb: String
+        :param main_prime: see __init__
+        :type main_prime: Bool
+        :param total_sentence_count: see __init__
+        :type total_sentence_count: Integer
+        :return: new object of class PartialValencyFrame with the statistics of the given valency frame
+        """
+        signature_to_sen_ids = dict()
+        preposition_to_sen_ids = dict()
+        for sen_id, analyses_list in valency_frame.get_sen_id_to_analyses_mapping().items():
+            for analysis_index, overlay in enumerate(analyses_list):
+                complement_classes = overlay.get_analysis().get_complement_class_pattern()
+                signature = list()
+                for position, comp_class in enumerate(complement_classes):
+                    head = None
+                    if comp_class in HEAD_LEMMA_CLASSES:
+                        head = valency_frame.get_word_by_w_id_s_id(overlay.get_root_w_id(position), sen_id)
+                        if (len(head) > 0) and head[0].isupper():
+                            head = head[0].lower() + head[1:]
+                    signature.append((comp_class, head))
+                    if (comp_class == 5) and (analysis_index == len(analyses_list) - 1):
+                        preposition = valency_frame.get_word_by_w_id_s_id(overlay.get_root_w_id(position), sen_id)
+                        if len(preposition) > 0:
+                            preposition = preposition[0].lower() + preposition[1:]
+                        PartialValencyFrame.add_sen_id(preposition_to_sen_ids, preposition, sen_id)
+                PartialValencyFrame.add_sen_id(signature_to_sen_ids, tuple(sorted(signature)), sen_id)
+        sentence_weights = dict()
+        for sen_id, weight in valency_frame.get_sentence_weights().items():
+            if (sen_id in valency_frame.get_sen_id_to_analyses_mapping()) and (weight != 1):
+                sentence_weights[sen_id] = weight
+        return PartialValencyFrame(verb, main_prime, total_sentence_count, signature_to_sen_ids,
+                                   preposition_to_sen_ids, sentence_weights)
+
+    @staticmethod
+    def merge_sen_id_mappings(first_mapping, second_mapping):
+        """
+        :param first_mapping: dict() with lists of sentence ids as values
+        :type first_mapping: Dictionary
+        :param second_mapping: dict() with lists of sentence ids as values
+        :type second_mapping: Dictionary
+        :return: new dict() with all keys of both mappings (sorted) and the sorted sentence ids of both mappings for
+        each key as value
+        """
+        merged_mapping = dict()
+        for key in sorted(set(first_mapping.keys()).union(second_mapping.keys())):
+            merged_mapping[key] = sorted(first_mapping.get(key, list()) + second_mapping.get(key, list()))
+        return merged_mapping
+
+    @staticmethod
+    def add_sen_id(key_to_sen_ids, key, sen_id):
+        """
+        :param key_to_sen_ids: dict() with lists of sentence ids as values
+        :type key_to_sen_ids: Dictionary
+        :param key: an annotated signature or a preposition
+        :type key: tuple or String
+        :param sen_id: a sentence id
+        :type sen_id: Integer
+        :return: no return value, alters key_to_sen_ids
+        """
+        if key not in key_to_sen_ids:
+            key_to_sen_ids[key] = list()
+        key_to_sen_ids[key].append(sen_id)
@@ -0,0 +1,102 @@
+from core_logic.various_errors import ValencyAnalysisError
+
+import hashlib
+import json
+
+import logging
+
+logger = logging.getLogger('VRRCL')
+
+
+class SentenceDeduplicator:
+    """
+    Ingest-time deduplication of raw sentence data (before any sentence is created or analyzed): the key of a data-set
+    is a hash of its normalized words and lemmata (without surrounding whitespace, case folded) and of the edges of its
+    dependency tree with the position of each word instead of its word id, thus duplicates with other sentence ids or
+    word ids are found as well; only the first data-set of each key is kept, with policy "weight" the number of
+    data-sets of each key is kept as weight of the sentence id of this first data-set (see get_sentence_weight)
+    """
+
+    SKIP = "skip"
+    WEIGHT = "weight"
+
+    def __init__(self, policy):
+        """
+        :raises ValencyAnalysisError if policy is unknown
+        :param policy: SKIP if duplicates are simply dropped, WEIGHT if they are counted as weight of the first
+        data-set with the same key
+        :type policy: String
+        """
+        if policy not in (SentenceDeduplicator.SKIP, SentenceDeduplicator.WEIGHT):
+            raise ValencyAnalysisError(9)
+        self.policy = policy
+        self.key_to_sentence_id = dict()
+        self.sentence_id_to_weight = dict()
+        self.duplicates = 0
+
+    def deduplicate(self, raw_data):
+        """
+        can be called several times (e.g. for several parts of a corpus), duplicates of data-sets of earlier calls are
+        found as well
+        :param raw_data: data from database, see class ValencyAnalysis
+        :type raw_data: List
+        :return: list() of all data-sets of raw_data that are no duplicates (in order of raw_data), data-sets that
+        could not be keyed (i.e. incomplete data-sets) are always kept
+        """
+        unique_raw_data = list()
+        for raw_sentence_data in raw_data:
+            key = SentenceDeduplicator.get_sentence_key(raw_sentence_data)
+            if key is None:
+                unique_raw_data.append(raw_sentence_data)
+                continue
+            sentence_id = self.key_to_sentence_id.get(key)
+            if sentence_id is None:
+                self.key_to_sentence_id[key] = raw_sentence_data[0]
+                unique_raw_data.append(raw_sentence_data)
+                continue
+            self.duplicates += 1
+            if self.policy == SentenceDeduplicator.WEIGHT:
+                self.sentence_id_to_weight[sentence_id] = self.sentence_id_to_weight.get(sentence_id, 1) + 1
+        return unique_raw_data
+
+    def get_sentence_weight(self, sentence_id):
+        """
+        :param sentence_id: id of a kept data-set
+        :type sentence_id: Integer
+        :return: number (as int) of data-sets with the same key as the given data-set (including itself) for policy
+        WEIGHT, always 1 for policy SKIP
+        """
+        return self.sentence_id_to_weight.get(sentence_id, 1)
+
+    def get_sentence_weights(self):
+        """
+        :return: dict() with the sentence id of each kept data-set with duplicates as key and its weight as value
+        (empty for policy SKIP), sentences that are not in this dict have weight 1
+        """
+        return self.sentence_id_to_weight
+
+    def log_statistics(self):
+        """
+        logs the number of unique data-sets and duplicates found by this deduplicator
+        :return: no return value
+        """
+        logger.info("Deduplication ({plc}): {qty} unique sentences - {dpl} duplicates".format(
+            plc=self.policy, qty=len(self.key_to_sentence_id), dpl=self.duplicates))
+
+    @staticmethod
+    def get_sentence_key(raw_sentence_data):
+        """
+        :param raw_sentence_data: a single data-set of raw data, see class ValencyAnalysis
+        :type raw_sentence_data: List
+        :return: hex string that is key of the given data-set or None if the data-set is incomplete
+        """
+        try:
+            w_id_to_position = dict((w_id, position) for position, w_id in enumerate(raw_sentence_data[1]))
+            words = list(str(word).strip().casefold() for word in raw_sentence_data[2])
+            lemmas = list(str(lemma).strip().casefold() for lemma in raw_sentence_data[5])
+            edges = list([w_id_to_position.get(edge[0], -1), w_id_to_position.get(edge[1], -1), edge[2]]
+                         for edge in raw_sentence_data[3])
+        except (TypeError, IndexError):
+            return None
+        key_data = [words, lemmas, edges]
+        return hashlib.sha256(json.dumps(key_data, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
@@ -1,6 +1,8 @@
 from core_logic.various_errors import ConnectorError
 from core_logic.various_errors import IncorrectInstantiationError, IncorrectTreeError
 from core_logic.sentence_to_analysis_connector import SentenceAnalysisConnector as SenAnCon
+from core_logic.skeleton_memo import SkeletonMemo
+from core_logic.word_store import WordStore
 
 import logging
 
@@ -10,79 +12,118 @@ logger = logging.getLogger('VRRCL')
 class SentenceObject:
     """
     Representing a single sentence (ideally) with a complete, correct dependency tree, and an analysis of this
-    dependency tree
+    dependency tree; word ids, words and lemmata of the sentence are kept in a (shared) WordStore;
+    the word ids of the database need not be consecutive, therefore the edges of the dependency tree are remapped to
+    the positions of the words in the sentence (0 to n-1) on creation, every word id used by the dependency tree and
+    the analyses of this sentence is such a position, the original word ids are only kept for output (see get_w_ids
+    and position_to_w_id)
     """
-    def __init__(self, s_id, sentence, raw_w_ids, raw_words, dep_tree, lemma_list):
+    def __init__(self, s_id, sentence, raw_w_ids, raw_words, dep_tree, lemma_list, word_store=None, validated=False):
         """
-        check data for incorrect or empty entries, set initial data as raw data, set dict{wid: word} for every word in
-        sentence
+        check data for incorrect or empty entries, set initial data as raw data, add word ids, words and lemmata to the
+        word store, remap the word ids of the edges to positions
         :raises various IncorrectInstantiationErrors if incorrect data-sets were netered
         :param s_id, sentence, raw_w_ids, raw_words, dep_tree: raw data from database
-        """
-        if s_id.__class__() != 0:
-            raise IncorrectInstantiationError(0)
-        elif s_id <= 0:
-            raise IncorrectInstantiationError(1)
-        elif (raw_w_ids is None) | (len(raw_w_ids) == 0) | (raw_w_ids.__class__() != []):
-            raise IncorrectInstantiationError(2)
-        elif (dep_tree is None) | (len(dep_tree) == 0) | (dep_tree.__class__() != []):
-            raise IncorrectInstantiationError(3)
-        else:
-            for edge in dep_tree:
-                if (edge[0] is None) | (edge[1] is None) | (edge[2] is None):
-                    raise IncorrectInstantiationError(4)
-                elif (not edge[0].__class__() == 0) | (not edge[1].__class__() == 0) | (not edge[2].isalpha()):
-                    raise IncorrectInstantiationError(4)
-                elif (edge[0] <= 0) | (edge[1] <= 0) | (len(edge[2]) == 0):
-                    raise IncorrectInstantiationError(4)
-        for lemma in lemma_list:
-            if lemma.__class__ is not str:
-                raise IncorrectInstantiationError(6)
+        :param word_store: store shared by the sentences of a corpus (see class WordStore), a new store is created for
+        this sentence if None
+        :type word_store: WordStore or None
+        :param validated: if True, the raw data was already validated (see get_instantiation_error_code and
+        DependencyTree.get_tree_error_code) and neither the raw data nor the dependency tree are checked again
+        :type validated: Bool
+        """
+        if not validated:
+            error_code = SentenceObject.get_instantiation_error_code(s_id, raw_w_ids, dep_tree, lemma_list)
+            if error_code is not None:
+                raise IncorrectInstantiationError(error_code)
+        if word_store is None:
+            word_store = WordStore()
         self.sentence_id = s_id
         self.sentence = sentence
-        self.w_ids = raw_w_ids
-        self.words = raw_words
-        self.raw_dep_tree = dep_tree
-        self.id_to_word_mapping = self.get_id_to_word_mapping()
-        self.lemma_list = lemma_list
+        self.raw_dep_tree = SentenceObject.remap_edges_to_positions(raw_w_ids, dep_tree)
+        self.word_store = word_store
+        self.sentence_number = word_store.add_sentence(s_id, raw_w_ids, raw_words, lemma_list)
         self.sentence_analysis_connector = None
+        self.validated = validated
 
     def __str__(self):
-        return "S-ID: {sid} - Sentence: {sen}\nSentence Analysis:{senanl}\n".format(sid=self.sentence_id,
-                                            sen=self.sentence, senanl=self.sentence_analysis_connector)
+        sentence_analysis = self.sentence_analysis_connector
+        if sentence_analysis is not None:
+            sentence_analysis = sentence_analysis.get_output_string(self.position_to_w_id)
+        return "S-ID: {sid} - Sentence: {sen}\nSentence Analysis:{senanl}\n".format(
+            sid=self.sentence_id, sen=self.sentence, senanl=sentence_analysis)
 
-    def analyze_dependence_tree(self, word_id_to_lemmata, verb):
+    def analyze_dependence_tree(self, word_id_to_lemmata, verb, analysis_cache=None, target_lemmas=None,
+                                main_only=False):
         """
         initiates creation of tree, creates object of class SentenceAnalysisConnector which is ultimately used for
         access to dependency analysis, initializes dependency analysis if no errors are encountered during creation of
-        dependency tree
+        dependency tree;
+        if an analysis cache is given and contains this sentence, the analyses are restored from the cache instead, if
+        a skeleton memo is active (see class SkeletonMemo), the analyses of a tree with a known skeleton are restored
+        from the memo;
+        if target lemmas are given, only the sub sentences of these valence holder lemmas are analyzed completely (see
+        SentenceAnalysisConnector.initial_dependency_analysis), if main_only is True, only the main sentence is
+        analyzed; such incomplete analyses are neither stored in the analysis cache nor in the skeleton memo
         :raises IncorrectTreeError if dependency tree could not be created correctly
-        :param word_id_to_lemmata: word ids of a sentence as keys and lemma of each word (given by table types in
-        database) as value, used to append valence holder lemma by prepositions
-        :type word_id_to_lemmata: Dictionary
-        :param verb: verb used for lookup in the database, needed to determine primary analyses
-        :type verb: String
+        :param word_id_to_lemmata: lemma of each word (given by table types in database) at the position of the word
+        (i.e. list of lemmata in order of words), used to append valence holder lemma by prepositions
+        :type word_id_to_lemmata: List
+        :param verb: verb used for lookup in the database, needed to determine primary analyses, if None no analysis is
+        marked as primary analysis (see mark_primary_analyses)
+        :type verb: String or None
+        :param analysis_cache: cache of analyses of sentences (see class AnalysisCache), new analyses are stored in it
+        :type analysis_cache: AnalysisCache or None
+        :param target_lemmas: valence holder lemmas of interest or None for complete analyses of all sub sentences
+        :type target_lemmas: Set or None
+        :param main_only: if True, the sub sentences are cut off but not analyzed
+        :type main_only: Bool
         :return: none, alters self.sentence_analysis_connector or raises exception
         """
+        if analysis_cache is not None:
+            cached_connector = analysis_cache.load_connector(self)
+            if cached_connector is not None:
+                self.sentence_analysis_connector = cached_connector
+                if verb is not None:
+                    self.mark_primary_analyses(verb)
+                return
+        complete_analysis = (target_lemmas is None) and (not main_only)
         try:
-            new_connector = SenAnCon(self.words, self.raw_dep_tree)
-            self.sentence_analysis_connector = new_connector
-            self.sentence_analysis_connector.initial_dependency_analysis()
+            skeleton_memo = SkeletonMemo.get_active_memo()
+            if (skeleton_memo is not None) and complete_analysis:
+                self.sentence_analysis_connector = skeleton_memo.get_connector(self.get_words(), self.raw_dep_tree,
+                                                                                  self.validated)
+            else:
+                new_connector = SenAnCon(self.get_words(), self.raw_dep_tree, self.validated)
+                self.sentence_analysis_connector = new_connector
+                self.sentence_analysis_connector.initial_dependency_analysis(word_id_to_lemmata, target_lemmas,
+                                                                              main_only)
             for analysis in self.get_full_sentence_analysis_list():
-                valence_holder = analysis.get_valence_holder()
-                new_lemma = str(word_id_to_lemmata[valence_holder])
+                new_lemma = SenAnCon.get_valence_holder_lemma(analysis.get_valence_holder(), analysis.get_avz_words(),
+                                                              word_id_to_lemmata)
                 new_avz_words = list()
                 for word in analysis.get_avz_words():
-                    new_lemma = str(word_id_to_lemmata[word]) + new_lemma
                     new_avz_words.append(str(word_id_to_lemmata[word]))
                 analysis.set_valence_holder_lemma(new_lemma)
                 analysis.set_avz_words(new_avz_words)
-                if new_lemma == verb:
-                    analysis.set_primary_analysis(True)
+            if (analysis_cache is not None) and complete_analysis:
+                analysis_cache.store_connector(self, self.sentence_analysis_connector)
+            if verb is not None:
+                self.mark_primary_analyses(verb)
         except IncorrectTreeError as error:
             self.sentence_analysis_connector = None
             raise error
 
+    def mark_primary_analyses(self, verb):
+        """
+        marks every analysis of this sentence whose valence holder lemma (including cut off verb prefixes) is the given
+        verb as primary analysis and every other analysis as no primary analysis, intended for use with a sentence that
+        is analyzed once and used for valency analyses of several verbs
+        :param verb: verb used for the valency analysis
+        :type verb: String
+        :return: none, alters primary analysis of all analyses of this sentence
+        """
+        self.sentence_analysis_connector.mark_primary_analyses(verb)
+
     def get_sentence_id(self):
         """
         :return: integer that is sentence_id of this sentence in database
@@ -97,21 +138,52 @@ class SentenceObject:
 
     def get_w_ids(self):
         """
-        :return: list of word_ids for this sentence from database
-        (in order of words received from database, consistent with order of self.words)
+        :return: list of original word_ids for this sentence from database
+        (in order of words received from database, consistent with order of get_words)
+        """
+        return self.word_store.get_w_ids(self.sentence_number)
+
+    def position_to_w_id(self, position):
+        """
+        intended for output of a word id received from a dependency analysis or dependency tree
+        :param position: position of a word in this sentence
+        :type position: Integer
+        :return: original word id (as int) of the word at given position or None if there is no such position
         """
-        return self.w_ids
+        store_position = self.word_store.get_store_position(self.sentence_number, position)
+        if store_position is None:
+            return None
+        return self.word_store.w_ids[store_position]
 
     def get_words(self):
         """
         :return: list of words for this sentence from database
-        (in order of words received from database, consistent with order of self.w_ids)
+        (in order of words received from database, consistent with order of get_w_ids)
+        """
+        return self.word_store.get_words(self.sentence_number)
+
+    def get_lemma_list(self):
         """
-        return self.words
+        :return: list of lemmas for this sentence from database (in order of get_w_ids)
+        """
+        return self.word_store.get_lemmas(self.sentence_number)
+
+    def get_word_store(self):
+        """
+        :return: object of class WordStore with the word ids, words and lemmata of this sentence
+        """
+        return self.word_store
+
+    def get_sentence_number(self):
+        """
+        :return: number (as int) of this sentence in its word store
+        """
+        return self.sentence_number
 
     def get_raw_dep_tree(self):
         """
-        :return: raw dependency tree as list of lists (i.e. list of edges of the dependency tree)
+        :return: raw dependency tree as list of lists (i.e. list of edges of the dependency tree with positions instead
+        of word ids)
         """
         return self.raw_dep_tree
 
@@ -136,11 +208,10 @@ class SentenceObject:
 
     def get_id_to_word_mapping(self):
         """
-        intended whenever a word_id (usually received from a dependency analysis or dependency tree) needs to be
-        converted to the actual word in the sentence
-        :return: dict with {w_id: word} for every word_id, word in self.word_ids, self.words
+        :return: dict with {w_id: word} for every original word_id, word in get_w_ids, get_words (created on every call
+        for output, use id_to_word for words of dependency trees and analyses)
         """
-        ids_and_words = zip(self.w_ids, self.words)
+        ids_and_words = zip(self.get_w_ids(), self.get_words())
         id_to_word_mapping = dict()
         for word_id, word in ids_and_words:
             id_to_word_mapping[word_id] = word
@@ -148,9 +219,10 @@ class SentenceObject:
 
     def create_id_to_lemma_mapping(self):
         """
-        :return: dict with {w_id: lemma} for every word_id, lemma in self.word_ids, self.lemma_list
+        :return: dict with {w_id: lemma} for every original word_id, lemma in get_w_ids, get_lemma_list (created on
+        every call for output, use get_lemma_list for lemmata by position)
         """
-        ids_and_lemmas = zip(self.w_ids, self.lemma_list)
+        ids_and_lemmas = zip(self.get_w_ids(), self.get_lemma_list())
         id_to_lemma_mapping = dict()
         for w_id, lemma in ids_and_lemmas:
             id_to_lemma_mapping[w_id] = lemma
@@ -158,15 +230,16 @@ class SentenceObject:
 
     def id_to_word(self, word_id):
         """
-        :param word_id: word_id for which to return word in self.sentence
+        intended whenever a word_id (usually received from a dependency analysis or dependency tree) needs to be
+        converted to the actual word in the sentence
+        :param word_id: word_id (i.e. position of the word) for which to return word in self.sentence
         :type word_id: Integer
         :return: word (as string) with given word_id in self.sentence, returns None if word_id is not in self.sentence
         """
-        try:
-            return self.id_to_word_mapping[word_id]
-        except KeyError as err:
-            logger.debug("Key not found: " + str(err))
-            return None
+        word = self.word_store.get_word(self.sentence_number, word_id)
+        if word is None:
+            logger.debug("Key not found: " + str(word_id))
+        return word
 
     def get_full_sentence_analysis_list(self):
         """
@@ -182,18 +255,13 @@ class SentenceObject:
         """
         raises ConnectorError
         :return: a list() of objects of class DependencyAnalysis (or subclass) that are primary analyses (i.e. analyses that use the
-        verb used for lookup in the database), or empty list() if no such analyses were found, or exception
+        verb used for lookup in the database), or empty list() if no such analyses were found, or exception; the list
+        is kept by the connector of this sentence and must not be altered
         """
         try:
-            analysis_ist = self.get_full_sentence_analysis_list()
-        except ConnectorError as conerr:
-            raise conerr
-        else:
-            primary_analysis_list = list()
-            for analysis in analysis_ist:
-                if analysis.is_primary_analysis():
-                    primary_analysis_list.append(analysis)
-            return primary_analysis_list
+            return self.sentence_analysis_connector.get_primary_analysis_list()
+        except ConnectorError:
+            return list()
 
     def get_main_sentence_dependency_analysis(self):
         """
@@ -207,113 +275,114 @@ class SentenceObject:
             raise conerr
 
     @staticmethod
-    def get_w_id_to_word_mapping_as_mapping_on_sid(sentences):
+    def get_instantiation_error_code(s_id, raw_w_ids, dep_tree, lemma_list):
         """
-        :param sentences: objects of class SentenceObject
-        :type sentences: List
-        :return: a dict() with sentence ids as keys and dict() as values, new dict() uses word id as key and word as
-        value
-        """
-        new_mapping = dict()
-        for sentence in sentences:
-            new_mapping[sentence.get_sentence_id()] = sentence.get_id_to_word_mapping().copy()
-        return new_mapping
-
-    @staticmethod
-    def get_w_id_to_lemma_mapping_as_mapping_on_sid(sentences):
+        checks raw data of a sentence for incorrect or empty entries without raising an exception (used by __init__ and
+        for validation of many sentences before their creation)
+        :param s_id, raw_w_ids, dep_tree, lemma_list: raw data from database, see __init__
+        :return: error code (as int, see IncorrectInstantiationError) of the first incorrect entry found or None if a
+        sentence can be created from the given data
         """
-        :param sentences: objects of class SentenceObject
-        :type sentences: List
-        :return: a dict() with sentence ids as keys and dict() as values, new dict() uses word id as key and word lemma
-        as value
-        """
-        new_mapping = dict()
-        for sentence in sentences:
-            new_mapping[sentence.get_sentence_id()] = sentence.create_id_to_lemma_mapping().copy()
-        return new_mapping
-
-    @staticmethod
-    def get_only_sentences_w_main_primary_analysis(sentences):
-        """
-        catches ConnectorErrors to get only those sentence analyses that have a valid connector (i.e. analysis)
-        :param sentences: objects of class SentenceObject
-        :type sentences: List
-        :return: list() of objects of class SentenceObject whose main sentence analysis is a primary analysis (i.e. main
-        sentence contains word that was looked up in the database)
-        """
-        new_sentences = list()
-        for sentence in sentences:
-            try:
-                main_sentence_analysis = sentence.get_main_sentence_dependency_analysis()
-            except ConnectorError:
-                continue
-            else:
-                if main_sentence_analysis.is_primary_analysis():
-                    new_sentences.append(sentence)
-        return new_sentences
+        if s_id.__class__() != 0:
+            return 0
+        elif s_id <= 0:
+            return 1
+        elif (raw_w_ids is None) | (len(raw_w_ids) == 0) | (raw_w_ids.__class__() != []):
+            return 2
+        elif (dep_tree is None) | (len(dep_tree) == 0) | (dep_tree.__class__() != []):
+            return 3
+        else:
+            for edge in dep_tree:
+                if (edge[0] is None) | (edge[1] is None) | (edge[2] is None):
+                    return 4
+                elif (not edge[0].__class__() == 0) | (not edge[1].__class__() == 0) | (not edge[2].isalpha()):
+                    return 4
+                elif (edge[0] <= 0) | (edge[1] <= 0) | (len(edge[2]) == 0):
+                    return 4
+        for lemma in lemma_list:
+            if lemma.__class__ is not str:
+                return 6
+        for w_id in raw_w_ids:
+            if w_id.__class__ is not int:
+                return 7
+        known_w_ids = set(raw_w_ids)
+        if len(known_w_ids) != len(raw_w_ids):
+            return 7
+        for edge in dep_tree:
+            if (edge[0] not in known_w_ids) | (edge[1] not in known_w_ids):
+                return 7
+        return None
 
     @staticmethod
-    def get_mapping_sid_to_main_sentence_analysis(sentences):
-        """
-        catches ConnectorErrors to map only those sentence analyses that have a valid connector (i.e. analysis)
-        :param sentences: objects of class SentenceObject
-        :type sentences: List
-        :return: dict() with sentence ids of given sentences (with valid analysis) as keys and list() with main
-        dependency analysis as only element (i.e. analysis of main sentence) as value
-        """
-        new_mapping = dict()
-        for sentence in sentences:
-            try:
-                new_analysis = sentence.get_main_sentence_dependency_analysis()
-            except ConnectorError:
-                continue
-            else:
-                new_mapping[sentence.get_sentence_id()] = [new_analysis]
-        return new_mapping
+    def remap_edges_to_positions(raw_w_ids, dep_tree):
+        """
+        :raises IncorrectInstantiationError if the word ids are not unique or an edge has a vertex that is no word id
+        :param raw_w_ids: word ids of a sentence from database
+        :type raw_w_ids: List
+        :param dep_tree: edges of the dependency tree of this sentence (with word ids as vertices)
+        :type dep_tree: List
+        :return: list() of edges [position1, position2, label] with the position of each word id in raw_w_ids instead of
+        the word id (in order of dep_tree)
+        """
+        w_id_to_position = dict((w_id, position) for position, w_id in enumerate(raw_w_ids))
+        if len(w_id_to_position) != len(raw_w_ids):
+            raise IncorrectInstantiationError(7)
+        position_edges = list()
+        for edge in dep_tree:
+            head = w_id_to_position.get(edge[0])
+            dependent = w_id_to_position.get(edge[1])
+            if (head is None) | (dependent is None):
+                raise IncorrectInstantiationError(7)
+            position_edges.append([head, dependent, edge[2]])
+        return position_edges
 
     @staticmethod
-    def get_only_sentences_w_primary_analysis(sentences):
+    def get_common_word_store(sentences):
         """
-        catches ConnectorErrors to get only those sentence analyses that have a valid connector (i.e. analysis)
         :param sentences: objects of class SentenceObject
         :type sentences: List
-        :return: list() of those sentences from given sentences that have at least one primary analysis or empty list if
-        none were found
+        :return: the word store of the given sentences if all of them share the same store, otherwise a new object of
+        class WordStore with the word ids, words and lemmata of all given sentences
         """
-        sentence_list = list()
+        word_stores = dict((id(sentence.get_word_store()), sentence.get_word_store()) for sentence in sentences)
+        if len(word_stores) == 1:
+            return list(word_stores.values())[0]
+        new_word_store = WordStore()
         for sentence in sentences:
-            try:
-                primary_analyses = sentence.get_all_primary_analysis()
-            except ConnectorError:
-                continue
-            else:
-                if len(primary_analyses) > 0:
-                    sentence_list.append(sentence)
-        return sentence_list
+            new_word_store.add_sentence(sentence.get_sentence_id(), sentence.get_w_ids(), sentence.get_words(),
+                                        sentence.get_lemma_list())
+        return new_word_store
 
     @staticmethod
-    def get_mapping_sen_id_to_primary_analysis_list(sentences):
+    def partition_sentences_by_primary_analyses(sentences, verb=None):
         """
-        catches ConnectorErrors to map only those sentence analyses that have a valid connector (i.e. analysis),
-        intended for use with list of sentences that each have at least one primary analysis
+        maps the sentences with primary analyses to their main primary analysis and to all their primary analyses in a
+        single pass over the given sentences, the analyses of each sentence are fetched once; sentences without valid
+        connector (i.e. analysis) are skipped
         :param sentences: objects of class SentenceObject
         :type sentences: List
-        :return: dict() with sentence ids as key and list of analyses that are primary analyses for this sentence id as
-        values or empty dict() if no sentences were given
-        """
-        new_analysis_mapping = dict()
+        :param verb: if given, the primary analyses of each sentence are marked for this verb first (see
+        mark_primary_analyses)
+        :type verb: String or None
+        :return: list with dict() with the sentence id of each sentence whose main analysis is a primary analysis as key
+        and list() with this main analysis as only element as value at position [0] and dict() with the sentence id of
+        each sentence with at least one primary analysis as key and list() of its primary analyses as value at position
+        [1] (both in order of the given sentences, analyses are not copied)
+        """
+        sen_id_to_main_primary_analysis = dict()
+        sen_id_to_primary_analyses = dict()
         for sentence in sentences:
-            try:
-                primary_analyses = sentence.get_all_primary_analysis()
-            except ConnectorError:
+            if verb is not None:
+                sentence.mark_primary_analyses(verb)
+            primary_analyses = sentence.get_all_primary_analysis()
+            if len(primary_analyses) == 0:
                 continue
-            else:
-                new_analysis_list = list()
-                for analysis in primary_analyses:
-                    new_analysis = analysis.simple_deep_copy_analysis()
-                    new_analysis_list.append(new_analysis)
-                new_analysis_mapping[sentence.get_sentence_id()] = new_analysis_list
-        return new_analysis_mapping
+            sen_id = sentence.get_sentence_id()
+            sen_id_to_primary_analyses[sen_id] = primary_analyses
+            main_analysis = sentence.get_main_sentence_dependency_analysis()
+            if primary_analyses[0] is main_analysis:
+                sen_id_to_main_primary_analysis[sen_id] = [main_analysis]
+        return [sen_id_to_main_primary_analysis, sen_id_to_primary_analyses]
 
     @staticmethod
     def get_sentences_with_valid_analysis(sentences):
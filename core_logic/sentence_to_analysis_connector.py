@@ -4,6 +4,8 @@ from core_logic.dependency_tree import DependencyTree as DepTr
 from core_logic.dependency_analysis import DependencyAnalysis as DepAn
 from core_logic.dependency_analysis import DependencyAnalysisSubTypeI as DasSubOne
 from core_logic.dependency_analysis import DependencyAnalysisSubTypeII as DasSbTwo
+from core_logic.label_schema import LabelSchema
+from core_logic.node import Node, WorkingTreeRootNode
 
 import logging
 
@@ -14,9 +16,10 @@ class SentenceAnalysisConnector:
     """
     For more straight forward access to object of class DependencyAnalysis (which has sub analyses that were created
     recursively due to sentence structure), also called on by class SentenceObject for basic access to dependency
-    analysis
+    analysis; the flattened list of all analyses and the list of primary analyses are created once and kept until the
+    tree is analyzed again (or until the primary analyses are marked again, see mark_primary_analyses)
     """
-    def __init__(self, words, raw_dep_tree):
+    def __init__(self, words, raw_dep_tree, validated=False):
         """
         tries to created dependency tree, if tree could not be created (due to IncorrectTreeError), dependency analysis
         is None
@@ -24,9 +27,14 @@ class SentenceAnalysisConnector:
         :type words: List
         :param raw_dep_tree: edges for dependency tree
         :type raw_dep_tree: List
+        :param validated: if True, the edges were already validated and are not checked again (see
+        DependencyTree.initialize_dependency_tree)
+        :type validated: Bool
         """
+        self.full_analysis_list = None
+        self.primary_analysis_list = None
         try:
-            self.complete_dependency_tree = DepTr.initialize_dependency_tree(words, raw_dep_tree)
+            self.complete_dependency_tree = DepTr.initialize_dependency_tree(words, raw_dep_tree, validated)
         except IncorrectTreeError as ite:
             logger.debug("Fehler bei der Baumerstellung: {error}".format(error=ite))
             self.complete_dependency_tree = None
@@ -37,21 +45,33 @@ class SentenceAnalysisConnector:
             self.valid_analysis = True
 
     def __str__(self):
+        return self.get_output_string()
+
+    def get_output_string(self, position_to_w_id=None):
+        """
+        :param position_to_w_id: function that returns the original word id for the position of a word in the sentence
+        (see SentenceObject.position_to_w_id), if None, the positions are used as word ids
+        :type position_to_w_id: function or None
+        :return: string with valence holder, lemma and complements of each analysis of this connector
+        """
+        if position_to_w_id is None:
+            position_to_w_id = lambda position: position
         string = ""
         new_string = ""
         if self.valid_analysis:
             complete_analysis_list = self.get_full_analysis_list()
             main_analysis = complete_analysis_list[0]
             for complement in main_analysis.get_complements():
-                string += str(complement)
+                string += complement.get_output_string(position_to_w_id)
             new_string = "Hauptsatzanalyse\nValenzträger: {vh} - lemma: {lm}\n{cmpl}\n".\
-                format(vh=main_analysis.get_valence_holder(), lm=main_analysis.get_valence_holder_lemma(), cmpl=string)
+                format(vh=position_to_w_id(main_analysis.get_valence_holder()),
+                       lm=main_analysis.get_valence_holder_lemma(), cmpl=string)
             for analysis in complete_analysis_list[1:]:
                 string = ""
                 for complement in analysis.get_complements():
-                    string += str(complement)
+                    string += complement.get_output_string(position_to_w_id)
                 new_string += "analysis type: {analysetype}\nValenzträger: {vh} - lemma: {lm}\n{cmpl}\n".\
-                    format(analysetype=str(analysis.__class__), vh=analysis.get_valence_holder(),
+                    format(analysetype=str(analysis.__class__), vh=position_to_w_id(analysis.get_valence_holder()),
                            lm=analysis.get_valence_holder_lemma(), cmpl=string)
         if len(new_string) > 0:
             return new_string
@@ -88,18 +108,30 @@ class SentenceAnalysisConnector:
         """
         :raises ConnectorError if dependency analysis is not valid (i.e. dependency tree could not created correctly)
         :return: list of objects of type DependencyAnalysis (or subclass) that are primary analyses (i.e. analyses of the verb that
-        was used for the lookup in the database)
+        was used for the lookup in the database), the list is kept by this connector and must not be altered
         """
         if self.valid_analysis:
-            full_analysis_list = self.get_full_analysis_list()
-            primary_analysis_list = list()
-            for analysis in full_analysis_list:
-                if analysis.is_primary_analysis():
-                    primary_analysis_list.append(analysis)
-            return primary_analysis_list
+            if self.primary_analysis_list is None:
+                self.primary_analysis_list = list(analysis for analysis in self.get_full_analysis_list()
+                                                  if analysis.is_primary_analysis())
+            return self.primary_analysis_list
         else:
             raise ConnectorError(2)
 
+    def mark_primary_analyses(self, verb):
+        """
+        marks every analysis whose valence holder lemma is the given verb as primary analysis and every other analysis
+        as no primary analysis, the list of primary analyses is created again on the next call of
+        get_primary_analysis_list
+        :param verb: verb used for the valency analysis
+        :type verb: String
+        :return: none, alters primary analysis of all analyses
+        """
+        if self.valid_analysis:
+            for analysis in self.get_full_analysis_list():
+                analysis.set_primary_analysis(analysis.get_valence_holder_lemma() == verb)
+        self.primary_analysis_list = None
+
     def get_analysis_by_connecting_node(self, given_node):
         """
         searches all analyses of self for first analysis with given_node as value of the root of the subtree for this
@@ -125,9 +157,12 @@ class SentenceAnalysisConnector:
         """
         :raises ConnectorError if dependency analysis is not valid (i.e. dependency tree could not created correctly)
         :return: list of objects() of class DependencyAnalysis containing all analyses of this sentence (including all
-        sub sentence analyses)
+        sub sentence analyses), the list is created on the first call after the analysis of the tree, kept by this
+        connector and must not be altered
         """
         if self.valid_analysis:
+            if self.full_analysis_list is not None:
+                return self.full_analysis_list
             analysis_list = list()
             analysis_list.insert(0, self.dependency_analysis)
             queue = self.dependency_analysis.get_class_one_sub_analysis()
@@ -138,186 +173,193 @@ class SentenceAnalysisConnector:
                 new_queue.extend(analysis.get_class_two_sub_analysis())
                 queue.pop(0)
                 queue = new_queue + queue
+            self.full_analysis_list = analysis_list
             return analysis_list
         else:
             raise ConnectorError(2)
 
-    def initial_dependency_analysis(self):
+    def initial_dependency_analysis(self, word_id_to_lemmata=None, target_lemmas=None, main_only=False):
         """
-        used to create object of class DependencyAnalysis out of an object of class DependencyTree via recursion
-        (therefore also creating DependencyAnalysisSupTypeI and DependencyAnalysisSupTypeII), if not
-        successful sets self.valid_analysis to False
+        used to create object of class DependencyAnalysis out of an object of class DependencyTree via a single pass
+        over the tree (see single_pass_dependency_analysis, therefore also creating DependencyAnalysisSupTypeI and
+        DependencyAnalysisSupTypeII), if not successful sets self.valid_analysis to False;
+        if target lemmas are given, the tree is still cut into all sub sentences, but complements are only created for
+        sub sentences whose valence holder lemma (see get_valence_holder_lemma) is a target lemma (see
+        DependencyAnalysis.is_pruned_analysis);
+        if main_only is True, only the main sentence is analyzed: all sub sentences are cut off (so that the complements
+        of the main sentence are the same as for a complete analysis) but not analyzed
+        :param word_id_to_lemmata: lemma of each word of the sentence at its word id (see get_valence_holder_lemma),
+        needed if target_lemmas are given
+        :type word_id_to_lemmata: List or Dictionary or None
+        :param target_lemmas: valence holder lemmas (including cut off verb prefixes) of interest, None for complete
+        analyses of all sub sentences
+        :type target_lemmas: Set or None
+        :param main_only: if True, the analysis of the main sentence has no analyses of sub sentences
+        :type main_only: Bool
         :return: None, upon completion sets self.dependency_analysis to object of class DependencyAnalysis for main
         sentence given by dependency tree
         """
+        self.full_analysis_list = None
+        self.primary_analysis_list = None
         if self.valid_analysis:
-            raw_working_tree = DepTr(DepTr.deep_copy_complete_tree(self.complete_dependency_tree.get_tree_root()))
-            self.dependency_analysis = SentenceAnalysisConnector.recursive_dependency_analysis(raw_working_tree, 0)
+            self.dependency_analysis = SentenceAnalysisConnector.single_pass_dependency_analysis(
+                self.complete_dependency_tree.get_tree_root(), word_id_to_lemmata, target_lemmas, main_only)
             if self.dependency_analysis is None:
                 self.valid_analysis = False
 
     @staticmethod
-    def recursive_dependency_analysis(current_working_tree, analysis_type):
+    def single_pass_dependency_analysis(complete_tree_root, word_id_to_lemmata=None, target_lemmas=None,
+                                        main_only=False):
         """
-        main method to analyze a dependency tree via recursion, creates object of class DependencyAnalysis (or subclass)
-        and appends list of sub analyses of this new analysis with recursively created dependency analyses for these
-        sub sentences,
-        checks for nodes labeled with "aux" and "avz" before using subroutines for creation of analysis of sub sentence,
-        nodes with labels "aux" and "avz" are saved separately und used for analysis creation, working tree is cut and
-        mended when sliced for labels "aux" and "avz"
-        :param current_working_tree: tree that is currently cut/altered/analyzed
-        :type current_working_tree: DependencyTree
-        :param analysis_type: used to distinguish between main sentence DependencyAnalysis (type 0),
-        DependencyAnalysisSubTypeI (type 1) and DependencyAnalysisSubTypeII (type 2), type 0 is only used in
-        function "initial_dependency_analysis"
-        :type analysis_type: Integer
-        :return: newly created dependency analysis with all analyses of subtrees emanating from root of current working
-        tree created recursively
+        creates the dependency analysis of the main sentence and all sub sentences without copying, cutting and mending
+        any working tree: the complete tree is only read, each sub sentence (clause) is segmented by
+        a single walk over its nodes that mends aux and avz nodes on root level, finds the roots of all sub sentences of
+        type I and type II and copies the trees of all complements (with the nodes sub sentences were cut off at as
+        leaves); the analyses are created after segmentation of all sub sentences, sub sentences first; the analyses
+        are the same as those of the former recursive segmentation (see check_segmentation.py)
+        :param complete_tree_root: root of the complete dependency tree (not altered)
+        :type complete_tree_root: Node
+        :param word_id_to_lemmata: see initial_dependency_analysis
+        :type word_id_to_lemmata: List or Dictionary or None
+        :param target_lemmas: see initial_dependency_analysis
+        :type target_lemmas: Set or None
+        :param main_only: see initial_dependency_analysis
+        :type main_only: Bool
+        :return: object of class DependencyAnalysis for the main sentence with all analyses of sub sentences
         """
-        current_working_tree.change_root_class_to_workingtreerootnode()
-        labels = ['aux']
-        aux_nodes = SentenceAnalysisConnector.cut_and_mend_tree_on_root_lvl(current_working_tree, labels)
-        if len(aux_nodes) > 0:
-            verb = aux_nodes[-1]
-            aux_nodes.pop(-1)
-            aux_nodes.insert(0, current_working_tree.get_tree_root())
-        else:
-            verb = current_working_tree.get_tree_root()
-        labels = ['avz']
-        avz_nodes = SentenceAnalysisConnector.cut_and_mend_tree_on_root_lvl(current_working_tree, labels)
-        labels = ['kon']
-        class_i_analysis = SentenceAnalysisConnector.recursive_sub_sentence_type_i_analysis(current_working_tree, labels)
-        labels = ['konj', 'neb', 'objc', 'rel', 's', 'subjc']
-        class_ii_analysis = SentenceAnalysisConnector.recursive_sub_sentence_type_ii_analysis(current_working_tree, labels)
-        new_dependency_analysis = None
-        if analysis_type == 0:
-            new_dependency_analysis = DepAn(current_working_tree.get_tree_root(), verb, avz_nodes, aux_nodes,
-                                            class_i_analysis, class_ii_analysis)
-        elif analysis_type == 1:
-            new_dependency_analysis = DasSubOne(current_working_tree.get_tree_root(), verb, avz_nodes, aux_nodes,
-                                                class_i_analysis, class_ii_analysis)
-        elif analysis_type == 2:
-            new_dependency_analysis = DasSbTwo(current_working_tree.get_tree_root(), verb, avz_nodes, aux_nodes,
-                                               class_i_analysis, class_ii_analysis)
-        return new_dependency_analysis
+        label_schema = LabelSchema.get_active_schema()
+        aux_mask = label_schema.get_group_mask('aux')
+        avz_mask = label_schema.get_group_mask('avz')
+        type_i_mask = label_schema.get_group_mask('sub_sentence_type_i')
+        conjunct_mask = label_schema.get_group_mask('conjunct')
+        type_ii_mask = label_schema.get_group_mask('sub_sentence_type_ii')
+        clauses = list()
+        # each clause: [analysis type, connecting node, tree root, verb, avz nodes, aux nodes, build complements,
+        # clauses of type I, clauses of type II, analysis]
+        stack = [[complete_tree_root, 0, None, False, None]]
+        while len(stack) > 0:
+            clause_root, analysis_type, connecting_node_value, leaf_only, parent_clause_list = stack.pop()
+            children = list()
+            if not leaf_only:
+                children = clause_root.get_children()
+            aux_sources = SentenceAnalysisConnector.mend_clause_children(children, aux_mask)
+            avz_sources = SentenceAnalysisConnector.mend_clause_children(children, avz_mask)
+            tree_root = WorkingTreeRootNode(clause_root.get_node(), clause_root.get_label())
+            aux_nodes = list(Node(source.get_node(), source.get_label()) for source in aux_sources)
+            if len(aux_nodes) > 0:
+                verb = aux_nodes[-1]
+                aux_nodes.pop(-1)
+                aux_nodes.insert(0, tree_root)
+            else:
+                verb = tree_root
+            avz_nodes = list(Node(source.get_node(), source.get_label()) for source in avz_sources)
+            build_complements = True
+            if target_lemmas is not None:
+                valence_holder_lemma = SentenceAnalysisConnector.get_valence_holder_lemma(
+                    verb.get_node(), list(avz_node.get_node() for avz_node in avz_nodes), word_id_to_lemmata)
+                build_complements = valence_holder_lemma in target_lemmas
+            clause = [analysis_type, connecting_node_value, tree_root, verb, avz_nodes, aux_nodes, build_complements,
+                      list(), list(), None]
+            clauses.append(clause)
+            if parent_clause_list is not None:
+                parent_clause_list.append(clause)
+            sub_sentence_roots_i = list()
+            sub_sentence_roots_ii = list()
+            complement_roots = list()
+            walk_stack = list()
+            for child in children:
+                child_copy = Node(child.get_node(), child.get_label())
+                complement_roots.append(child_copy)
+                child_mask = 1 << child.get_label_code()
+                if child_mask & type_i_mask:
+                    sub_sentence_root = child
+                    if (child.get_child_count() == 1) and ((1 << child.get_first_child().get_label_code()) &
+                                                           conjunct_mask):
+                        sub_sentence_root = child.get_first_child()
+                    sub_sentence_roots_i.append([sub_sentence_root, child.get_node()])
+                    if child_mask & type_ii_mask:
+                        sub_sentence_roots_ii.append([child, True])
+                elif child_mask & type_ii_mask:
+                    sub_sentence_roots_ii.append([child, False])
+                else:
+                    walk_stack.append([child, child_copy])
+            walk_stack.reverse()
+            while len(walk_stack) > 0:
+                source, source_copy = walk_stack.pop()
+                child_copies = list()
+                non_matching_children = list()
+                for child in source.iterate_children():
+                    child_copy = Node(child.get_node(), child.get_label())
+                    child_copies.append(child_copy)
+                    if (1 << child.get_label_code()) & type_ii_mask:
+                        sub_sentence_roots_ii.append([child, False])
+                    else:
+                        non_matching_children.append([child, child_copy])
+                source_copy.set_new_children_list(child_copies)
+                non_matching_children.reverse()
+                walk_stack.extend(non_matching_children)
+            tree_root.set_new_children_list(complement_roots)
+            if not main_only:
+                new_stack_entries = list()
+                for sub_sentence_root, kon_node_value in sub_sentence_roots_i:
+                    new_stack_entries.append([sub_sentence_root, 1, kon_node_value, False, clause[7]])
+                for sub_sentence_root, leaf_only_root in sub_sentence_roots_ii:
+                    new_stack_entries.append([sub_sentence_root, 2, None, leaf_only_root, clause[8]])
+                new_stack_entries.reverse()
+                stack.extend(new_stack_entries)
+        for clause in reversed(clauses):
+            analysis_type, connecting_node_value, tree_root, verb, avz_nodes, aux_nodes, build_complements, \
+                class_i_clauses, class_ii_clauses, analysis = clause
+            class_i_analysis = list(sub_clause[9] for sub_clause in class_i_clauses)
+            class_ii_analysis = list(sub_clause[9] for sub_clause in class_ii_clauses)
+            if analysis_type == 0:
+                clause[9] = DepAn(tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis,
+                                  build_complements)
+            elif analysis_type == 1:
+                clause[9] = DasSubOne(tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis,
+                                      build_complements)
+                clause[9].set_connecting_node(connecting_node_value)
+            elif analysis_type == 2:
+                clause[9] = DasSbTwo(tree_root, verb, avz_nodes, aux_nodes, class_i_analysis, class_ii_analysis,
+                                     build_complements)
+        return clauses[0][9]
 
     @staticmethod
-    def recursive_sub_sentence_type_i_analysis(current_working_tree, labels):
+    def mend_clause_children(children, label_mask):
         """
-        subroutine, used during recursive analysis of dependency tree in order to create object of class
-        DependencyAnalysisSubTypeI and append this analysis with all analyses further down the dependency tree, checks
-        if root of current_working_tree is node with label "kon" and has only one child with label "cj", if so, alters
-        current working tree to new tree with root at node with label "cj", sets connecting nodes in
-        DependencyAnalysisSubTypeI accordingly,
-        alters working_tree by cutting without doing any mending
-        :param current_working_tree: tree that is currently cut/altered/analyzed
-        :type current_working_tree: DependencyTree
-        :param labels: strings, intended for use with any string from [kon]
-        :type labels: List
-        :return: list() of objects of class DependencyAnalysisSubTypeI
+        removes all nodes with a label given by label_mask from the given children of the root of a sub sentence and
+        adds their children instead, repeated until no such node is left (without altering any tree)
+        :param children: objects of class Node that are children of the root of a sub sentence (sorted by node value)
+        :type children: List
+        :param label_mask: bitmask of label codes (see LabelSchema.get_label_mask)
+        :type label_mask: Integer
+        :return: list() of all removed nodes (in order of removal), alters children (still sorted by node value)
         """
-        new_kon_trees = SentenceAnalysisConnector.cut_tree_on_root_lvl(current_working_tree, labels)
-        new_class_i_sub_trees = list()
-        connecting_kon_nodes = list()
-        for tree in new_kon_trees:
-            new_dependency_tree = DepTr(tree)
-            connecting_kon_nodes.append(new_dependency_tree.get_tree_root().get_node())
-            labels = ['cj']
-            if len(new_dependency_tree.get_tree_root().get_children()) == 1:
-                if new_dependency_tree.get_tree_root().get_children()[0].get_label() in labels:
-                    new_root = SentenceAnalysisConnector.cut_tree_on_root_lvl(new_dependency_tree, labels)
-                    new_dependency_tree = DepTr(new_root[0])
-            new_class_i_sub_trees.append(new_dependency_tree)
-        class_i_analysis_list = list()
-        for class_i_sub_tree, connecting_kon_node in zip(new_class_i_sub_trees, connecting_kon_nodes):
-            new_analysis = SentenceAnalysisConnector.recursive_dependency_analysis(class_i_sub_tree, 1)
-            new_analysis.set_connecting_node(connecting_kon_node)
-            class_i_analysis_list.append(new_analysis)
-        return class_i_analysis_list
+        removed_nodes = list()
+        nodes_with_label = list(child for child in children if (1 << child.get_label_code()) & label_mask)
+        while len(nodes_with_label) > 0:
+            for node in nodes_with_label:
+                children.remove(node)
+                children.extend(node.iterate_children())
+            children.sort(key=lambda x: x.get_node())
+            removed_nodes.extend(nodes_with_label)
+            nodes_with_label = list(child for child in children if (1 << child.get_label_code()) & label_mask)
+        return removed_nodes
 
     @staticmethod
-    def recursive_sub_sentence_type_ii_analysis(current_working_tree, labels):
-        """
-        subroutine, used during recursive analysis of dependency tree in order to create object of class
-        DependencyAnalysisSubTypeII and append this analysis with all analyses further down the dependency tree
-        alters working_tree by cutting without doing any mending
-        :param current_working_tree: tree that is currently cut/altered/analyzed
-        :type current_working_tree: DependencyTree
-        :param labels: strings, intended for use with any string from ['konj', 'neb', 'objc', 'rel', 's', 'subjc']
-        :type labels: List
-        :return: list() of objects of class DependencyAnalysisSubTypeII
+    def get_valence_holder_lemma(valence_holder, avz_words, word_id_to_lemmata):
         """
-        new_class_ii_sub_trees = list()
-        new_sub_sentence_trees = SentenceAnalysisConnector.cut_tree_by_labels(current_working_tree, labels)
-        for tree in new_sub_sentence_trees:
-            new_dependency_tree = DepTr(tree)
-            new_class_ii_sub_trees.append(new_dependency_tree)
-        class_ii_analysis = list()
-        for class_ii_sub_tree in new_class_ii_sub_trees:
-            new_analysis = SentenceAnalysisConnector.recursive_dependency_analysis(class_ii_sub_tree, 2)
-            class_ii_analysis.append(new_analysis)
-        return class_ii_analysis
-
-    @staticmethod
-    def cut_tree_by_labels(working_tree, labels):
+        :param valence_holder: word id of valence holder of a sub sentence
+        :type valence_holder: Integer
+        :param avz_words: word ids of cut off verb prefixes of the sub sentence (in order of cutting)
+        :type avz_words: List
+        :param word_id_to_lemmata: lemma of each word of the sentence at its word id (i.e. position, see class
+        SentenceObject), a dict() with word ids as keys can be used as well
+        :type word_id_to_lemmata: List or Dictionary
+        :return: lemma (string) of valence holder, prefixed by the lemmas of all cut off verb prefixes (e.g. "an" +
+        "kämpfen")
         """
-        makes cuts (at first occurrence of any label given by labels) in the complete tree, intended use: with labels
-        "neb", "rel", ... (possibly simultaneously) as these are indicators of certain kinds of sub sentences,
-        used to access object of class DependencyTree,
-        alters working tree
-        :param working_tree: tree that is currently cut/altered/analyzed
-        :type working_tree: DependencyTree
-        :param labels: strings to search for
-        :type labels: List
-        :return: list of objects of class Node cut out of the tree (with all their children attached)
-        """
-        sub_trees = working_tree.slice_tree_by_label(labels)
-        return sub_trees
-
-    @staticmethod
-    def cut_tree_on_root_lvl(working_tree, labels):
-        """
-        make cut (with no mending or further altering of initial working tee) at any children of root of
-        tree with label given by labels, intended use: with labels "kon" and "cj" (not simultaneously) as these are
-        indicators of certain kinds of sub sentences,
-        used to access object of class DependencyTree,
-        alters working tree
-        :param working_tree: tree that is currently cut/altered/analyzed
-        :type working_tree: DependencyTree
-        :param labels: strings to search for
-        :type labels: List
-        :return: list() of objects of class Node cut out of the tree (with all their children attached)
-        """
-        sub_trees = working_tree.slice_tree_on_first_lvl(labels)
-        return sub_trees
-
-    @staticmethod
-    def cut_and_mend_tree_on_root_lvl(working_tree, labels):
-        """
-        intended use: recursively slice tree on first lvl at 'avz' and 'aux' nodes, delete node with given label from
-        working tree and add all its children to root of working tree, continue until no 'avz' and 'aux' nodes found on
-        first lvl and return all nodes that were cut off this way as list() of objects of class nodes, each with no
-        children;
-        used to access object of class DependencyTree;
-        alters working_tree
-        :param working_tree: tree that is currently cut/altered/analyzed
-        :type working_tree: DependencyTree
-        :param labels: strings to search for
-        :type labels: List
-        :return: list() of nodes cut out of the tree by given labels, each node has no children
-        """
-        sub_trees_with_label = working_tree.slice_tree_on_first_lvl(labels)
-        nodes_with_label = list()
-        while len(sub_trees_with_label) > 0:
-            for sub_tree_root in sub_trees_with_label:
-                working_tree.delete_node_from_root_by_value(sub_tree_root.get_node())
-                new_children = list()
-                for child in sub_tree_root.get_children():
-                    new_children.append(child)
-                working_tree.append_tree_root_by_children_list(new_children)
-                sub_tree_root.delete_all_children()
-            new_nodes_with_label = sub_trees_with_label.copy()
-            nodes_with_label.extend(new_nodes_with_label)
-            sub_trees_with_label = working_tree.slice_tree_on_first_lvl(labels)
-        return nodes_with_label
-
+        new_lemma = str(word_id_to_lemmata[valence_holder])
+        for word in avz_words:
+            new_lemma = str(word_id_to_lemmata[word]) + new_lemma
+        return new_lemma
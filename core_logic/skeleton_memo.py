@@ -0,0 +1,146 @@
+from core_logic.analysis_cache import AnalysisCache
+from core_logic.dependency_tree import DependencyTree as DepTr
+from core_logic.label_schema import LabelSchema
+from core_logic.sentence_to_analysis_connector import SentenceAnalysisConnector as SenAnCon
+
+from collections import OrderedDict
+
+import logging
+
+logger = logging.getLogger('VRRCL')
+
+
+class SkeletonMemo:
+    """
+    In-memory LRU memo of dependency analyses by label skeleton of a dependency tree: the creation of a dependency
+    analysis only depends on the edges of the tree (the order of the word ids, not their values, and the labels) and on
+    the number of tokens that need an edge; the skeleton of a tree replaces every word id by its rank among all word ids
+    of the tree, sentences with the same skeleton thus have the same analysis (up to the word ids), which is stored once
+    with ranks instead of word ids (see AnalysisCache.serialize_connector) and restored for every sentence with this
+    skeleton without creating, cutting, mending or copying any tree;
+    used by class SentenceObject if set as active memo (see set_active_memo)
+    """
+
+    active_memo = None
+
+    def __init__(self, max_entries):
+        """
+        :param max_entries: maximum number of skeletons in this memo, the least recently used skeleton is removed if
+        this number is exceeded
+        :type max_entries: Integer
+        """
+        self.max_entries = max_entries
+        self.skeleton_to_analysis = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_connector(self, words, raw_dep_tree, validated=False):
+        """
+        :raises IncorrectTreeError if dependency analysis could not be created correctly
+        :param words: words (as strings) for given sentence
+        :type words: List
+        :param raw_dep_tree: edges for dependency tree
+        :type raw_dep_tree: List
+        :param validated: if True, the edges were already validated (see class SentenceAnalysisConnector)
+        :type validated: Bool
+        :return: analysed connector for given sentence, object of class CachedAnalysisConnector restored from this memo
+        if the skeleton of the tree was analysed before, a new object of class SentenceAnalysisConnector otherwise
+        """
+        w_id_to_rank = SkeletonMemo.get_w_id_to_rank_mapping(raw_dep_tree)
+        skeleton = SkeletonMemo.get_skeleton(words, raw_dep_tree, w_id_to_rank)
+        skeleton_analysis = self.skeleton_to_analysis.get(skeleton)
+        if skeleton_analysis is not None:
+            self.hits += 1
+            self.skeleton_to_analysis.move_to_end(skeleton)
+            rank_to_w_id = dict((rank, w_id) for w_id, rank in w_id_to_rank.items())
+            return AnalysisCache.restore_connector(SkeletonMemo.map_word_ids(skeleton_analysis, rank_to_w_id))
+        self.misses += 1
+        new_connector = SenAnCon(words, raw_dep_tree, validated)
+        new_connector.initial_dependency_analysis()
+        skeleton_analysis = AnalysisCache.serialize_connector(new_connector)
+        self.skeleton_to_analysis[skeleton] = SkeletonMemo.map_word_ids(skeleton_analysis, w_id_to_rank)
+        if len(self.skeleton_to_analysis) > self.max_entries:
+            self.skeleton_to_analysis.popitem(last=False)
+        return new_connector
+
+    def log_statistics(self):
+        """
+        logs the number of hits and misses of this memo
+        :return: no return value
+        """
+        logger.info("Skeleton memo: {hts} hits - {mss} misses - {qty} skeletons".format(
+            hts=self.hits, mss=self.misses, qty=len(self.skeleton_to_analysis)))
+
+    @staticmethod
+    def get_w_id_to_rank_mapping(raw_dep_tree):
+        """
+        :param raw_dep_tree: edges for dependency tree
+        :type raw_dep_tree: List
+        :return: dict() with every word id of the edges as key and its rank (starting with 1) among all word ids of the
+        edges as value
+        """
+        w_ids = set()
+        for edge in raw_dep_tree:
+            w_ids.add(edge[0])
+            w_ids.add(edge[1])
+        return dict((w_id, rank) for rank, w_id in enumerate(sorted(w_ids), 1))
+
+    @staticmethod
+    def get_skeleton(words, raw_dep_tree, w_id_to_rank):
+        """
+        :param words: words (as strings) for given sentence
+        :type words: List
+        :param raw_dep_tree: edges for dependency tree
+        :type raw_dep_tree: List
+        :param w_id_to_rank: see get_w_id_to_rank_mapping
+        :type w_id_to_rank: Dictionary
+        :return: tuple() that is canonical (hashable) skeleton of the given tree: fingerprint of the active label
+        schema, number of tokens that need an edge and each edge (in order of raw_dep_tree) with ranks instead of word
+        ids
+        """
+        return (LabelSchema.get_active_schema().get_fingerprint(),
+                len(words) - DepTr.get_token_edge_difference(words),
+                tuple((w_id_to_rank[edge[0]], w_id_to_rank[edge[1]], edge[2]) for edge in raw_dep_tree))
+
+    @staticmethod
+    def map_word_ids(entry_data, w_id_mapping):
+        """
+        :param entry_data: serialized connector (see AnalysisCache.serialize_connector) before the lemmas of the
+        sentence were set (i.e. cut off verb prefixes are word ids)
+        :type entry_data: List
+        :param w_id_mapping: dict() with every word id of entry_data as key and new word id as value
+        :type w_id_mapping: Dictionary
+        :return: copy of entry_data with every word id replaced via w_id_mapping
+        """
+        valid_analysis, full_list_length, analysis_data = entry_data
+        new_analysis_data = list()
+        for analysis_type, valence_holder, valence_holder_lemma, avz_words, aux_words, connecting_node_value, \
+                class_i_positions, class_ii_positions, complement_data in analysis_data:
+            if connecting_node_value is not None:
+                connecting_node_value = w_id_mapping[connecting_node_value]
+            new_complement_data = list()
+            for comp_class, node_data in complement_data:
+                new_complement_data.append([comp_class, list([w_id_mapping[w_id], label, parent_position]
+                                                             for w_id, label, parent_position in node_data)])
+            new_analysis_data.append([analysis_type, w_id_mapping[valence_holder], valence_holder_lemma,
+                                      list(w_id_mapping[w_id] for w_id in avz_words),
+                                      list(w_id_mapping[w_id] for w_id in aux_words), connecting_node_value,
+                                      class_i_positions, class_ii_positions, new_complement_data])
+        return [valid_analysis, full_list_length, new_analysis_data]
+
+    @staticmethod
+    def get_active_memo():
+        """
+        :return: object of class SkeletonMemo currently used for analysis of dependency trees or None
+        """
+        return SkeletonMemo.active_memo
+
+    @staticmethod
+    def set_active_memo(memo):
+        """
+        :param memo: object of class SkeletonMemo to be used for all following analyses of dependency trees, None if
+        no memo should be used
+        :type memo: SkeletonMemo or None
+        :return: no return value
+        """
+        SkeletonMemo.active_memo = memo
@@ -1,10 +1,14 @@
 from core_logic.sentence_object import SentenceObject as SenObj
 from core_logic.complement import Complement as Cmp
+from core_logic.partial_valency_frame import PartialValencyFrame
 from core_logic.valency_frame import ValencyFrame as VaFr
+from core_logic.valency_index import IndexedAnalysis, HEAD_LEMMA_CLASSES
+from core_logic.dependency_tree import DependencyTree as DepTr
 from core_logic.dependency_tree import IncorrectTreeError
 from core_logic.sentence_object import IncorrectInstantiationError
 from core_logic.various_errors import KMeanError
 from core_logic.various_errors import ValencyAnalysisError
+from core_logic.word_store import WordStore
 
 import logging
 
@@ -15,15 +19,17 @@ class ValencyAnalysis:
     """
     Main class used to analyze dependency trees for verb valencies, creates list of sentences with given data, tries to
     analyze correctly instantiated sentences, resulting dependency analyses are used for evaluation via k-means.
-    Note: Functions to correct/specify Kadv/Kprp alter the dependency analyses used to create the valency frame (by
-    changing the complement class of some of these analyses), while functions to delete objects from the valency frame
+    Note: Functions to correct/specify Kadv/Kprp alter the complement classes held by the valency frame for the
+    dependency analyses used to create the frame (the dependency analyses themselves are never altered), while functions to delete objects from the valency frame
     are only executed on the dictionary used to indicate the current valency frame. Therefore, correction/specification
     of Kadv/Kprp can only be reversed by using function initialize_valency_frame() while deletion of rare signatures,
     deletion of multiple complements or deletion of certain complements from the frame can be undone by using
     function reset_valency_frame()
     """
 
-    def __init__(self, raw_data, verb):
+    def __init__(self, raw_data, verb, sentences=None, valency_index=None, lemma_index=None, analysis_cache=None,
+                 prune_analyses=False, main_only=False, lean=False, deduplicator=None, sentence_weights=None,
+                 partial_frame=None):
         """
         creates sentence for each data-set in raw_data and creates dependency analysis for each sentence
         :param raw_data: data from database as list [[sentence_id1, word_ids1, words1, tree_data1, sentence1, lemma1],
@@ -34,8 +40,130 @@ class ValencyAnalysis:
         :param verb: verb that was used for lookup in database, needed to distinguish between analysis of searched
         verb and others
         :type verb: String
+        :param sentences: objects of class SentenceObject with a dependency analysis that are used instead of creating
+        sentences from raw_data (e.g. sentences analyzed once by class MultiVerbValencyAnalysis for several verbs), the
+        primary analyses of these sentences are marked for the given verb whenever the valency frame is initialized
+        :type sentences: List or None
+        :param valency_index: an opened index (see class ValencyIndex) used instead of raw_data, the valency frame is
+        created from the records of the given verb in this index
+        :type valency_index: ValencyIndex or None
+        :param lemma_index: inverted index of the lemmata of raw_data (see class LemmaIndex), if given, only the
+        sentences of raw_data that can contain the verb are created and analyzed
+        :type lemma_index: LemmaIndex or None
+        :param analysis_cache: cache of analyses of sentences (see class AnalysisCache), sentences found in the cache are
+        not analyzed again, all other sentences are analyzed and stored in the cache
+        :type analysis_cache: AnalysisCache or None
+        :param prune_analyses: if True, complements are only created for sub sentences of the given verb (see
+        SentenceAnalysisConnector.initial_dependency_analysis), all other analyses have no complements
+        :type prune_analyses: Bool
+        :param main_only: if True, only the main sentence of each sentence is analyzed (sub sentences are cut off but not
+        analyzed), the valency frame can then only be initialized with main_prime=True
+        :type main_only: Bool
+        :param lean: if True, no sentences are kept: each sentence of raw_data is dropped right after its analysis and
+        only its primary analyses are kept as compact objects of class IndexedAnalysis (see create_lean_analyses), the
+        valency frame is then created from these analyses (ignored if sentences, valency_index or partial_frame are
+        given)
+        :type lean: Bool
+        :param deduplicator: if given, duplicates in raw_data are removed before any sentence is created (see class
+        SentenceDeduplicator), their number is kept as weight of each sentence for policy "weight"
+        :type deduplicator: SentenceDeduplicator or None
+        :param sentence_weights: dict() with sentence ids as keys and weight of each sentence (e.g. number of sentences
+        a pre-aggregated sentence stands for) as value, used for all frequencies of the valency frame (see class
+        ValencyFrame), the weights of a deduplicator with policy "weight" are multiplied with these weights
+        :type sentence_weights: Dictionary or None
+        :param partial_frame: (merged) statistics of the valency frame of the verb (see class PartialValencyFrame) used
+        instead of raw_data, the valency frame is created from these statistics (the selection of analyses is given by
+        the partial frame, see initialize_valency_frame)
+        :type partial_frame: PartialValencyFrame or None
         """
-        self.sentences = list()
+        self.verb = verb
+        self.main_only = main_only
+        target_lemmas = None
+        if prune_analyses:
+            target_lemmas = {verb}
+        self.shared_sentences = sentences is not None
+        self.valency_index = valency_index
+        self.partial_frame = partial_frame
+        self.lean = lean and (not self.shared_sentences) and (self.valency_index is None) and \
+            (self.partial_frame is None)
+        self.lean_analyses = None
+        self.lean_word_store = None
+        self.lean_sentence_count = 0
+        self.sen_id_to_main_primary_analysis = None
+        self.sen_id_to_primary_analyses = None
+        self.error_counts = dict()
+        self.deduplicator = None
+        self.main_prime = None
+        self.total_sentence_count = 0
+        if (lemma_index is not None) and (not self.shared_sentences) and (self.valency_index is None):
+            raw_data = lemma_index.get_candidate_raw_data(verb)
+            logger.info("\nLemma index: {cndqty} of {qty} sentences can contain {vrb}".format(
+                cndqty=len(raw_data), qty=lemma_index.get_sentence_count(), vrb=verb))
+        if (deduplicator is not None) and (not self.shared_sentences) and (self.valency_index is None):
+            self.deduplicator = deduplicator
+            raw_data = deduplicator.deduplicate(raw_data)
+        self.sentence_weights = dict()
+        if sentence_weights is not None:
+            self.sentence_weights.update(sentence_weights)
+        if self.partial_frame is not None:
+            self.sentence_weights.update(self.partial_frame.get_sentence_weights())
+        if self.deduplicator is not None:
+            for sen_id, weight in self.deduplicator.get_sentence_weights().items():
+                self.sentence_weights[sen_id] = self.sentence_weights.get(sen_id, 1) * weight
+        if self.shared_sentences:
+            self.sentences = sentences
+        elif (self.valency_index is not None) or (self.partial_frame is not None) or self.lean:
+            self.sentences = list()
+        else:
+            self.sentences = ValencyAnalysis.create_analyzed_sentences(raw_data, verb, analysis_cache, target_lemmas,
+                                                                       main_only, self.error_counts)
+        self.sentences_w_valid_analysis = SenObj.get_sentences_with_valid_analysis(self.sentences)
+        if not self.shared_sentences:
+            self.sen_id_to_main_primary_analysis, self.sen_id_to_primary_analyses = \
+                SenObj.partition_sentences_by_primary_analyses(self.sentences_w_valid_analysis)
+        quantity = str(len(self.sentences))
+        valid_quantity = str(len(self.sentences_w_valid_analysis))
+        if self.lean:
+            self.lean_analyses, self.lean_word_store, self.lean_sentence_count, valid_count = \
+                ValencyAnalysis.create_lean_analyses(raw_data, verb, analysis_cache, target_lemmas, main_only,
+                                                     self.error_counts)
+            quantity = str(self.lean_sentence_count)
+            valid_quantity = str(valid_count)
+        if self.valency_index is not None:
+            logger.info("\nValency index: {anqty} analyses of {vrb} stored (no sentences created)".format(
+                anqty=self.valency_index.get_analysis_count(verb), vrb=verb))
+        elif self.partial_frame is None:
+            logger.info("\nData extraction complete: {qty} Sentences created - {vldqty} Analyses created".
+                        format(qty=quantity, vldqty=valid_quantity))
+        ValencyAnalysis.log_error_report(self.error_counts)
+        self.valency_frame = None
+
+    @staticmethod
+    def create_analyzed_sentences(raw_data, verb, analysis_cache=None, target_lemmas=None, main_only=False,
+                                  error_counts=None):
+        """
+        creates sentence for each data-set in raw_data and creates dependency analysis for each sentence; each data-set
+        is validated once (see get_raw_sentence_error), invalid data-sets are skipped without creating a sentence and
+        counted by error in error_counts (each one is only logged on debug level, see log_error_report for the
+        aggregated counts), the sentences of valid data-sets are created and analyzed without checking them again
+        :param raw_data: data from database, see __init__
+        :type raw_data: List
+        :param verb: verb used to mark primary analyses, if None no analysis is marked as primary analysis
+        :type verb: String or None
+        :param analysis_cache: cache of analyses of sentences used to restore or store the analysis of each sentence
+        :type analysis_cache: AnalysisCache or None
+        :param target_lemmas: valence holder lemmas whose sub sentences are analyzed completely, None for all
+        :type target_lemmas: Set or None
+        :param main_only: if True, only the main sentence of each sentence is analyzed
+        :type main_only: Bool
+        :param error_counts: dict() with [error class, error code] (as tuple) of every error found as key and number of
+        data-sets with this error as value, altered by this function
+        :type error_counts: Dictionary or None
+        :return: list() of objects of class SentenceObject, all sentences share a single word store (see class
+        WordStore)
+        """
+        word_store = WordStore()
+        sentences = list()
         for raw_sentence_data in raw_data:
             sentence_id = raw_sentence_data[0]
             word_ids = raw_sentence_data[1]
@@ -43,24 +171,129 @@ class ValencyAnalysis:
             tree_data = raw_sentence_data[3]
             sentence = raw_sentence_data[4]
             lemmata = raw_sentence_data[5]
-            try:
-                new_sentence = SenObj(sentence_id, sentence, word_ids, words, tree_data, lemmata)
-                self.sentences.append(new_sentence)
-                w_id_to_lemmata = dict()
-                for word_id, lemma in zip(word_ids, lemmata):
-                    w_id_to_lemmata[word_id] = lemma
-                new_sentence.analyze_dependence_tree(w_id_to_lemmata, verb)
-                logger.debug(new_sentence)
-            except IncorrectTreeError as error1:
-                logger.warning("TreeError in: {sid} - {err}".format(sid=str(raw_sentence_data[0]), err=error1))
-            except IncorrectInstantiationError as error2:
-                logger.warning("InstantiationError in: {sid} - {err}".format(sid=str(raw_sentence_data[0]), err=error2))
-        quantity = str(len(self.sentences))
-        self.sentences_w_valid_analysis = SenObj.get_sentences_with_valid_analysis(self.sentences)
-        valid_quantity = str(len(self.sentences_w_valid_analysis))
-        logger.info("\nData extraction complete: {qty} Sentences created - {vldqty} Analyses created".
-              format(qty=quantity, vldqty=valid_quantity))
-        self.valency_frame = None
+            raw_sentence_error = ValencyAnalysis.get_raw_sentence_error(raw_sentence_data)
+            if raw_sentence_error is not None:
+                ValencyAnalysis.count_error(error_counts, sentence_id, raw_sentence_error[0], raw_sentence_error[1])
+                continue
+            new_sentence = SenObj(sentence_id, sentence, word_ids, words, tree_data, lemmata, word_store, validated=True)
+            sentences.append(new_sentence)
+            new_sentence.analyze_dependence_tree(lemmata, verb, analysis_cache, target_lemmas, main_only)
+            logger.debug(new_sentence)
+        return sentences
+
+    @staticmethod
+    def get_raw_sentence_error(raw_sentence_data):
+        """
+        validates a data-set without raising an exception: the checks of class SentenceObject and of the dependency tree
+        (see DependencyTree.check_tree_validity) are done before any sentence or tree is created
+        :param raw_sentence_data: a single data-set of raw data, see __init__
+        :type raw_sentence_data: List
+        :return: list with error class (IncorrectInstantiationError or IncorrectTreeError) at position [0] and error
+        code (as int) at position [1] for the first error found or None if the data-set is valid
+        """
+        error_code = SenObj.get_instantiation_error_code(raw_sentence_data[0], raw_sentence_data[1],
+                                                         raw_sentence_data[3], raw_sentence_data[5])
+        if error_code is not None:
+            return [IncorrectInstantiationError, error_code]
+        error_code = DepTr.get_tree_error_code(raw_sentence_data[2], raw_sentence_data[3])
+        if error_code is not None:
+            return [IncorrectTreeError, error_code]
+        return None
+
+    @staticmethod
+    def count_error(error_counts, sentence_id, error_class, error_code):
+        """
+        :param error_counts: see create_analyzed_sentences
+        :type error_counts: Dictionary or None
+        :param sentence_id: id of the data-set with the error
+        :type sentence_id: Integer
+        :param error_class: IncorrectInstantiationError or IncorrectTreeError
+        :type error_class: Class
+        :param error_code: code of the error
+        :type error_code: Integer
+        :return: no return value, alters error_counts
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("{errcls} in: {sid} - {err}".format(errcls=error_class.__name__, sid=str(sentence_id),
+                                                             err=error_class(error_code)))
+        if error_counts is not None:
+            error_key = (error_class, error_code)
+            error_counts[error_key] = error_counts.get(error_key, 0) + 1
+
+    @staticmethod
+    def log_error_report(error_counts):
+        """
+        logs the number of data-sets skipped for each error, nothing is logged if no errors were found;
+        skipped data-sets are not counted as sentences, i.e. they are neither included in "Sentences created" nor in
+        the number of total sentences of the valency frame (invalid data-sets are validated before any sentence is
+        created, before that, data-sets with incorrect dependency trees were still counted in both numbers)
+        :param error_counts: see create_analyzed_sentences
+        :type error_counts: Dictionary
+        :return: no return value
+        """
+        if len(error_counts) == 0:
+            return
+        report = "\nInvalid data-sets skipped (not counted as sentences): {qty}".format(qty=sum(error_counts.values()))
+        for error_key in sorted(error_counts.keys(), key=lambda key: (key[0].__name__, key[1])):
+            report += "\n{errcls} {code} ({err}): {qty}".format(errcls=error_key[0].__name__, code=error_key[1],
+                                                                err=error_key[0](error_key[1]),
+                                                                qty=error_counts[error_key])
+        logger.info(report)
+
+    @staticmethod
+    def create_lean_analyses(raw_data, verb, analysis_cache=None, target_lemmas=None, main_only=False,
+                             error_counts=None):
+        """
+        memory-bounded alternative to create_analyzed_sentences: each sentence is created and analyzed as usual, but only
+        its primary analyses are kept as compact objects of class IndexedAnalysis (complement classes, word ids and
+        labels of the roots of the complements) and only the lemmas of the roots of Kadv and Kprp are kept in a word
+        store (as for a ValencyIndex), the sentence itself (raw data, words, dependency tree and all analyses with their
+        trees and nodes) is dropped right after its analysis
+        :param raw_data: data from database, see __init__
+        :type raw_data: List
+        :param verb: verb used to mark primary analyses
+        :type verb: String
+        :param analysis_cache: see create_analyzed_sentences
+        :type analysis_cache: AnalysisCache or None
+        :param target_lemmas: see create_analyzed_sentences
+        :type target_lemmas: Set or None
+        :param main_only: see create_analyzed_sentences
+        :type main_only: Bool
+        :param error_counts: see create_analyzed_sentences
+        :type error_counts: Dictionary or None
+        :return: list with list() of objects of class IndexedAnalysis (in order of raw_data) at position [0], object of
+        class WordStore with the lemmas of the roots of Kadv and Kprp (no words and no original word ids) of each
+        sentence with a primary analysis at position [1], number of created sentences (as int) at position [2] and
+        number of sentences with valid analysis (as int) at position [3]
+        """
+        lean_analyses = list()
+        word_store = WordStore()
+        sentence_count = 0
+        valid_count = 0
+        for raw_sentence_data in raw_data:
+            new_sentences = ValencyAnalysis.create_analyzed_sentences([raw_sentence_data], verb, analysis_cache,
+                                                                      target_lemmas, main_only, error_counts)
+            sentence_count += len(new_sentences)
+            for new_sentence in SenObj.get_sentences_with_valid_analysis(new_sentences):
+                valid_count += 1
+                sen_id = new_sentence.get_sentence_id()
+                lemmas = new_sentence.get_lemma_list()
+                head_lemmas = list()
+                has_primary_analysis = False
+                for analysis_number, analysis in enumerate(new_sentence.get_full_sentence_analysis_list()):
+                    if not analysis.is_primary_analysis():
+                        continue
+                    has_primary_analysis = True
+                    lean_analyses.append(IndexedAnalysis.create_from_analysis(sen_id, analysis, analysis_number == 0))
+                    for complement in analysis.get_complements():
+                        root_w_id = complement.get_root_w_id()
+                        if complement.get_complement_class() in HEAD_LEMMA_CLASSES:
+                            if root_w_id >= len(head_lemmas):
+                                head_lemmas.extend([None] * (root_w_id + 1 - len(head_lemmas)))
+                            head_lemmas[root_w_id] = lemmas[root_w_id]
+                if has_primary_analysis:
+                    word_store.add_sentence(sen_id, None, None, head_lemmas)
+        return [lean_analyses, word_store, sentence_count, valid_count]
 
     def __str__(self):
         return "\n{vlncyfrm}".format(vlncyfrm=str(self.valency_frame))
@@ -91,26 +324,57 @@ class ValencyAnalysis:
     def initialize_valency_frame(self, main_prime=True):
         """
         used for creation of a valency frame
+        :raises ValencyAnalysisError if main_prime is False but only main sentences were analyzed (see __init__)
         :param main_prime: if True, only the analyses of sentences are used, where the main sentence (i.e. the sub tree
         of the dependency tree that contains the root of the complete tree) contains the verb used for the fetching
         sentences from the database, if False all analyses of sub sentences that contain the verb used for the lookup
-        are used
-        """
-        if main_prime:
-            main_prime_sentences = SenObj.get_only_sentences_w_main_primary_analysis(self.sentences_w_valid_analysis)
-            analysis_mapping_for_frame = SenObj.get_mapping_sid_to_main_sentence_analysis(main_prime_sentences)
-            w_id_to_word_mapping_for_frame = SenObj.get_w_id_to_word_mapping_as_mapping_on_sid(main_prime_sentences)
-            w_id_to_lemma_mapping_for_frame = SenObj.get_w_id_to_lemma_mapping_as_mapping_on_sid(main_prime_sentences)
-            len_used_sentences = len(main_prime_sentences)
+        are used;
+        if this valency analysis uses an index (see class ValencyIndex), only the records of the verb are read from the
+        index, the valency frame then only has the lemmas of the roots of Kadv and Kprp (and no words), the same holds
+        for a lean valency analysis (see __init__);
+        if this valency analysis uses a partial frame, the valency frame is created from its statistics and main_prime
+        is given by the partial frame
+        """
+        if self.partial_frame is not None:
+            main_prime = self.partial_frame.is_main_prime()
+        if self.main_only and (not main_prime):
+            raise ValencyAnalysisError(8)
+        total_quantity = len(self.sentences)
+        if self.shared_sentences:
+            self.sen_id_to_main_primary_analysis, self.sen_id_to_primary_analyses = \
+                SenObj.partition_sentences_by_primary_analyses(self.sentences_w_valid_analysis, self.verb)
+        if self.partial_frame is not None:
+            analysis_mapping_for_frame, word_store = dict(), None
+            total_quantity = self.partial_frame.get_total_sentence_count()
+            len_used_sentences = self.partial_frame.get_used_sentence_count()
+        elif (self.valency_index is not None) or self.lean:
+            if self.lean:
+                indexed_analyses, word_store = self.lean_analyses, self.lean_word_store
+                total_quantity = self.lean_sentence_count
+            else:
+                indexed_analyses, word_store = self.valency_index.get_indexed_analyses(self.verb)
+                total_quantity = word_store.get_sentence_count()
+            analysis_mapping_for_frame = dict()
+            for indexed_analysis in indexed_analyses:
+                if main_prime and not indexed_analysis.is_main_analysis():
+                    continue
+                sen_id = indexed_analysis.get_sentence_id()
+                if sen_id not in analysis_mapping_for_frame:
+                    analysis_mapping_for_frame[sen_id] = list()
+                analysis_mapping_for_frame[sen_id].append(indexed_analysis)
+            len_used_sentences = len(analysis_mapping_for_frame)
         else:
-            all_prime_sentences = SenObj.get_only_sentences_w_primary_analysis(self.sentences_w_valid_analysis)
-            analysis_mapping_for_frame = SenObj.get_mapping_sen_id_to_primary_analysis_list(all_prime_sentences)
-            w_id_to_word_mapping_for_frame = SenObj.get_w_id_to_word_mapping_as_mapping_on_sid(all_prime_sentences)
-            w_id_to_lemma_mapping_for_frame = SenObj.get_w_id_to_lemma_mapping_as_mapping_on_sid(all_prime_sentences)
-            len_used_sentences = len(all_prime_sentences)
-        self.valency_frame = VaFr(analysis_mapping_for_frame, w_id_to_word_mapping_for_frame, w_id_to_lemma_mapping_for_frame)
+            if main_prime:
+                analysis_mapping_for_frame = self.sen_id_to_main_primary_analysis
+            else:
+                analysis_mapping_for_frame = self.sen_id_to_primary_analyses
+            word_store = SenObj.get_common_word_store(self.sentences_w_valid_analysis)
+            len_used_sentences = len(analysis_mapping_for_frame)
+        self.valency_frame = VaFr(analysis_mapping_for_frame, word_store, self.sentence_weights, self.partial_frame)
+        self.main_prime = main_prime
+        self.total_sentence_count = total_quantity
         logger.info("\nValency Frame initialized\nnumber of total sentences: {ttlqnty} | number of used "
-                                 "sentences: {usdqnty}\n".format(ttlqnty=len(self.sentences),
+                                 "sentences: {usdqnty}\n".format(ttlqnty=total_quantity,
                                                                    usdqnty=str(len_used_sentences)))
         logger.info("~~~~~~~~~~~~~~complete Valency Frame without postprocessing~~~~~~~~~~~\n{vlncyfrm}".format(
             vlncyfrm=str(self.valency_frame)))
@@ -288,7 +552,8 @@ class ValencyAnalysis:
             max_cluster = -1
         cmp_class = [5]
         preposition_to_sen_id_dict = self.valency_frame.create_interesting_object_to_sen_id_mapping_for_k_means(cmp_class)
-        list_for_k_means = VaFr.create_k_mean_list_via_dict(preposition_to_sen_id_dict)
+        list_for_k_means = VaFr.create_k_mean_list_via_dict(preposition_to_sen_id_dict,
+                                                            self.valency_frame.get_sentence_weights())
         try:
             k_mean_result = VaFr.execute_k_means(list_for_k_means, cluster_quantity, max_tries, random_reset)
             self.valency_frame.set_k_mean_result_count(k_mean_result[1])
@@ -304,17 +569,19 @@ class ValencyAnalysis:
             for k_mean_result_key in k_mean_result_keys:
                 for classified_object in k_mean_result.get_centroid_to_mapped_objects()[k_mean_result_key]:
                     preposition_list.append(classified_object.get_object_key())
-            sen_id_to_analyses_mapping = self.valency_frame.get_sen_id_to_analyses_mapping()
-            for sen_id in sen_id_to_analyses_mapping.keys():
-                for analysis in sen_id_to_analyses_mapping[sen_id]:
-                    potential_complements_to_change = analysis.get_complement_by_class(cmp_class)
-                    for complement in potential_complements_to_change:
-                        new_preposition = self.valency_frame.get_word_by_w_id_s_id(complement.get_root_w_id(), sen_id)
-                        if new_preposition[0].isupper():
-                            new_preposition = new_preposition[0].lower() + new_preposition[1:]
-                        if new_preposition in preposition_list:
-                            complement.set_complement_class(4)
-                    analysis.sort_complements()
+            analyses_to_check = self.valency_frame.get_analyses_by_complement_class(cmp_class)
+            for sen_id, analysis_index, analysis in analyses_to_check:
+                potential_complements_to_change = analysis.get_complement_positions_by_class(cmp_class)
+                for position in potential_complements_to_change:
+                    new_preposition = self.valency_frame.get_word_by_w_id_s_id(analysis.get_root_w_id(position), sen_id)
+                    if new_preposition[0].isupper():
+                        new_preposition = new_preposition[0].lower() + new_preposition[1:]
+                    if new_preposition in preposition_list:
+                        analysis.set_complement_class(position, 4)
+                        self.valency_frame.mark_analysis_as_changed(sen_id, analysis_index)
+            for signature, position, head in self.valency_frame.get_signature_heads_by_complement_class(cmp_class):
+                if head in preposition_list:
+                    self.valency_frame.set_signature_complement_class(signature, position, 4)
             self.valency_frame.update_current_dep_class_pattern_mapping()
 
     def specify_complements_by_preposition(self, complement_list):
@@ -330,24 +597,42 @@ class ValencyAnalysis:
         :type complement_list list of integers
         :return: no return value, alters valency frame
         """
-        sen_id_to_analyses_mapping = self.valency_frame.get_sen_id_to_analyses_mapping()
-        for sen_id in sen_id_to_analyses_mapping.keys():
-            for analysis in sen_id_to_analyses_mapping[sen_id]:
-                potential_complements_to_change = analysis.get_complement_by_class(complement_list)
-                for complement in potential_complements_to_change:
-                    new_preposition = self.valency_frame.get_word_by_w_id_s_id(complement.get_root_w_id(), sen_id)
-                    if len(new_preposition) > 0:
-                        if new_preposition[0].isupper():
-                            new_preposition = new_preposition[0].lower() + new_preposition[1:]
-                    complement_coding_dict = Cmp.comp_class_coding()
-                    for preposition_coding in complement_coding_dict.keys():
-                        if new_preposition == complement_coding_dict[preposition_coding]:
-                            new_comp_class = preposition_coding + complement.get_complement_class()
-                            complement.set_complement_class(new_comp_class)
-                            break
-                analysis.sort_complements()
+        analyses_to_check = self.valency_frame.get_analyses_by_complement_class(complement_list)
+        for sen_id, analysis_index, analysis in analyses_to_check:
+            potential_complements_to_change = analysis.get_complement_positions_by_class(complement_list)
+            for position in potential_complements_to_change:
+                new_preposition = self.valency_frame.get_word_by_w_id_s_id(analysis.get_root_w_id(position), sen_id)
+                if len(new_preposition) > 0:
+                    if new_preposition[0].isupper():
+                        new_preposition = new_preposition[0].lower() + new_preposition[1:]
+                preposition_coding = Cmp.get_preposition_coding(new_preposition)
+                if preposition_coding is not None:
+                    new_comp_class = preposition_coding + analysis.get_complement_class(position)
+                    analysis.set_complement_class(position, new_comp_class)
+                    self.valency_frame.mark_analysis_as_changed(sen_id, analysis_index)
+        for signature, position, head in self.valency_frame.get_signature_heads_by_complement_class(complement_list):
+            preposition_coding = Cmp.get_preposition_coding(head)
+            if preposition_coding is not None:
+                new_comp_class = preposition_coding + self.valency_frame.get_signature_complement_class(signature,
+                                                                                                        position)
+                self.valency_frame.set_signature_complement_class(signature, position, new_comp_class)
         self.valency_frame.update_current_dep_class_pattern_mapping()
 
+    def create_partial_frame(self):
+        """
+        used to create mergeable statistics of the valency frame (e.g. of a part of a corpus, see class
+        PartialValencyFrame), the valency frame is used as initialized (i.e. any postprocessing is ignored)
+        :raises ValencyAnalysisError if no valency frame is found
+        :raises ValencyFrameError if the lemma of the root of a Kprp or Kadv is not found
+        :return: object of class PartialValencyFrame (the partial frame of this valency analysis if it uses one)
+        """
+        if self.valency_frame is None:
+            raise ValencyAnalysisError(1)
+        if self.partial_frame is not None:
+            return self.partial_frame
+        return PartialValencyFrame.create_from_valency_frame(self.valency_frame, self.verb, self.main_prime,
+                                                             self.total_sentence_count)
+
     def reset_valency_frame(self):
         """
         resets valency frame by rewriting valency frame to the complement class signatures currently found in all
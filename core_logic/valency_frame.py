@@ -1,3 +1,4 @@
+from core_logic.analysis_overlay import AnalysisOverlay
 from core_logic.complement import Complement
 from core_logic.k_means_helper import KMeansHelper as KmH
 from core_logic.various_errors import ValencyFrameError
@@ -6,27 +7,55 @@ from core_logic.various_errors import KMeanError
 
 class ValencyFrame:
     """
-    Object used to analyze large quantity of sentences regarding their dependency trees and complements of each sentence
+    Object used to analyze large quantity of sentences regarding their dependency trees and complements of each sentence;
+    each sentence can have a weight (e.g. number of duplicates of a deduplicated corpus, see class SentenceDeduplicator,
+    or number of sentences a pre-aggregated sentence stands for), all frequencies of this frame (counts of signatures
+    and inputs for k-means) are sums of the weights of the sentences instead of numbers of sentences;
+    a valency frame can also be created from the merged statistics of several parts of a corpus (see class
+    PartialValencyFrame) instead of analyses, the complement classes are then held for each annotated signature instead
+    of each analysis
     """
-    def __init__(self, sentence_id_to_analyses_mapping, sen_id_to_wo_id_word_mapping, sen_id_to_w_id_lemma_mapping):
+    def __init__(self, sentence_id_to_analyses_mapping, word_store, sentence_weights=None, partial_frame=None):
         """
-        initializes working dictionaries for analysis
+        initializes working dictionaries for analysis, each given analysis is wrapped in an object of class
+        AnalysisOverlay so that complement classes can be altered without altering the given analyses
         :param sentence_id_to_analyses_mapping: dict() with sentence ids as keys and list of analysis (i.e. list of
         objects of class DependencyAnalysis or subclass) as values
         :type sentence_id_to_analyses_mapping: dictionary
-        :param sen_id_to_wo_id_word_mapping: sentence ids as keys and a dict() for each id as value, new dict() has
-        word ids as keys and words as values
-        :type sen_id_to_wo_id_word_mapping: Dictionary
+        :param word_store: words and lemmata of (at least) all sentences of sentence_id_to_analyses_mapping, looked up
+        by sentence id and word id
+        :type word_store: WordStore
+        :param sentence_weights: dict() with sentence ids as keys and weight (integer >= 1) of each sentence as value,
+        sentences that are not in this dict have weight 1
+        :type sentence_weights: dictionary or None
+        :param partial_frame: if given, this valency frame is created from the statistics of this partial frame
+        (sentence_id_to_analyses_mapping and word_store are not used then, see create_dep_class_pattern_to_sen_id_dict)
+        :type partial_frame: PartialValencyFrame or None
         """
-        self.sen_id_to_full_analyses = sentence_id_to_analyses_mapping
-        self.sen_id_to_wid_to_word_mapping = sen_id_to_wo_id_word_mapping
-        self.sen_id_to_wid_to_lemma_mapping = sen_id_to_w_id_lemma_mapping
+        self.sen_id_to_full_analyses = dict()
+        for sen_id in sentence_id_to_analyses_mapping.keys():
+            overlay_list = list()
+            for analysis in sentence_id_to_analyses_mapping[sen_id]:
+                overlay_list.append(AnalysisOverlay(analysis))
+            self.sen_id_to_full_analyses[sen_id] = overlay_list
+        self.word_store = word_store
+        if sentence_weights is None:
+            sentence_weights = dict()
+        self.sentence_weights = sentence_weights
+        self.partial_frame = partial_frame
+        self.signature_to_complement_classes = dict()
+        self.pattern_to_analysis_keys = dict()
+        self.pattern_to_sen_id_lists = dict()
+        self.analysis_key_to_pattern = dict()
+        self.analysis_key_to_position = dict()
+        self.comp_class_to_analysis_keys = dict()
+        self.changed_analysis_keys = dict()
         self.current_dep_class_pattern_to_sen_id = self.create_dep_class_pattern_to_sen_id_dict()
         self.k_mean_result = None
         self.k_mean_result_count = 0
 
     def __str__(self):
-        if len(self.sen_id_to_full_analyses.keys()) > 0:
+        if (len(self.sen_id_to_full_analyses.keys()) > 0) or (len(self.signature_to_complement_classes) > 0):
             new_string = "Valency Analysis:\n"
             new_string += "Count of each class pattern:\n"
             key_list = list(x for x in self.current_dep_class_pattern_to_sen_id.keys())
@@ -40,7 +69,8 @@ class ValencyFrame:
                 new_new_string = new_new_string[:-2]
                 new_string += "Class pattern: {complement_classes} - Count: {quantity}\n{senid}\n" \
                     .format(complement_classes=string,
-                            quantity=len(self.current_dep_class_pattern_to_sen_id[coded_classes]), senid=new_new_string)
+                            quantity=self.get_weighted_sentence_count(
+                                self.current_dep_class_pattern_to_sen_id[coded_classes]), senid=new_new_string)
         else:
             new_string = "No valency frame for analysis found\n"
         return new_string
@@ -54,31 +84,185 @@ class ValencyFrame:
 
     def create_dep_class_pattern_to_sen_id_dict(self):
         """
-        creates a dictionary using all analyses in complete analysis list of self
+        creates a dictionary using all analyses in complete analysis list of self, (re-)initializes the index of
+        complement class patterns used for incremental updates of the valency frame (see
+        update_current_dep_class_pattern_mapping), each analysis is identified in this index by a key (sentence id,
+        position of the analysis in the list of analyses for this sentence id)
         :return: dictionary with all complement class patterns (i.e. signatures) in complete analysis list as keys (i.e.
         each key is a tuple of integers indicating a specific complement class pattern) and sentence ids where this
-        pattern occurs as values for each key
+        pattern occurs as values for each key (the dictionary of the index itself, i.e. it is altered by each update of
+        the index, see update_current_dep_class_pattern_mapping);
+        for a valency frame created from a partial frame, the complement classes of each annotated signature are
+        (re-)initialized instead
         """
-        dep_class_pattern_to_sen_id = dict()
+        if self.partial_frame is not None:
+            self.signature_to_complement_classes = dict()
+            for signature in self.partial_frame.get_signature_to_sen_ids().keys():
+                self.signature_to_complement_classes[signature] = list(comp_class for comp_class, head in signature)
+            return self.create_dep_class_pattern_to_sen_id_dict_from_signatures()
+        self.pattern_to_analysis_keys = dict()
+        self.pattern_to_sen_id_lists = dict()
+        self.analysis_key_to_pattern = dict()
+        self.analysis_key_to_position = dict()
+        self.comp_class_to_analysis_keys = dict()
+        self.changed_analysis_keys = dict()
         for each_key in self.sen_id_to_full_analyses.keys():
             analyses_list = self.sen_id_to_full_analyses[each_key]
-            for analysis in analyses_list:
-                new_pattern = analysis.get_complement_class_pattern()
-                if new_pattern not in dep_class_pattern_to_sen_id.keys():
-                    new_sen_id_list = list()
-                    new_sen_id_list.append(each_key)
-                    dep_class_pattern_to_sen_id[new_pattern] = new_sen_id_list
-                else:
-                    new_sen_id_list = dep_class_pattern_to_sen_id[new_pattern]
-                    new_sen_id_list.append(each_key)
-                    dep_class_pattern_to_sen_id[new_pattern] = new_sen_id_list
+            for analysis_index, analysis in enumerate(analyses_list):
+                self.add_analysis_to_pattern_index((each_key, analysis_index), analysis.get_complement_class_pattern())
+        return self.pattern_to_sen_id_lists
+
+    def create_dep_class_pattern_to_sen_id_dict_from_signatures(self):
+        """
+        only for a valency frame created from a partial frame
+        :return: dictionary with all complement class patterns of the current complement classes of all annotated
+        signatures as keys and sentence id of each analysis with this pattern as values for each key
+        """
+        dep_class_pattern_to_sen_id = dict()
+        signature_to_sen_ids = self.partial_frame.get_signature_to_sen_ids()
+        for signature, complement_classes in self.signature_to_complement_classes.items():
+            pattern = tuple(sorted(complement_classes))
+            if pattern not in dep_class_pattern_to_sen_id:
+                dep_class_pattern_to_sen_id[pattern] = list()
+            dep_class_pattern_to_sen_id[pattern].extend(signature_to_sen_ids[signature])
         return dep_class_pattern_to_sen_id
 
+    def get_signature_heads_by_complement_class(self, cmp_class):
+        """
+        counterpart of get_analyses_by_complement_class for a valency frame created from a partial frame
+        :param cmp_class: coding of complement classes
+        :type cmp_class: list
+        :return: list of lists, each with an annotated signature at position [0], the position of a complement with
+        current complement class given by cmp_class in this signature at position [1] and the lemma of the root of
+        this complement at position [2] (only complements with known lemma of the root, i.e. Kprp and Kadv, see class
+        PartialValencyFrame), an empty list for a valency frame created from analyses
+        """
+        head_list = list()
+        for signature, complement_classes in self.signature_to_complement_classes.items():
+            for position, comp_class in enumerate(complement_classes):
+                head = signature[position][1]
+                if (comp_class in cmp_class) and (head is not None):
+                    head_list.append([signature, position, head])
+        return head_list
+
+    def get_signature_complement_class(self, signature, position):
+        """
+        :param signature: an annotated signature of the partial frame of this valency frame
+        :type signature: tuple
+        :param position: position of a complement in this signature
+        :type position: Integer
+        :return: current complement class (as int) of this complement
+        """
+        return self.signature_to_complement_classes[signature][position]
+
+    def set_signature_complement_class(self, signature, position, new_class):
+        """
+        counterpart of AnalysisOverlay.set_complement_class for a valency frame created from a partial frame, the
+        altered complement class is used by the next update of the valency frame (see
+        update_current_dep_class_pattern_mapping)
+        :raises ValueError if given complement class is not a valid complement class
+        :param signature: an annotated signature of the partial frame of this valency frame
+        :type signature: tuple
+        :param position: position of a complement in this signature
+        :type position: Integer
+        :param new_class: new complement class
+        :type new_class: Integer
+        :return: no return value
+        """
+        if not Complement.is_valid_comp_class(new_class):
+            raise ValueError
+        self.signature_to_complement_classes[signature][position] = new_class
+
+    def add_analysis_to_pattern_index(self, analysis_key, pattern):
+        """
+        adds a single analysis to the index of complement class patterns (its sentence id is appended to the list of
+        sentence ids of the pattern, a new pattern is added after all other patterns) and to the index of complement
+        classes
+        :param analysis_key: (sentence id, position of analysis in list of analyses for this sentence id)
+        :type analysis_key: tuple of integers
+        :param pattern: current complement class pattern of the analysis
+        :type pattern: tuple of integers
+        :return: no return value
+        """
+        self.analysis_key_to_pattern[analysis_key] = pattern
+        if pattern not in self.pattern_to_analysis_keys:
+            self.pattern_to_analysis_keys[pattern] = list()
+            self.pattern_to_sen_id_lists[pattern] = list()
+        self.analysis_key_to_position[analysis_key] = len(self.pattern_to_analysis_keys[pattern])
+        self.pattern_to_analysis_keys[pattern].append(analysis_key)
+        self.pattern_to_sen_id_lists[pattern].append(analysis_key[0])
+        for comp_class in pattern:
+            if comp_class not in self.comp_class_to_analysis_keys:
+                self.comp_class_to_analysis_keys[comp_class] = dict()
+            self.comp_class_to_analysis_keys[comp_class][analysis_key] = None
+
+    def remove_analysis_from_pattern_index(self, analysis_key):
+        """
+        removes a single analysis (with the complement class pattern it was last indexed with) from the index of
+        complement class patterns and from the index of complement classes, the last analysis of the pattern takes the
+        position of the removed analysis in the list of sentence ids of the pattern (thus no other entries are moved), a
+        pattern without analyses is removed
+        :param analysis_key: (sentence id, position of analysis in list of analyses for this sentence id)
+        :type analysis_key: tuple of integers
+        :return: the complement class pattern the analysis was indexed with
+        """
+        pattern = self.analysis_key_to_pattern.pop(analysis_key)
+        position = self.analysis_key_to_position.pop(analysis_key)
+        analysis_keys = self.pattern_to_analysis_keys[pattern]
+        sen_ids = self.pattern_to_sen_id_lists[pattern]
+        last_analysis_key = analysis_keys.pop()
+        last_sen_id = sen_ids.pop()
+        if position < len(analysis_keys):
+            analysis_keys[position] = last_analysis_key
+            sen_ids[position] = last_sen_id
+            self.analysis_key_to_position[last_analysis_key] = position
+        if len(analysis_keys) == 0:
+            del self.pattern_to_analysis_keys[pattern]
+            del self.pattern_to_sen_id_lists[pattern]
+        for comp_class in pattern:
+            class_keys = self.comp_class_to_analysis_keys.get(comp_class)
+            if class_keys is not None:
+                class_keys.pop(analysis_key, None)
+                if len(class_keys) == 0:
+                    del self.comp_class_to_analysis_keys[comp_class]
+        return pattern
+
+    def mark_analysis_as_changed(self, sen_id, analysis_index):
+        """
+        intended for use whenever the complement classes of an analysis in the valency frame are altered (e.g. during
+        correction of Kadv to Kprp), only analyses marked this way are re-indexed by
+        update_current_dep_class_pattern_mapping
+        :param sen_id: sentence id of the altered analysis
+        :type sen_id: Integer
+        :param analysis_index: position of the altered analysis in the list of analyses for this sentence id
+        :type analysis_index: Integer
+        :return: no return value
+        """
+        self.changed_analysis_keys[(sen_id, analysis_index)] = None
+
+    def get_analyses_by_complement_class(self, cmp_class):
+        """
+        uses the index of complement classes to find all analyses of the valency frame that contain at least one
+        complement of a given class (as of the last update of the valency frame)
+        :param cmp_class: coding of complement classes
+        :type cmp_class: list
+        :return: list of lists, each with a sentence id at position [0], the position of the analysis in the list of
+        analyses for this sentence id at position [1] and the analysis itself at position [2]
+        """
+        analysis_keys = dict()
+        for comp_class in cmp_class:
+            if comp_class in self.comp_class_to_analysis_keys:
+                analysis_keys.update(self.comp_class_to_analysis_keys[comp_class])
+        analysis_list = list()
+        for sen_id, analysis_index in analysis_keys.keys():
+            analysis_list.append([sen_id, analysis_index, self.sen_id_to_full_analyses[sen_id][analysis_index]])
+        return analysis_list
+
     def get_word_by_w_id_s_id(self, w_id, s_id, lemma=True):
         """
-        gets word by word_id and sentence_id (uses dictionary of sentence ids to dictionary of word ids to words)
+        gets word by word_id and sentence_id (uses the word store of this frame)
         :raises ValencyFrameError if sentence id or word id are not found
-        :param w_id: word_id to look for
+        :param w_id: word_id (i.e. position of the word in its sentence, see class SentenceObject) to look for
         :type w_id: Integer
         :param s_id: sen_id to use for lookup of w_id
         :type s_id: Integer
@@ -87,80 +271,106 @@ class ValencyFrame:
         :type lemma: bool
         :return: word (as string)
         """
-        if s_id not in self.sen_id_to_wid_to_word_mapping.keys():
+        if (s_id not in self.sen_id_to_full_analyses) or (self.word_store.get_sentence_number(s_id) is None):
             raise ValencyFrameError(3)
-        else:
-            if lemma:
-                given_mapping = self.sen_id_to_wid_to_lemma_mapping[s_id]
-            else:
-                given_mapping = self.sen_id_to_wid_to_word_mapping[s_id]
-        if w_id not in given_mapping.keys():
+        word = self.word_store.get_word_by_sentence_id(s_id, w_id, lemma)
+        if word is None:
             raise ValencyFrameError(4)
-        else:
-            word = given_mapping[w_id]
-            return word
+        return word
 
     def create_interesting_object_to_sen_id_mapping_for_k_means(self, cmp_class, label=False):
         """
         creates mapping of "abstract objects" (could be strings indicating prepositions or tuples of integers indicating
         complement signatures) to sentence id's for clustering of these "abstract objects" via k-means;
         searches each complement of each analysis given as value in dict() sen_id_to_full_analyses for given complement
-        class, appends word that is head of this complement (i.e. "phrase") to list for k-means;
+        class, appends word that is head of this complement (i.e. "phrase") to list for k-means (for sentences with
+        several analyses, only the complements of the last analysis are used); all sentences are handled in a single
+        pass, the lemma of each head is looked up directly in the word store;
         :param cmp_class: given complement class
         :type cmp_class: Integer
         :param label: if True algorithm works with label of root of each complement found, otherwise uses
         root word (via conversion of word id (int) to word (string)) as key for dictionary that is returned
         (note that in the latter case the word is used and not the lemma and the first character is always lower case)
         :type label: Bool
+        :raises ValencyFrameError for a valency frame created from a partial frame if cmp_class is not [5] or label is
+        True (a partial frame only has the lemmata of the roots of Kadv as initialized)
         :return dictionary with strings as keys and list of integers (i.e. sentence ids) as values for each key
         """
-        sen_id_to_complements = dict()
-        for sen_id in self.sen_id_to_full_analyses.keys():
-            for analysis in self.sen_id_to_full_analyses[sen_id]:
-                new_complement_list = analysis.get_complement_by_class(cmp_class)
-                if new_complement_list is not []:
-                    sen_id_to_complements[sen_id] = new_complement_list
-        sen_id_to_interesting_object_mapping = dict()
-        for k_means_key in sen_id_to_complements.keys():
-            object_list = list()
-            for complement in sen_id_to_complements[k_means_key]:
-                if label:
-                    object_list.append(complement.get_root_label())
-                else:
-                    new_string = self.get_word_by_w_id_s_id(complement.get_root_w_id(), k_means_key)
-                    if len(new_string) == 1:
-                        new_string = new_string[0].lower()
-                    else:
-                        new_string = new_string[0].lower() + new_string[1:]
-                    object_list.append(new_string)
-            sen_id_to_interesting_object_mapping[k_means_key] = object_list
+        if self.partial_frame is not None:
+            if label or (list(cmp_class) != [5]):
+                raise ValencyFrameError(12)
+            return dict((preposition, list(sen_ids))
+                        for preposition, sen_ids in self.partial_frame.get_preposition_to_sen_ids().items())
         word_to_sen_id_mapping = dict()
-        for new_key in sen_id_to_interesting_object_mapping.keys():
-            interesting_words = sen_id_to_interesting_object_mapping[new_key]
+        for sen_id, analyses_list in self.sen_id_to_full_analyses.items():
+            if len(analyses_list) == 0:
+                continue
+            analysis = analyses_list[-1]
+            complement_positions = analysis.get_complement_positions_by_class(cmp_class)
+            if len(complement_positions) == 0:
+                continue
+            if label:
+                interesting_words = list(analysis.get_root_label(position) for position in complement_positions)
+            else:
+                sentence_number = self.word_store.get_sentence_number(sen_id)
+                if sentence_number is None:
+                    raise ValencyFrameError(3)
+                interesting_words = list()
+                for position in complement_positions:
+                    new_string = self.word_store.get_word(sentence_number, analysis.get_root_w_id(position), True)
+                    if new_string is None:
+                        raise ValencyFrameError(4)
+                    if len(new_string) > 0:
+                        new_string = new_string[0].lower() + new_string[1:]
+                    interesting_words.append(new_string)
             for interesting_word in interesting_words:
-                if interesting_word not in word_to_sen_id_mapping.keys():
-                    word_to_sen_id_mapping[interesting_word] = [new_key]
+                sen_id_list = word_to_sen_id_mapping.get(interesting_word)
+                if sen_id_list is None:
+                    word_to_sen_id_mapping[interesting_word] = [sen_id]
                 else:
-                    key_list = list(word_to_sen_id_mapping[interesting_word]).copy()
-                    key_list.append(new_key)
-                    word_to_sen_id_mapping[interesting_word] = key_list
+                    sen_id_list.append(sen_id)
         return word_to_sen_id_mapping
 
+    def get_sentence_weights(self):
+        """
+        :return: dict() with sentence ids as keys and weight of each sentence as value (sentences that are not in this
+        dict have weight 1)
+        """
+        return self.sentence_weights
+
+    def get_weighted_sentence_count(self, sen_ids):
+        """
+        :param sen_ids: sentence ids (e.g. all sentence ids of a signature)
+        :type sen_ids: List
+        :return: sum (as int) of the weights of the given sentences, i.e. number of given sentences if no sentence has a
+        weight
+        """
+        if len(self.sentence_weights) == 0:
+            return len(sen_ids)
+        sentence_weights = self.sentence_weights
+        return sum(sentence_weights.get(sen_id, 1) for sen_id in sen_ids)
+
     @staticmethod
-    def create_k_mean_list_via_dict(given_dict):
+    def create_k_mean_list_via_dict(given_dict, sentence_weights=None):
         """
         intended to create list of given_objects for key-means algorithm, see init of class KMeanHelper for further
         information
         :param given_dict: a dictionary that has strings as keys and a list of integers as value for each keys (intended
         for use with a dictionary returned by function create_interesting_object_to_sen_id_mapping_for_k_means())
         :type given_dict dictionary
+        :param sentence_weights: weight of each sentence id (see get_sentence_weights), each sentence id is counted
+        with its weight if given
+        :type sentence_weights: dictionary or None
         :return: a list where each element is a list with string at position[0] (the keys of the given dictionary) and a
-        single integer at position[1] (the length of the list of values for each key of the given dictionary)
+        single integer at position[1] (the length (or sum of weights) of the list of values for each key of the given
+        dictionary)
         """
         list_for_k_means = list()
         for word in given_dict.keys():
-            list_for_k_means.append([word, len(given_dict[word])])
-        list_for_k_means = list_for_k_means
+            if sentence_weights:
+                list_for_k_means.append([word, sum(sentence_weights.get(sen_id, 1) for sen_id in given_dict[word])])
+            else:
+                list_for_k_means.append([word, len(given_dict[word])])
         return list_for_k_means
 
     @staticmethod
@@ -190,7 +400,7 @@ class ValencyFrame:
     def k_means_for_complement_signature_quantity(self, cluster_quantity, max_tries, random_reset=True):
         """
         used to cluster the current valency frame (as given in current_dep_class_pattern_to_sen_id) by the frequency
-        with which the complement signatures occur in this frame
+        (sum of the weights of the sentences) with which the complement signatures occur in this frame
         :raises KMeanError if result of clustering is inconclusive or an error occurs during instantiation
         :param cluster_quantity: number of proposed clusters
         :type cluster_quantity: integer
@@ -203,7 +413,8 @@ class ValencyFrame:
         """
         list_for_k_means = list()
         for signature in self.current_dep_class_pattern_to_sen_id.keys():
-            list_for_k_means.append([signature, len(self.current_dep_class_pattern_to_sen_id[signature])])
+            list_for_k_means.append([signature, self.get_weighted_sentence_count(
+                self.current_dep_class_pattern_to_sen_id[signature])])
         try:
             k_mean_result = ValencyFrame.execute_k_means(list_for_k_means, cluster_quantity, max_tries, random_reset)
             self.k_mean_result_count = k_mean_result[1]
@@ -237,7 +448,7 @@ class ValencyFrame:
     def get_sen_id_to_analyses_mapping(self):
         """
         :return: dictionary with sentence ids as keys, value for each key is a list of objects of class
-        DependencyAnalysis (or subclass) that belong to the sentence with this id
+        AnalysisOverlay (one for each analysis that belongs to the sentence with this id)
         """
         return self.sen_id_to_full_analyses
 
@@ -255,10 +466,26 @@ class ValencyFrame:
         as keys and list of sentence-id's where this signature occurs in as value for each key) from all analyses in
         complete analysis list of self, note that this resets the valency frame to the last time any complement of any
         analysis was changed (e.g. due to correction of Kadv to Kprp) or to the initial valency frame, if no complements
-        were changed after creation
+        were changed after creation;
+        only analyses marked via mark_analysis_as_changed are re-indexed, i.e. only the entries of these analyses in the
+        signatures they had before and have after the change are updated in place (see
+        remove_analysis_from_pattern_index and add_analysis_to_pattern_index), the index itself is used as current
+        valency frame (no copy);
+        for a valency frame created from a partial frame, the mapping is created from the current complement classes of
+        all annotated signatures
         :return: no return value
         """
-        self.current_dep_class_pattern_to_sen_id = self.create_dep_class_pattern_to_sen_id_dict()
+        if self.partial_frame is not None:
+            self.current_dep_class_pattern_to_sen_id = self.create_dep_class_pattern_to_sen_id_dict_from_signatures()
+            return
+        for analysis_key in self.changed_analysis_keys.keys():
+            sen_id, analysis_index = analysis_key
+            new_pattern = self.sen_id_to_full_analyses[sen_id][analysis_index].get_complement_class_pattern()
+            if new_pattern != self.analysis_key_to_pattern[analysis_key]:
+                self.remove_analysis_from_pattern_index(analysis_key)
+                self.add_analysis_to_pattern_index(analysis_key, new_pattern)
+        self.changed_analysis_keys = dict()
+        self.current_dep_class_pattern_to_sen_id = self.pattern_to_sen_id_lists
 
     def set_current_dep_class_pattern_mapping(self, new_dep_class_pattern_mapping):
         """
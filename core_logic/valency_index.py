@@ -0,0 +1,306 @@
+from core_logic.sentence_object import SentenceObject as SenObj
+from core_logic.various_errors import ValencyIndexError
+from core_logic.word_store import WordStore
+
+import json
+import mmap
+import struct
+
+import logging
+
+logger = logging.getLogger('VRRCL')
+
+INDEX_MAGIC = b"VRRCLIDX"
+INDEX_VERSION = 2
+HEAD_LEMMA_CLASSES = (4, 5)
+
+_HEADER = struct.Struct("<8sIQQ")
+_RECORD = struct.Struct("<qqBH")
+_COMPLEMENT = struct.Struct("<iqii")
+
+
+class IndexedAnalysis:
+    """
+    Compact analysis of a single (sub) sentence as stored in a ValencyIndex, provides the part of the interface of class
+    DependencyAnalysis needed by classes AnalysisOverlay and ValencyFrame
+    """
+
+    __slots__ = ('sentence_id', 'valence_holder', 'valence_holder_lemma', 'main_analysis', 'complement_classes',
+                 'root_w_ids', 'root_labels')
+
+    def __init__(self, sentence_id, valence_holder, valence_holder_lemma, main_analysis, complement_classes,
+                 root_w_ids, root_labels):
+        """
+        :param sentence_id: id of the sentence of this analysis
+        :type sentence_id: Integer
+        :param valence_holder: word id of valence holder
+        :type valence_holder: Integer
+        :param valence_holder_lemma: lemma of valence holder (including cut off verb prefixes)
+        :type valence_holder_lemma: String
+        :param main_analysis: True if this is the analysis of the main sentence, False otherwise
+        :type main_analysis: Bool
+        :param complement_classes: complement class of each complement (sorted, i.e. complement class pattern)
+        :type complement_classes: List
+        :param root_w_ids: word id of the root of each complement
+        :type root_w_ids: List
+        :param root_labels: label of the root of each complement
+        :type root_labels: List
+        """
+        self.sentence_id = sentence_id
+        self.valence_holder = valence_holder
+        self.valence_holder_lemma = valence_holder_lemma
+        self.main_analysis = main_analysis
+        self.complement_classes = complement_classes
+        self.root_w_ids = root_w_ids
+        self.root_labels = root_labels
+
+    def get_sentence_id(self):
+        """
+        :return: id (as int) of the sentence of this analysis
+        """
+        return self.sentence_id
+
+    def get_valence_holder(self):
+        """
+        :return: word id of valence holder of this analysis
+        """
+        return self.valence_holder
+
+    def get_valence_holder_lemma(self):
+        """
+        :return: lemma (string) of valence holder of this analysis
+        """
+        return self.valence_holder_lemma
+
+    def is_primary_analysis(self):
+        """
+        :return: True, analyses are only read from an index for their own valence holder lemma
+        """
+        return True
+
+    def is_main_analysis(self):
+        """
+        :return: True if this is the analysis of the main sentence, False otherwise
+        """
+        return self.main_analysis
+
+    def get_complement_class_pattern(self):
+        """
+        :return: tuple() of complement class codings of this analysis
+        """
+        return tuple(self.complement_classes)
+
+    def get_complement_root_w_id(self, position):
+        """
+        :param position: position of a complement in the list of complements of this analysis
+        :type position: Integer
+        :return: word id (as int) of root of this complement
+        """
+        return self.root_w_ids[position]
+
+    def get_complement_root_label(self, position):
+        """
+        :param position: position of a complement in the list of complements of this analysis
+        :type position: Integer
+        :return: string that is label for root of this complement
+        """
+        return self.root_labels[position]
+
+    @staticmethod
+    def create_from_analysis(sentence_id, analysis, main_analysis):
+        """
+        :param sentence_id: id of the sentence of the given analysis
+        :type sentence_id: Integer
+        :param analysis: an analysis of this sentence with valence holder lemma already set
+        :type analysis: DependencyAnalysis (or subclass) or CachedAnalysis
+        :param main_analysis: True if the given analysis is the analysis of the main sentence, False otherwise
+        :type main_analysis: Bool
+        :return: new object of class IndexedAnalysis with the data of the given analysis (no tree or node of the
+        analysis is referenced by this object)
+        """
+        complement_classes = list()
+        root_w_ids = list()
+        root_labels = list()
+        for complement in analysis.get_complements():
+            complement_classes.append(complement.get_complement_class())
+            root_w_ids.append(complement.get_root_w_id())
+            root_labels.append(complement.get_root_label())
+        return IndexedAnalysis(sentence_id, analysis.get_valence_holder(), analysis.get_valence_holder_lemma(),
+                               main_analysis, complement_classes, root_w_ids, root_labels)
+
+
+class ValencyIndex:
+    """
+    Persistent corpus-wide index of all analyses keyed by valence holder lemma: the dependency trees of a corpus are
+    analyzed once (see build_index), for each analysis a compact record (sentence id, complement classes, word ids (i.e.
+    positions, see class SentenceObject) and labels of the roots of all complements and the lemmas of the roots of all
+    Kadv and Kprp) is saved in a binary file;
+    the file is opened via mmap and has a directory with the offset of the records of each lemma, thus only the records
+    of a single verb need to be read to create a valency frame for this verb
+    file format: header (magic, version, offset and length of trailer), records of each lemma, trailer as json with the
+    directory (lemma: [offset, length, number of records]) and a table of all strings (labels and lemmas) used in the
+    records
+    """
+
+    def __init__(self, file_name):
+        """
+        :raises ValencyIndexError if file is no valid index
+        :param file_name: name of an index file created via build_index
+        :type file_name: String
+        """
+        self.file_object = open(file_name, "rb")
+        try:
+            self.index_data = mmap.mmap(self.file_object.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file_object.close()
+            raise ValencyIndexError(1)
+        if len(self.index_data) < _HEADER.size:
+            self.close()
+            raise ValencyIndexError(1)
+        magic, version, trailer_offset, trailer_length = _HEADER.unpack_from(self.index_data, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValencyIndexError(1)
+        elif version != INDEX_VERSION:
+            self.close()
+            raise ValencyIndexError(2)
+        trailer = json.loads(self.index_data[trailer_offset:trailer_offset + trailer_length].decode("utf-8"))
+        self.directory = trailer["directory"]
+        self.strings = trailer["strings"]
+
+    def close(self):
+        """
+        closes the index file
+        :return: no return value
+        """
+        if not self.index_data.closed:
+            self.index_data.close()
+        self.file_object.close()
+
+    def get_verbs(self):
+        """
+        :return: list() of all valence holder lemmas in this index
+        """
+        return list(self.directory.keys())
+
+    def get_analysis_count(self, verb):
+        """
+        :param verb: a valence holder lemma
+        :type verb: String
+        :return: number of analyses (as int) saved for this lemma
+        """
+        if verb not in self.directory:
+            return 0
+        return self.directory[verb][2]
+
+    def get_indexed_analyses(self, verb):
+        """
+        reads all records of the given verb
+        :param verb: a valence holder lemma
+        :type verb: String
+        :return: list with a list() of objects of class IndexedAnalysis (in order of the corpus) at position [0] and an
+        object of class WordStore with the lemmas of the roots of Kadv and Kprp (at their positions, no words and no
+        original word ids) of each sentence at position [1]
+        """
+        indexed_analyses = list()
+        sen_id_to_lemmas = dict()
+        if verb not in self.directory:
+            return [indexed_analyses, WordStore()]
+        offset, length, record_count = self.directory[verb]
+        index_data = self.index_data
+        strings = self.strings
+        for record_number in range(record_count):
+            sen_id, valence_holder, main_analysis, complement_count = _RECORD.unpack_from(index_data, offset)
+            offset += _RECORD.size
+            lemmas = sen_id_to_lemmas.get(sen_id)
+            if lemmas is None:
+                lemmas = list()
+                sen_id_to_lemmas[sen_id] = lemmas
+            complement_classes = list()
+            root_w_ids = list()
+            root_labels = list()
+            for complement_number in range(complement_count):
+                comp_class, root_w_id, label_index, lemma_index = _COMPLEMENT.unpack_from(index_data, offset)
+                offset += _COMPLEMENT.size
+                complement_classes.append(comp_class)
+                root_w_ids.append(root_w_id)
+                root_labels.append(strings[label_index])
+                if lemma_index >= 0:
+                    if root_w_id >= len(lemmas):
+                        lemmas.extend([None] * (root_w_id + 1 - len(lemmas)))
+                    lemmas[root_w_id] = strings[lemma_index]
+            indexed_analyses.append(IndexedAnalysis(sen_id, valence_holder, verb, main_analysis == 1,
+                                                    complement_classes, root_w_ids, root_labels))
+        word_store = WordStore()
+        for sen_id, lemmas in sen_id_to_lemmas.items():
+            word_store.add_sentence(sen_id, None, None, lemmas)
+        return [indexed_analyses, word_store]
+
+    @staticmethod
+    def build_index(sentences, file_name):
+        """
+        offline creation of an index file from analyzed sentences (e.g. created via
+        ValencyAnalysis.create_analyzed_sentences with no verb)
+        :param sentences: objects of class SentenceObject
+        :type sentences: List
+        :param file_name: name of the index file to create
+        :type file_name: String
+        :return: number of analyses (as int) saved in the index
+        """
+        string_to_index = dict()
+        lemma_to_records = dict()
+        lemma_to_record_count = dict()
+        analysis_count = 0
+        for sentence in SenObj.get_sentences_with_valid_analysis(sentences):
+            sen_id = sentence.get_sentence_id()
+            lemmas = sentence.get_lemma_list()
+            for analysis_number, analysis in enumerate(sentence.get_full_sentence_analysis_list()):
+                complements = analysis.get_complements()
+                record = bytearray(_RECORD.pack(sen_id, analysis.get_valence_holder(), analysis_number == 0,
+                                                len(complements)))
+                for complement in complements:
+                    comp_class = complement.get_complement_class()
+                    root_w_id = complement.get_root_w_id()
+                    label_index = ValencyIndex.intern_string(string_to_index, complement.get_root_label())
+                    lemma_index = -1
+                    if (comp_class in HEAD_LEMMA_CLASSES) & (root_w_id < len(lemmas)):
+                        lemma_index = ValencyIndex.intern_string(string_to_index, str(lemmas[root_w_id]))
+                    record += _COMPLEMENT.pack(comp_class, root_w_id, label_index, lemma_index)
+                lemma = analysis.get_valence_holder_lemma()
+                if lemma not in lemma_to_records:
+                    lemma_to_records[lemma] = bytearray()
+                    lemma_to_record_count[lemma] = 0
+                lemma_to_records[lemma] += record
+                lemma_to_record_count[lemma] += 1
+                analysis_count += 1
+        directory = dict()
+        with open(file_name, "wb") as file_object:
+            file_object.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, 0))
+            offset = _HEADER.size
+            for lemma, records in lemma_to_records.items():
+                file_object.write(records)
+                directory[lemma] = [offset, len(records), lemma_to_record_count[lemma]]
+                offset += len(records)
+            trailer = json.dumps({"directory": directory, "strings": list(string_to_index.keys())},
+                                 ensure_ascii=False).encode("utf-8")
+            file_object.write(trailer)
+            file_object.seek(0)
+            file_object.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, offset, len(trailer)))
+        logger.info("Index created: {anqty} analyses of {lmqty} valence holder lemmas".
+                    format(anqty=analysis_count, lmqty=len(directory)))
+        return analysis_count
+
+    @staticmethod
+    def intern_string(string_to_index, string):
+        """
+        :param string_to_index: table of strings used in the records of an index
+        :type string_to_index: Dictionary
+        :param string: a string to be saved in the table
+        :type string: String
+        :return: index (as int) of given string in the table of strings
+        """
+        string_index = string_to_index.get(string)
+        if string_index is None:
+            string_index = len(string_to_index)
+            string_to_index[string] = string_index
+        return string_index
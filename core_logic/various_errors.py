@@ -45,6 +45,8 @@ class IncorrectInstantiationError(Exception):
             self.message = "Keine korrekte Analyse angegeben"
         elif error_code == 6:
             self.message = "Keine gültige Lemmata-Liste angegeben"
+        elif error_code == 7:
+            self.message = "Keine gültigen Wort-IDs angegeben"
         elif error_code == -1:
             self.message = "Ungültige Eingabe"
         else:
@@ -128,6 +130,14 @@ class ValencyFrameError (Exception):
             self.message = "Fehler beim Setzen des aktuellen Komplement-Pattern-Dictionaries: leere Signatur angegeben"
         elif error_code == 8:
             self.message = "Fehler beim Setzen des aktuellen Komplement-Pattern-Dictionaries: Signatur ist kein Tupel"
+        elif error_code == 9:
+            self.message = "Teil-Valenzrahmen mit unterschiedlichem Verb oder unterschiedlicher Auswahl der Analysen"
+        elif error_code == 10:
+            self.message = "Teil-Valenzrahmen mit gemeinsamen Satz-IDs angegeben"
+        elif error_code == 11:
+            self.message = "Keine gültige Datei eines Teil-Valenzrahmens"
+        elif error_code == 12:
+            self.message = "Teil-Valenzrahmen enthält nur die Präpositionen der Kadv"
         else:
             self.message = "Fehler bei Valenzrahmen"
 
@@ -156,8 +166,29 @@ class ValencyAnalysisError (Exception):
         elif error_code == 7:
             self.message = "Falsche Eingabe zum Löschen von Signatur mittels Komplement-Klassen:" \
                            " keine gültige Komplement-Klasse angegeben"
+        elif error_code == 8:
+            self.message = "Nur Hauptsätze analysiert, Valenzrahmen nur für Hauptsätze möglich"
+        elif error_code == 9:
+            self.message = "Unbekannte Strategie für doppelte Sätze angegeben"
         else:
             self.message = "Fehler in der Valenzanalyse"
 
     def __str__(self):
         return self.message
+
+
+class ValencyIndexError (Exception):
+    """
+    Used for errors occurring during access of an index file of class ValencyIndex
+    """
+
+    def __init__(self, error_code):
+        if error_code == 1:
+            self.message = "Keine gültige Indexdatei"
+        elif error_code == 2:
+            self.message = "Nicht unterstützte Version der Indexdatei"
+        else:
+            self.message = "Fehler beim Indexzugriff"
+
+    def __str__(self):
+        return self.message
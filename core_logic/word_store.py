@@ -0,0 +1,166 @@
+from array import array
+
+
+class WordStore:
+    """
+    Columnar store of the words and lemmata of all sentences of a corpus: every word and lemma is interned once into a
+    shared vocabulary (string codes), the word ids, word codes and lemma codes of all sentences are kept in three
+    integer arrays, the words of a sentence (given by its sentence number) are found via the offset of the sentence in
+    these arrays; within the analysis a word is given by its position in the sentence (see class SentenceObject), thus
+    every word is found directly at offset plus position, the original word ids are only kept for output;
+    used by class SentenceObject instead of own lists and dicts of words and lemmata and by class ValencyFrame for the
+    lookup of words and lemmata by sentence id and position
+    """
+
+    __slots__ = ('strings', 'string_to_code', 'w_ids', 'word_codes', 'lemma_codes', 'offsets',
+                 'sentence_id_to_number')
+
+    def __init__(self):
+        self.strings = list()
+        self.string_to_code = dict()
+        self.w_ids = array('q')
+        self.word_codes = array('i')
+        self.lemma_codes = array('i')
+        self.offsets = array('q', [0])
+        self.sentence_id_to_number = dict()
+
+    def add_sentence(self, sentence_id, w_ids, words, lemmas):
+        """
+        :param sentence_id: id of the sentence, a sentence added later with the same id replaces this sentence for the
+        lookup by sentence id (see get_sentence_number)
+        :type sentence_id: Integer
+        :param w_ids: original word ids of the sentence (in order of the words) or None if they are unknown, the number
+        of lemmata is then used as number of words
+        :type w_ids: List or None
+        :param words: word (as string) for each position or None if the words of the sentence are unknown
+        :type words: List or None
+        :param lemmas: lemma (as string or None if unknown) for each position or None if the lemmata of the sentence are
+        unknown
+        :type lemmas: List or None
+        :return: sentence number (as int) of the new sentence in this store
+        """
+        sentence_number = len(self.offsets) - 1
+        if w_ids is None:
+            w_ids = [-1] * len(lemmas)
+        self.w_ids.extend(w_ids)
+        for position in range(len(w_ids)):
+            word_code = -1
+            if (words is not None) and (position < len(words)):
+                word_code = self.intern_string(words[position])
+            lemma_code = -1
+            if (lemmas is not None) and (position < len(lemmas)) and (lemmas[position] is not None):
+                lemma_code = self.intern_string(lemmas[position])
+            self.word_codes.append(word_code)
+            self.lemma_codes.append(lemma_code)
+        self.offsets.append(len(self.w_ids))
+        self.sentence_id_to_number[sentence_id] = sentence_number
+        return sentence_number
+
+    def intern_string(self, string):
+        """
+        :param string: a word or lemma
+        :type string: String
+        :return: code (as int) of the given string in the vocabulary of this store
+        """
+        string_code = self.string_to_code.get(string)
+        if string_code is None:
+            string_code = len(self.strings)
+            self.string_to_code[string] = string_code
+            self.strings.append(string)
+        return string_code
+
+    def get_sentence_number(self, sentence_id):
+        """
+        :param sentence_id: id of a sentence
+        :type sentence_id: Integer
+        :return: sentence number (as int) of the (last added) sentence with given id or None
+        """
+        return self.sentence_id_to_number.get(sentence_id)
+
+    def get_sentence_count(self):
+        """
+        :return: number of sentences (as int) in this store
+        """
+        return len(self.offsets) - 1
+
+    def get_w_ids(self, sentence_number):
+        """
+        :param sentence_number: number of a sentence in this store
+        :type sentence_number: Integer
+        :return: list() of the original word ids of this sentence (-1 for unknown word ids)
+        """
+        return self.w_ids[self.offsets[sentence_number]:self.offsets[sentence_number + 1]].tolist()
+
+    def get_words(self, sentence_number):
+        """
+        :param sentence_number: number of a sentence in this store
+        :type sentence_number: Integer
+        :return: list() of the words of this sentence (in order of their positions)
+        """
+        return self.decode_strings(self.word_codes, sentence_number)
+
+    def get_lemmas(self, sentence_number):
+        """
+        :param sentence_number: number of a sentence in this store
+        :type sentence_number: Integer
+        :return: list() of the lemmata of this sentence (in order of their positions)
+        """
+        return self.decode_strings(self.lemma_codes, sentence_number)
+
+    def decode_strings(self, codes, sentence_number):
+        """
+        :param codes: column of string codes (word_codes or lemma_codes)
+        :type codes: array
+        :param sentence_number: number of a sentence in this store
+        :type sentence_number: Integer
+        :return: list() of the strings of this sentence in given column (None for unknown strings)
+        """
+        strings = self.strings
+        return list(strings[code] if code >= 0 else None
+                    for code in codes[self.offsets[sentence_number]:self.offsets[sentence_number + 1]])
+
+    def get_store_position(self, sentence_number, position):
+        """
+        :param sentence_number: number of a sentence in this store
+        :type sentence_number: Integer
+        :param position: position of a word in this sentence
+        :type position: Integer
+        :return: position (as int) of the given word in the arrays of this store or None if the sentence has no word at
+        the given position
+        """
+        start = self.offsets[sentence_number]
+        if (position < 0) or (start + position >= self.offsets[sentence_number + 1]):
+            return None
+        return start + position
+
+    def get_word(self, sentence_number, position, lemma=False):
+        """
+        :param sentence_number: number of a sentence in this store
+        :type sentence_number: Integer
+        :param position: position of a word in this sentence
+        :type position: Integer
+        :param lemma: if True, the lemma of the word is returned instead of the word
+        :type lemma: Bool
+        :return: word (or lemma) as string at given position in this sentence or None if the sentence has no word at
+        this position or the word (or lemma) is unknown
+        """
+        store_position = self.get_store_position(sentence_number, position)
+        if store_position is None:
+            return None
+        if lemma:
+            code = self.lemma_codes[store_position]
+        else:
+            code = self.word_codes[store_position]
+        if code < 0:
+            return None
+        return self.strings[code]
+
+    def get_word_by_sentence_id(self, sentence_id, position, lemma=False):
+        """
+        see get_word, the sentence is given by its id
+        :return: word (or lemma) as string or None if this store has no such sentence, position or word (or lemma)
+        """
+        sentence_number = self.sentence_id_to_number.get(sentence_id)
+        if sentence_number is None:
+            return None
+        return self.get_word(sentence_number, position, lemma)
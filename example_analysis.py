@@ -1,4 +1,12 @@
 import core_logic.valency_analysis as VA
+from core_logic.analysis_cache import AnalysisCache
+from core_logic.label_schema import LabelSchema
+from core_logic.lemma_index import LemmaIndex
+from core_logic.multi_verb_valency_analysis import MultiVerbValencyAnalysis
+from core_logic.partial_valency_frame import PartialValencyFrame
+from core_logic.sentence_deduplicator import SentenceDeduplicator
+from core_logic.skeleton_memo import SkeletonMemo
+from core_logic.valency_index import ValencyIndex
 from core_logic.various_errors import KMeanError, ValencyAnalysisError, ValencyFrameError
 import os
 import argparse
@@ -21,7 +29,7 @@ def load_data():
     raw_data_list = list()
     try:
         for file in os.listdir("example_sentences"):
-            file_object = open("example_sentences\\{fl}".format(fl=file), "r")
+            file_object = open(os.path.join("example_sentences", file), "r", encoding="iso-8859-1")
             sentence = ""
             sentence_id = 0
             word_ids = list()
@@ -68,7 +76,7 @@ def load_data():
     return raw_data_list
 
 
-def analyse_examples(raw_data, args):
+def analyse_examples(raw_data, args, new_analysis=None, analysis_cache=None, deduplicator=None):
     """
     analysis of example sentences:
     1. correction of adverbial complements to prepositional complements
@@ -76,15 +84,39 @@ def analyse_examples(raw_data, args):
     3. deletion of any complement with count > 2
     4. deletion of all rare complement signatures
     output after steps 3 and 4
+    if a file for a partial frame is given by args, the valency frame is saved as partial frame (see class
+    PartialValencyFrame) instead of any postprocessing
     :param raw_data: raw data for valency analysis in specific format needed by class ValencyAnalysis
     :type raw_data: list
+    :param new_analysis: valency analysis to use (e.g. created by class MultiVerbValencyAnalysis), if None a new
+    valency analysis for the verb given by args is created from raw_data
+    :type new_analysis: ValencyAnalysis or None
+    :param analysis_cache: cache of analyses of sentences used for a new valency analysis
+    :type analysis_cache: AnalysisCache or None
+    :param deduplicator: deduplicator of the sentences used for a new valency analysis
+    :type deduplicator: SentenceDeduplicator or None
     :return: no return value
     """
-    new_analysis = VA.ValencyAnalysis(raw_data, args.verb)
+    if new_analysis is None:
+        lemma_index = None
+        if args.prefilter:
+            lemma_index = LemmaIndex(raw_data)
+        new_analysis = VA.ValencyAnalysis(raw_data, args.verb, lemma_index=lemma_index, analysis_cache=analysis_cache,
+                                          prune_analyses=args.prune, main_only=args.main, lean=args.lean,
+                                          deduplicator=deduplicator)
     if args.main:
         new_analysis.initialize_valency_frame(main_prime=True)
     else:
         new_analysis.initialize_valency_frame(main_prime=False)
+    if args.partial_frame is not None:
+        try:
+            new_analysis.create_partial_frame().save(args.partial_frame)
+        except ValencyFrameError as vfe:
+            logger.warning("Fehler beim Speichern des Teil-Valenzrahmens")
+            logger.warning(vfe)
+            return
+        logger.info("Partial valency frame saved in {fl}".format(fl=args.partial_frame))
+        return
     if not args.no_kmone:
         try:
             new_analysis.correct_kadv_kprp(args.kmonecq, args.kmonemt, clusters_to_keep=args.kmoneck)
@@ -170,6 +202,38 @@ def initialize_argparser():
     argparser.add_argument("--no_kmtwo", help="no further postprocessing will be done after deletion of "
                                 "multiple complements", action="store_true")
     argparser.add_argument("--main", help="use only main sentences for valency frame analysis", action="store_true")
+    argparser.add_argument("--prefilter", help="analyse only those sentences whose lemmata can contain the verb",
+                           action="store_true")
+    argparser.add_argument("--prune", help="create complements only for sub sentences of the verb (all sub sentences "
+                           "are still cut off)", action="store_true")
+    argparser.add_argument("--lean", help="keep only the compact primary analyses of the verb and drop every sentence "
+                           "right after its analysis", action="store_true")
+    argparser.add_argument("--dedup", help="remove duplicate sentences (same words, lemmata and tree) before the "
+                           "analysis, \"skip\" drops them, \"weight\" counts them as weight of the first sentence",
+                           action="store", dest="dedup", default=None, choices=["skip", "weight"])
+    argparser.add_argument("--build_index", help="analyse all sentences once and save the analyses of all verbs in the "
+                           "given index file", action="store", dest="build_index", default=None, type=str)
+    argparser.add_argument("--index", help="create the valency analysis from the given index file (see --build_index) "
+                           "instead of the example sentences", action="store", dest="index", default=None, type=str)
+    argparser.add_argument("--partial_frame", help="save the valency frame without postprocessing as partial frame in "
+                           "the given file (e.g. for a part of a corpus, see --merge_frames)", action="store",
+                           dest="partial_frame", default=None, type=str)
+    argparser.add_argument("--merge_frames", help="merge the given partial frame files (separated by \",\") and "
+                           "create the valency analysis from the merged frame instead of the example sentences",
+                           action="store", dest="merge_frames", default=None, type=str)
+    argparser.add_argument("--verbs", help="analyse all sentences once and create a valency analysis for each given verb "
+                           "(separated by \",\") or for every verb found if \"all\" is given, overrides --verb",
+                           action="store", dest="verbs", default=None, type=str)
+    argparser.add_argument("--cache", help="directory of a cache of sentence analyses shared between runs, only new or "
+                           "changed sentences are analysed", action="store", dest="cache", default=None, type=str)
+    argparser.add_argument("--cache_size", help="maximum size of the cache of sentence analyses in MB, default = 256",
+                           action="store", dest="cache_size", default="256", type=int)
+    argparser.add_argument("--skeleton_memo", help="number of tree skeletons whose analyses are kept in memory and "
+                           "reused for trees with the same skeleton, default = 0 (no memo)", action="store",
+                           dest="skeleton_memo", default="0", type=int)
+    argparser.add_argument("--label_schema", help="json file with complement classes and label groups for the labels of "
+                           "the dependency trees, default: ParZu labels", action="store", dest="label_schema",
+                           default=None, type=str)
     args = argparser.parse_args()
     return args
 
@@ -182,8 +246,63 @@ def main():
     args = initialize_argparser()
     if args.verbose:
         logger.setLevel(logging.DEBUG)
+    if args.label_schema is not None:
+        LabelSchema.set_active_schema(LabelSchema.load_schema_from_file(args.label_schema))
+    if args.merge_frames is not None:
+        partial_frame = None
+        try:
+            for file_name in args.merge_frames.split(","):
+                if partial_frame is None:
+                    partial_frame = PartialValencyFrame.load(file_name)
+                else:
+                    partial_frame = partial_frame.merge(PartialValencyFrame.load(file_name))
+        except ValencyFrameError as vfe:
+            logger.warning("Fehler beim Zusammenführen der Teil-Valenzrahmen")
+            logger.warning(vfe)
+            return
+        except (IOError, ValueError) as err:
+            logger.warning("Fehler beim Zusammenführen der Teil-Valenzrahmen")
+            logger.warning(err)
+            return
+        logger.info(partial_frame)
+        analyse_examples(None, args, VA.ValencyAnalysis(None, partial_frame.get_verb(), partial_frame=partial_frame))
+        return
+    if args.index is not None:
+        valency_index = ValencyIndex(args.index)
+        analyse_examples(None, args, VA.ValencyAnalysis(None, args.verb, valency_index=valency_index))
+        valency_index.close()
+        return
     raw_data = load_data()
-    analyse_examples(raw_data, args)
+    if args.skeleton_memo > 0:
+        SkeletonMemo.set_active_memo(SkeletonMemo(args.skeleton_memo))
+    analysis_cache = None
+    if args.cache is not None:
+        analysis_cache = AnalysisCache(args.cache, args.cache_size * 1024 * 1024)
+    if args.build_index is not None:
+        error_counts = dict()
+        ValencyIndex.build_index(VA.ValencyAnalysis.create_analyzed_sentences(raw_data, None, analysis_cache,
+                                                                              error_counts=error_counts),
+                                 args.build_index)
+        VA.ValencyAnalysis.log_error_report(error_counts)
+    elif args.verbs is not None:
+        multi_verb_analysis = MultiVerbValencyAnalysis(raw_data, analysis_cache)
+        verbs = None
+        if args.verbs != "all":
+            verbs = args.verbs.split(",")
+        for verb, verb_analysis in multi_verb_analysis.get_valency_analyses(verbs).items():
+            logger.info("~~~~~~~~~~~~~~Valency analysis for {vrb}~~~~~~~~~~~~~~".format(vrb=verb))
+            analyse_examples(raw_data, args, verb_analysis)
+    else:
+        deduplicator = None
+        if args.dedup is not None:
+            deduplicator = SentenceDeduplicator(args.dedup)
+        analyse_examples(raw_data, args, analysis_cache=analysis_cache, deduplicator=deduplicator)
+        if deduplicator is not None:
+            deduplicator.log_statistics()
+    if analysis_cache is not None:
+        analysis_cache.log_statistics()
+    if SkeletonMemo.get_active_memo() is not None:
+        SkeletonMemo.get_active_memo().log_statistics()
 
 
 if __name__ == '__main__':